@@ -9,12 +9,93 @@ class Settings(BaseSettings):
     grafana_irm_base_url: str = "https://grafana.example.com"
     grafana_irm_api_token: str = ""
 
+    # Grafana IRM HTTP client (shared for the lifetime of the app)
+    grafana_irm_http2: bool = False  # requires the "http2" extra
+    grafana_irm_max_connections: int = 20
+    grafana_irm_max_keepalive_connections: int = 10
+    grafana_irm_keepalive_expiry: float = 30.0
+    grafana_irm_connect_timeout: float = 5.0
+    grafana_irm_timeout: float = 30.0
+
+    # Grafana IRM protection: token bucket rate limit and circuit breaker
+    grafana_irm_rate_limit: float = 10.0  # requests per second; 0 disables
+    grafana_irm_rate_limit_burst: int = 20
+    grafana_irm_rate_limit_wait: float = 2.0  # seconds a request may wait for a token
+    grafana_irm_breaker_failure_threshold: int = 5  # consecutive failures that open it; 0 disables
+    grafana_irm_breaker_recovery_timeout: float = 30.0  # seconds open before a trial call
+    grafana_irm_breaker_half_open_max_calls: int = 1
+
+    # Incident delivery queue (POST /api/incidents returns before IRM is called)
+    incident_queue_enabled: bool = False
+    incident_delivery_workers: int = 4
+    incident_delivery_max_attempts: int = 8
+    incident_delivery_backoff_base: float = 1.0  # seconds, doubled per attempt
+    incident_delivery_backoff_max: float = 300.0
+
+    # Identical incidents (title, severity, tags) within this many seconds
+    # return the first one instead of creating another; 0 (the default) disables
+    incident_dedup_window: float = 0.0
+
+    # Incident log retention (0 days keeps entries forever)
+    incident_log_retention_days: int = 0
+    incident_log_archive_dir: str = ""  # gzipped NDJSON of purged entries; empty to only delete
+    incident_log_retention_interval: float = 3600.0  # seconds between purges
+    incident_log_retention_batch_size: int = 1000
+
+    # Catalog tombstones (deletions served by GET /api/tree?since=); 0 days keeps them forever
+    catalog_tombstone_retention_days: int = 30
+    catalog_tombstone_retention_interval: float = 3600.0  # seconds between prunes
+
     # Database Configuration
     database_url: str = "sqlite:///./data/incident_bridge.db"
+    database_migrate_on_startup: bool = True  # run Alembic migrations in the app lifespan
+
+    # SQLite performance profile (single node): WAL, tuned pragmas, separate read pool
+    sqlite_performance_mode: bool = False
+    sqlite_mmap_size: int = 268435456  # bytes
+    sqlite_cache_size: int = 65536  # KiB per connection
+    sqlite_busy_timeout: int = 5000  # milliseconds
+    sqlite_read_pool_size: int = 8
+
+    # Connection pool (PostgreSQL)
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_recycle: int = 1800  # seconds
+    database_pool_pre_ping: bool = True
+    database_pool_timeout: float = 30.0
+
+    # Server (python -m app.server). Each worker process keeps its own copy
+    # of the catalog caches, kept in step through the catalog_version row.
+    host: str = "0.0.0.0"
+    port: int = 8000
+    workers: int = 1
+    catalog_sync_interval: float = 1.0  # seconds between checks for changes by other processes; 0 disables
+    shutdown_timeout: float = 10.0  # seconds open requests (event streams) get to finish on shutdown
+
+    # Server-sent events (/api/events)
+    events_queue_size: int = 256  # events buffered per client; a client further behind is told to resync
+    events_max_clients: int = 10000
+    events_heartbeat_interval: float = 15.0  # seconds between keep-alive comments on an idle stream
 
     # Application Configuration
     app_name: str = "Incident Bridge"
     debug: bool = False
+    metrics_enabled: bool = True  # Prometheus /metrics and per-request instrumentation
+    # Write catalog and history listings with orjson, skipping response
+    # model validation (requires the "orjson" extra)
+    fast_json_responses: bool = False
+
+    # Logging, written by a background thread so that slow output never blocks a request
+    log_level: str = "INFO"
+    log_format: str = "text"  # "text", or "json" for one object per line
+    log_queue_size: int = 10000  # records waiting to be written; more are dropped
+
+    # OpenTelemetry tracing (requires the "otel" extra). The OTLP endpoint and
+    # headers come from the standard OTEL_EXPORTER_OTLP_* variables.
+    tracing_enabled: bool = False
+    tracing_exporter: str = "otlp"  # "otlp", or "memory" to keep spans in process (tests)
+    tracing_service_name: str = "incident-bridge"
+    tracing_sample_ratio: float = 1.0  # fraction of new traces sampled; incoming sampled traces are kept
 
     class Config:
         env_file = ".env"
@@ -1,10 +1,18 @@
-from sqlalchemy import create_engine, event
+from datetime import datetime, timezone
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.config import get_settings
 import os
 
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 settings = get_settings()
 
+is_sqlite = settings.database_url.startswith("sqlite")
+
 # Ensure data directory exists for SQLite
 db_path = settings.database_url.replace("sqlite:///", "")
 if db_path.startswith("./"):
@@ -12,24 +20,110 @@ if db_path.startswith("./"):
     if db_dir:
         os.makedirs(db_dir, exist_ok=True)
 
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {},
+
+def get_database_url(url: str) -> str:
+    """Map a database URL to its sync driver (pysqlite / psycopg)."""
+    scheme, _, rest = url.partition("://")
+    if scheme in ("postgresql", "postgres"):
+        return f"postgresql+psycopg://{rest}"
+    return url
+
+
+def get_async_database_url(url: str) -> str:
+    """Map a database URL to its asyncio driver (aiosqlite / asyncpg)."""
+    scheme, _, rest = url.partition("://")
+    backend = scheme.split("+")[0]
+    if backend == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    if backend in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg://{rest}"
+    return url
+
+
+def get_engine_options() -> dict:
+    """Engine options for the configured database."""
+    if is_sqlite:
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": settings.database_pool_size,
+        "max_overflow": settings.database_max_overflow,
+        "pool_recycle": settings.database_pool_recycle,
+        "pool_pre_ping": settings.database_pool_pre_ping,
+        "pool_timeout": settings.database_pool_timeout,
+    }
+
+
+engine = create_engine(get_database_url(settings.database_url), **get_engine_options())
+
+# Async engine used by the incident path, so that database I/O doesn't block the event loop
+async_engine = create_async_engine(
+    get_async_database_url(settings.database_url),
+    **({} if is_sqlite else get_engine_options()),
 )
 
+# Separate read-only pool for SQLite in performance mode. With WAL journaling,
+# readers see the last committed state and never wait for a writer.
+sqlite_performance_mode = is_sqlite and settings.sqlite_performance_mode
+if sqlite_performance_mode:
+    read_engine = create_engine(
+        settings.database_url,
+        connect_args={"check_same_thread": False},
+        pool_size=settings.sqlite_read_pool_size,
+        max_overflow=0,
+    )
+else:
+    read_engine = engine
+
+
+def set_sqlite_performance_pragmas(dbapi_connection) -> None:
+    """Apply the performance-mode pragmas to a new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.sqlite_cache_size)}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout)}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
 # Enable foreign keys for SQLite
-if "sqlite" in settings.database_url:
+if is_sqlite:
     @event.listens_for(engine, "connect")
+    @event.listens_for(async_engine.sync_engine, "connect")
     def set_sqlite_pragma(dbapi_connection, connection_record):
         cursor = dbapi_connection.cursor()
         cursor.execute("PRAGMA foreign_keys=ON")
         cursor.close()
+        if sqlite_performance_mode:
+            set_sqlite_performance_pragmas(dbapi_connection)
+
+if sqlite_performance_mode:
+    @event.listens_for(read_engine, "connect")
+    def set_sqlite_read_pragma(dbapi_connection, connection_record):
+        set_sqlite_performance_pragmas(dbapi_connection)
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
 
+def utcnow() -> datetime:
+    """
+    Current time as naive UTC, the format stored in the database.
+
+    Timestamps that are compared with each other (outbox claims and retry
+    times, incident history) are all taken from this clock, not the
+    database's, so that the two clocks can't disagree.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 def get_db():
     """Dependency for getting database sessions."""
     db = SessionLocal()
@@ -39,6 +133,63 @@ def get_db():
         db.close()
 
 
-def create_tables():
-    """Create all database tables."""
-    Base.metadata.create_all(bind=engine)
+def get_read_db():
+    """Dependency for read-only database sessions (separate pool in SQLite performance mode)."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    """Dependency for getting async database sessions."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def run_migrations():
+    """
+    Upgrade the database schema to the latest Alembic revision.
+
+    Databases created by the old create_all() startup path have tables but no
+    alembic_version; they are stamped with the revision matching their tables first.
+    """
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    config.attributes["configure_logger"] = False
+
+    table_names = inspect(engine).get_table_names()
+    if "applications" in table_names and "alembic_version" not in table_names:
+        command.stamp(config, "0002" if "incident_outbox" in table_names else "0001")
+    command.upgrade(config, "head")
+
+
+class QueryCounter:
+    """
+    Context manager that counts SQL statements executed on the sync engines.
+
+    Usage:
+        with QueryCounter() as counter:
+            ...
+        assert counter.count <= 2
+    """
+
+    def __init__(self, bind=None):
+        self.binds = [bind] if bind is not None else list(dict.fromkeys([engine, read_engine]))
+        self.count = 0
+        self.statements: list[str] = []
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        self.statements.append(statement)
+
+    def __enter__(self):
+        for bind in self.binds:
+            event.listen(bind, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        for bind in self.binds:
+            event.remove(bind, "before_cursor_execute", self._on_execute)
+        return False
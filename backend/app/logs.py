@@ -0,0 +1,163 @@
+"""
+Logging setup.
+
+Records go onto a bounded queue through a QueueHandler, and a QueueListener
+thread formats and writes them to stderr, so a slow pipe or disk never blocks
+a request. The message is interpolated in the calling thread, because its
+arguments may change afterwards. If the writer falls behind and the queue
+fills up, records are dropped and counted in log_records_dropped_total; the
+caller never waits for them.
+
+LOG_FORMAT=json writes one JSON object per line. RequestIdMiddleware gives
+each request an id, taken from its X-Request-ID header or generated. The id
+comes back in the response and is added to every record logged while the
+request is handled.
+"""
+import atexit
+import copy
+import json
+import logging
+import queue
+import re
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+from starlette.datastructures import Headers
+from app.config import get_settings
+from app.metrics import LOG_RECORDS_DROPPED
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(request_id)s - %(message)s"
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Incoming request ids are used if they are short and made of safe characters
+_VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._:-]{1,128}")
+
+# Attributes every LogRecord has; anything else was passed with extra=
+# (uvicorn adds an ANSI-coloured copy of some messages, which is left out too)
+_RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id", "color_message"}
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+_exception_formatter = logging.Formatter()
+_listener: Optional[QueueListener] = None
+
+
+def get_request_id() -> Optional[str]:
+    """Id of the request being handled, if any."""
+    return _request_id.get()
+
+
+class RequestIdFilter(logging.Filter):
+    """Adds the current request id to records ("-" outside a request)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _request_id.get() or "-"
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record, including any fields passed with extra=."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", "-")
+        if request_id != "-":
+            entry["request_id"] = request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of waiting when the queue is full."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only resolve what can't wait: the message arguments and the
+        # traceback. Formatting is left to the listener thread.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+def setup_logging() -> None:
+    """Send logging through the background writer. Called once, when the app is created."""
+    global _listener
+    if _listener is not None:
+        return
+    settings = get_settings()
+
+    stream = logging.StreamHandler()
+    stream.setFormatter(JSONFormatter() if settings.log_format == "json" else logging.Formatter(TEXT_FORMAT))
+    handler = NonBlockingQueueHandler(queue.Queue(settings.log_queue_size))
+    handler.addFilter(RequestIdFilter())
+    logging.basicConfig(level=settings.log_level.upper(), handlers=[handler])
+    # uvicorn's loggers have their own handlers, which write in the calling
+    # thread, and don't propagate
+    for name in ("uvicorn", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers = [handler]
+        uvicorn_logger.propagate = False
+
+    _listener = QueueListener(handler.queue, stream)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Write out the queued records and stop the writer thread. Runs at exit."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class RequestIdMiddleware:
+    """ASGI middleware tagging each request, its logs and its response with a request id."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get(REQUEST_ID_HEADER)
+        if not request_id or not _VALID_REQUEST_ID.fullmatch(request_id):
+            request_id = uuid.uuid4().hex
+        header = (REQUEST_ID_HEADER.lower().encode(), request_id.encode())
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), header]
+            await send(message)
+
+        token = _request_id.set(request_id)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_id.reset(token)
@@ -1,20 +1,29 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import logging
 
 from app.config import get_settings
-from app.database import create_tables
-from app.routers import tree_router, incidents_router, admin_router
+from app.database import run_migrations, SessionLocal, async_engine, engine, read_engine
+from app.logs import RequestIdMiddleware, setup_logging
+from app.metrics import MetricsMiddleware, instrument_engine, render_metrics
+from app.responses import orjson_available
+from app.routers import tree_router, incidents_router, admin_router, search_router, events_router
+from app.services.catalog_sync import catalog_sync
+from app.services.delivery import delivery_pool
+from app.services.events import event_broadcaster
+from app.services.grafana import get_grafana_client, open_http_client, close_http_client
+from app.services.retention import catalog_tombstone_retention, incident_log_retention
+from app.tracing import setup_tracing, shutdown_tracing
+
+settings = get_settings()
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+setup_logging()
 logger = logging.getLogger(__name__)
 
-settings = get_settings()
+if settings.fast_json_responses and not orjson_available():
+    logger.warning("Fast JSON responses enabled but 'orjson' is not installed, using the standard serializer")
 
 
 @asynccontextmanager
@@ -22,11 +31,33 @@ async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
     logger.info("Starting Incident Bridge App...")
-    create_tables()
-    logger.info("Database tables created/verified")
+    if settings.database_migrate_on_startup:
+        run_migrations()
+        logger.info("Database migrations applied")
+    with SessionLocal() as db:
+        catalog_sync.load(db)
+    logger.info("Tag and search indexes loaded")
+    event_broadcaster.start()
+    if settings.catalog_sync_interval > 0:
+        await catalog_sync.start()
+    await open_http_client()
+    if settings.incident_queue_enabled:
+        await delivery_pool.start()
+    if settings.incident_log_retention_days > 0:
+        await incident_log_retention.start()
+    if settings.catalog_tombstone_retention_days > 0:
+        await catalog_tombstone_retention.start()
     yield
     # Shutdown
     logger.info("Shutting down Incident Bridge App...")
+    event_broadcaster.stop()
+    await catalog_sync.stop()
+    await incident_log_retention.stop()
+    await catalog_tombstone_retention.stop()
+    await delivery_pool.stop()
+    await close_http_client()
+    await async_engine.dispose()
+    shutdown_tracing()
 
 
 app = FastAPI(
@@ -43,15 +74,55 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Request-ID", "X-Catalog-Version"],
 )
 
+# Prometheus metrics: per-route latency and SQL usage. Added after CORS so
+# that it times the whole request.
+if settings.metrics_enabled:
+    for bind in (engine, read_engine, async_engine.sync_engine):
+        instrument_engine(bind)
+    app.add_middleware(MetricsMiddleware)
+
+# Request ids for log correlation, outermost so every log line of a request has one
+app.add_middleware(RequestIdMiddleware)
+
+# OpenTelemetry: spans for routes, SQL and outbound IRM calls
+if settings.tracing_enabled:
+    setup_tracing(app, [engine, read_engine, async_engine.sync_engine])
+
 # Include routers
 app.include_router(tree_router)
 app.include_router(incidents_router)
 app.include_router(admin_router)
+app.include_router(search_router)
+app.include_router(events_router)
 
 
 @app.get("/health")
-def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy", "app": settings.app_name}
+async def health_check():
+    """
+    Health check endpoint.
+
+    Reports "degraded" while the Grafana IRM circuit breaker is not closed;
+    the app itself is still serving. Runs on the event loop, like every other
+    user of the breaker and rate limiter.
+    """
+    grafana_client = get_grafana_client()
+    breaker = grafana_client.breaker.snapshot()
+    return {
+        "status": "healthy" if breaker["state"] == "closed" else "degraded",
+        "app": settings.app_name,
+        "grafana_irm": {
+            "circuit_breaker": breaker,
+            "rate_limit_tokens": round(grafana_client.rate_limiter.tokens, 1),
+        },
+    }
+
+
+if settings.metrics_enabled:
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        """Prometheus metrics."""
+        body, content_type = render_metrics()
+        return Response(body, media_type=content_type)
@@ -0,0 +1,164 @@
+"""
+Prometheus metrics.
+
+MetricsMiddleware times every request and counts the SQL statements it runs.
+It is a plain ASGI middleware, so the cost per request is a few histogram
+observations. SQL statements are attributed to the request through a context
+variable, which follows the request into the threadpool (sync endpoints) and
+into SQLAlchemy's async greenlets. The other services record their own
+metrics with the objects defined here.
+
+With several worker processes (python -m app.server), PROMETHEUS_MULTIPROC_DIR
+is set and each worker writes its samples there; /metrics then reports the
+sum over all workers, whichever one serves the scrape.
+"""
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client.multiprocess import MultiProcessCollector
+from sqlalchemy import event
+
+# Sub-millisecond buckets for the cached and in-memory endpoints, up to the
+# IRM timeout for the incident path
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 4, 6, 8, 12, 16, 25, 50, 100)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency, until the last byte of the response is sent",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per HTTP request",
+    ["route"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+REQUEST_QUERY_DURATION = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent executing SQL per HTTP request",
+    ["route"],
+    buckets=LATENCY_BUCKETS,
+)
+IRM_REQUEST_DURATION = Histogram(
+    "grafana_irm_request_duration_seconds",
+    "Grafana IRM CreateIncident round trip, by HTTP status (or timeout / network_error)",
+    ["status"],
+    buckets=LATENCY_BUCKETS,
+)
+INCIDENTS = Counter(
+    "incidents_total",
+    "Incident submissions by internal severity and result (ok, queued, deduplicated, error)",
+    ["severity", "result"],
+)
+INCIDENT_DELIVERIES = Counter(
+    "incident_deliveries_total",
+    "Queued incident delivery attempts by outcome (delivered, retry, failed)",
+    ["outcome"],
+)
+EVENT_STREAM_RESYNCS = Counter(
+    "event_stream_resyncs_total",
+    "Event stream clients that fell behind and were told to resync",
+)
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total",
+    "Log records dropped because the log writer fell behind",
+)
+
+
+class RequestStats:
+    """SQL statements run on behalf of one request."""
+
+    __slots__ = ("queries", "query_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.query_seconds += time.perf_counter() - context._metrics_started
+
+
+def instrument_engine(engine) -> None:
+    """Attribute SQL statements run on a (sync) engine to the current request."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def route_label(scope: dict) -> str:
+    """Route template of a request (e.g. /api/admin/apps/{app_id}), to keep label cardinality bounded."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency and SQL usage per route."""
+
+    def __init__(self, app):
+        self.app = app
+        # Labelled histograms by (method, route, status); labels() is the
+        # slowest part of an observation
+        self._histograms: dict[tuple[str, str, str], tuple] = {}
+
+    def histograms(self, method: str, route: str, status: str) -> tuple:
+        key = (method, route, status)
+        histograms = self._histograms.get(key)
+        if histograms is None:
+            histograms = self._histograms[key] = (
+                REQUEST_DURATION.labels(method, route, status),
+                REQUEST_QUERIES.labels(route),
+                REQUEST_QUERY_DURATION.labels(route),
+            )
+        return histograms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_stats.reset(token)
+            duration, queries, query_duration = self.histograms(scope["method"], route_label(scope), str(status))
+            duration.observe(elapsed)
+            queries.observe(stats.queries)
+            query_duration.observe(stats.query_seconds)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Current metrics in the Prometheus text format, with its content type."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
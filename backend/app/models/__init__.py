@@ -1,7 +1,10 @@
 from app.models.application import Application
 from app.models.capability import Capability
-from app.models.tag import Tag, application_tags, capability_tags
-from app.models.incident_log import IncidentLog
+from app.models.tag import Tag, application_tags, capability_tags, normalize_tag
+from app.models.incident_log import IncidentLog, IncidentLogTag
+from app.models.incident_outbox import IncidentOutbox
+from app.models.catalog_version import CATALOG_VERSION_ID, CatalogVersion
+from app.models.catalog_tombstone import CatalogTombstone
 
 __all__ = [
     "Application",
@@ -9,5 +12,11 @@ __all__ = [
     "Tag",
     "application_tags",
     "capability_tags",
+    "normalize_tag",
     "IncidentLog",
+    "IncidentLogTag",
+    "IncidentOutbox",
+    "CATALOG_VERSION_ID",
+    "CatalogVersion",
+    "CatalogTombstone",
 ]
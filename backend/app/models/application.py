@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -14,6 +14,12 @@ class Application(Base):
     description = Column(Text, nullable=True)
     created_at = Column(DateTime, nullable=False, server_default=func.now())
     updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+    catalog_version = Column(Integer, nullable=False, default=0, server_default="0")  # of the last change
+
+    __table_args__ = (
+        # Changes since a catalog version (GET /api/tree?since=)
+        Index("ix_applications_catalog_version", "catalog_version"),
+    )
 
     # Relationships
     capabilities = relationship(
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -15,10 +15,14 @@ class Capability(Base):
     description = Column(Text, nullable=True)
     created_at = Column(DateTime, nullable=False, server_default=func.now())
     updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+    catalog_version = Column(Integer, nullable=False, default=0, server_default="0")  # of the last change
 
     # Unique constraint: name must be unique within an application
     __table_args__ = (
         UniqueConstraint("application_id", "name", name="uq_capability_app_name"),
+        # Listing capabilities across applications, ordered by name
+        Index("ix_capabilities_name_id", "name", "id"),
+        Index("ix_capabilities_catalog_version", "catalog_version"),
     )
 
     # Relationships
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from sqlalchemy.sql import func
+from app.database import Base, utcnow
+
+
+class CatalogTombstone(Base):
+    """
+    A deleted application or capability, for clients syncing changes to the tree.
+
+    Deleting an application also writes one for each of its capabilities.
+    Tombstones older than CATALOG_TOMBSTONE_RETENTION_DAYS are pruned, after
+    which deltas can't start from a version before them.
+    """
+
+    __tablename__ = "catalog_tombstones"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String(20), nullable=False)  # application, capability
+    entity_id = Column(Integer, nullable=False)
+    catalog_version = Column(Integer, nullable=False)  # of the deletion
+    deleted_at = Column(DateTime, nullable=False, default=utcnow, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_catalog_tombstones_catalog_version", "catalog_version"),
+    )
+
+    def __repr__(self):
+        return f"<CatalogTombstone(kind='{self.kind}', entity_id={self.entity_id}, version={self.catalog_version})>"
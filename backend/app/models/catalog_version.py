@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer
+from app.database import Base
+
+
+class CatalogVersion(Base):
+    """
+    Single-row counter of catalog changes.
+
+    Every transaction that changes applications, capabilities or their tags
+    increments it, so that each app process can tell when its in-memory
+    copies of the catalog are out of date.
+    """
+
+    __tablename__ = "catalog_version"
+
+    id = Column(Integer, primary_key=True)  # always CATALOG_VERSION_ID
+    version = Column(Integer, nullable=False, default=0)
+    # Tombstones up to this version have been pruned, so tree deltas can only
+    # start from it
+    pruned_version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    def __repr__(self):
+        return f"<CatalogVersion(version={self.version}, pruned_version={self.pruned_version})>"
+
+
+CATALOG_VERSION_ID = 1
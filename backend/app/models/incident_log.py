@@ -1,6 +1,31 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from app.database import Base
+from app.database import Base, utcnow
+
+
+class IncidentLogTag(Base):
+    """
+    A tag of a logged incident, as it was sent to Grafana IRM.
+
+    Kept apart from the catalog's tags, so that logging an incident never adds
+    to the catalog, and stored as submitted, case included.
+    """
+
+    __tablename__ = "incident_log_tags"
+
+    incident_log_id = Column(Integer, ForeignKey("incident_log.id", ondelete="CASCADE"), primary_key=True)
+    position = Column(Integer, primary_key=True)  # order the tags were sent in
+    value = Column(String(255), nullable=False)
+    key = Column(String(255), nullable=False)  # normalize_tag(value), for case-insensitive filtering
+
+    # Incident history filtered by tag
+    __table_args__ = (
+        Index("ix_incident_log_tags_key", "key", "incident_log_id"),
+    )
+
+    def __repr__(self):
+        return f"<IncidentLogTag(incident_log_id={self.incident_log_id}, value='{self.value}')>"
 
 
 class IncidentLog(Base):
@@ -13,8 +38,23 @@ class IncidentLog(Base):
     title = Column(Text, nullable=False)
     severity_internal = Column(String(10), nullable=False)  # P1, P2, P3, P4
     severity_grafana = Column(String(20), nullable=False)   # critical, major, minor
-    tags = Column(Text, nullable=True)  # JSON-serialized list of tags
-    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    # Set in Python so that every row has the same timestamp format (and
+    # therefore sorts correctly) on SQLite
+    created_at = Column(DateTime, nullable=False, default=utcnow, server_default=func.now())
+
+    # History is read newest first, over a time range, optionally for some
+    # severities; retention deletes from the old end
+    __table_args__ = (
+        Index("ix_incident_log_created_at_id", "created_at", "id"),
+        Index("ix_incident_log_severity_created_at_id", "severity_internal", "created_at", "id"),
+    )
+
+    # Written with one INSERT per incident (see repositories.incidents)
+    tags = relationship(
+        "IncidentLogTag",
+        order_by=IncidentLogTag.position,
+        viewonly=True,
+    )
 
     def __repr__(self):
         return f"<IncidentLog(id={self.id}, grafana_id='{self.grafana_incident_id}')>"
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from sqlalchemy.sql import func
+from app.database import Base, utcnow
+
+
+class IncidentOutbox(Base):
+    """Write-ahead queue of incidents waiting to be delivered to Grafana IRM."""
+
+    __tablename__ = "incident_outbox"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    title = Column(Text, nullable=False)
+    severity_internal = Column(String(10), nullable=False)  # P1, P2, P3, P4
+    severity_grafana = Column(String(20), nullable=False)   # critical, major, minor
+    tags = Column(Text, nullable=True)  # JSON-serialized list of tags
+    status = Column(String(20), nullable=False, default="pending")  # pending, delivering, delivered, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    # Written by the app clock (database.utcnow), which claim expiry is measured against
+    next_attempt_at = Column(DateTime, nullable=False, default=utcnow, server_default=func.now())
+    last_error = Column(Text, nullable=True)
+    grafana_incident_id = Column(String(255), nullable=True)
+    grafana_incident_url = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=utcnow, server_default=func.now())
+    updated_at = Column(DateTime, nullable=False, default=utcnow, server_default=func.now(), onupdate=utcnow)
+
+    __table_args__ = (
+        Index("ix_incident_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    def __repr__(self):
+        return f"<IncidentOutbox(id={self.id}, status='{self.status}', attempts={self.attempts})>"
@@ -1,14 +1,21 @@
-from sqlalchemy import Column, Integer, String, Table, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Table, ForeignKey, Index
+from sqlalchemy.orm import relationship, validates
 from app.database import Base
 
 
+def normalize_tag(value: str) -> str:
+    """Case-insensitive lookup key for a tag value."""
+    return value.lower()
+
+
 # Junction table for Application <-> Tag many-to-many relationship
 application_tags = Table(
     "application_tags",
     Base.metadata,
     Column("application_id", Integer, ForeignKey("applications.id", ondelete="CASCADE"), primary_key=True),
     Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    # The primary key covers lookups by application; this covers lookups by tag
+    Index("ix_application_tags_tag_id", "tag_id"),
 )
 
 # Junction table for Capability <-> Tag many-to-many relationship
@@ -17,6 +24,7 @@ capability_tags = Table(
     Base.metadata,
     Column("capability_id", Integer, ForeignKey("capabilities.id", ondelete="CASCADE"), primary_key=True),
     Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_capability_tags_tag_id", "tag_id"),
 )
 
 
@@ -27,6 +35,7 @@ class Tag(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     value = Column(String(255), unique=True, nullable=False)
+    key = Column(String(255), unique=True, nullable=False, index=True)  # normalize_tag(value)
 
     # Relationships
     applications = relationship(
@@ -40,5 +49,10 @@ class Tag(Base):
         back_populates="tags",
     )
 
+    @validates("value")
+    def _set_key(self, _, value):
+        self.key = normalize_tag(value)
+        return value
+
     def __repr__(self):
         return f"<Tag(id={self.id}, value='{self.value}')>"
@@ -0,0 +1,3 @@
+from app.repositories import catalog, incidents
+
+__all__ = ["catalog", "incidents"]
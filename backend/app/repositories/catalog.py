@@ -0,0 +1,341 @@
+"""
+Catalog queries.
+
+Every function here loads its relationships eagerly, or works on whole sets
+of rows, so that a call costs a fixed number of SQL round trips regardless of
+catalog size.
+"""
+from datetime import datetime
+from itertools import chain
+from typing import Iterable, Optional, Sequence
+from sqlalchemy import column, delete, func, inspect, literal, select, table, tuple_, union_all, update
+from sqlalchemy.orm import Session, selectinload
+from app.models import (
+    CATALOG_VERSION_ID,
+    Application,
+    Capability,
+    CatalogTombstone,
+    CatalogVersion,
+    Tag,
+    application_tags,
+    capability_tags,
+    normalize_tag,
+)
+
+# SQLite FTS5 trigram indexes over names, created by migration 0004 when the
+# SQLite build supports them and kept in sync by triggers
+applications_fts = table("applications_fts", column("rowid"), column("name"))
+capabilities_fts = table("capabilities_fts", column("rowid"), column("name"))
+_fts_available: dict[str, bool] = {}
+
+
+def list_applications(
+    db: Session,
+    limit: Optional[int] = None,
+    after: Optional[tuple[str, int]] = None,
+    q: Optional[str] = None,
+    prefix: Optional[str] = None,
+    tags: Sequence[str] = (),
+) -> list[Application]:
+    """
+    List applications ordered by name, with their tags (2 queries).
+
+    Args:
+        db: Database session
+        limit: Maximum number of applications, or None for all
+        after: (name, id) of the last application of the previous page
+        q: Case-insensitive substring of the name
+        prefix: Case-insensitive prefix of the name
+        tags: Tag values that every returned application has
+    """
+    query = db.query(Application).options(selectinload(Application.tags))
+    query = filter_catalog(
+        db, query, Application, applications_fts,
+        application_tags.c.application_id, application_tags.c.tag_id,
+        after, q, prefix, tags,
+    )
+    return query.order_by(Application.name, Application.id).limit(limit).all()
+
+
+def list_capabilities(
+    db: Session,
+    application_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    after: Optional[tuple[str, int]] = None,
+    q: Optional[str] = None,
+    prefix: Optional[str] = None,
+    tags: Sequence[str] = (),
+) -> list[Capability]:
+    """
+    List capabilities ordered by name, with their tags (2 queries).
+
+    Takes the same filters as list_applications, optionally restricted to
+    one application.
+    """
+    query = db.query(Capability).options(selectinload(Capability.tags))
+    if application_id is not None:
+        query = query.filter(Capability.application_id == application_id)
+    query = filter_catalog(
+        db, query, Capability, capabilities_fts,
+        capability_tags.c.capability_id, capability_tags.c.tag_id,
+        after, q, prefix, tags,
+    )
+    return query.order_by(Capability.name, Capability.id).limit(limit).all()
+
+
+def filter_catalog(db: Session, query, model, fts_table, owner_column, tag_column, after, q, prefix, tags):
+    """Apply keyset, name and tag filters shared by the catalog listings."""
+    if after is not None:
+        query = query.filter(tuple_(model.name, model.id) > tuple_(*after))
+
+    patterns = []
+    if q:
+        patterns.append(f"%{escape_like(q)}%")
+    if prefix:
+        patterns.append(f"{escape_like(prefix)}%")
+    for pattern in patterns:
+        query = query.filter(name_matches(db, model, fts_table, pattern))
+
+    for value in tags:
+        query = query.filter(model.id.in_(
+            select(owner_column)
+            .join(Tag, Tag.id == tag_column)
+            .where(Tag.key == normalize_tag(value))
+        ))
+    return query
+
+
+def name_matches(db: Session, model, fts_table, pattern: str):
+    """
+    Case-insensitive LIKE on a model's name.
+
+    Uses the SQLite FTS5 trigram table when there is one. Its index serves
+    patterns with at least three characters and no escaped wildcards; other
+    patterns still match correctly by scanning it. Elsewhere this is an
+    ILIKE, served on PostgreSQL by the pg_trgm index if one was created.
+    """
+    escape = "\\" if "\\" in pattern else None
+    if has_fts(db):
+        return model.id.in_(
+            select(fts_table.c.rowid).where(fts_table.c.name.like(pattern, escape=escape))
+        )
+    return model.name.ilike(pattern, escape=escape)
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so that a value matches literally."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def has_fts(db: Session) -> bool:
+    """Whether the database has the FTS5 search tables (checked once per database)."""
+    bind = db.get_bind()
+    url = str(bind.url)
+    if url not in _fts_available:
+        _fts_available[url] = bind.dialect.name == "sqlite" and inspect(bind).has_table(applications_fts.name)
+    return _fts_available[url]
+
+
+def get_application(
+    db: Session,
+    app_id: int,
+    with_capabilities: bool = False,
+) -> Optional[Application]:
+    """
+    Get an application with its tags (2 queries), optionally including its
+    capabilities and their tags (4 queries).
+    """
+    options = [selectinload(Application.tags)]
+    if with_capabilities:
+        options.append(selectinload(Application.capabilities).selectinload(Capability.tags))
+    return db.query(Application).options(*options).filter(Application.id == app_id).first()
+
+
+def get_capability(db: Session, cap_id: int) -> Optional[Capability]:
+    """Get a capability with its tags (2 queries)."""
+    return (
+        db.query(Capability)
+        .options(selectinload(Capability.tags))
+        .filter(Capability.id == cap_id)
+        .first()
+    )
+
+
+def get_tag_values(
+    db: Session,
+    application_ids: list[int],
+    capability_ids: list[int],
+) -> list[str]:
+    """
+    Get the tag values attached to the given applications and capabilities (1 query).
+
+    Application tags come before capability tags. Values are not deduplicated.
+    """
+    queries = []
+    if application_ids:
+        queries.append(
+            select(literal(0).label("source"), application_tags.c.application_id.label("owner_id"), Tag.id, Tag.value)
+            .join(Tag, Tag.id == application_tags.c.tag_id)
+            .where(application_tags.c.application_id.in_(application_ids))
+        )
+    if capability_ids:
+        queries.append(
+            select(literal(1).label("source"), capability_tags.c.capability_id.label("owner_id"), Tag.id, Tag.value)
+            .join(Tag, Tag.id == capability_tags.c.tag_id)
+            .where(capability_tags.c.capability_id.in_(capability_ids))
+        )
+    if not queries:
+        return []
+
+    query = union_all(*queries).subquery()
+    rows = db.execute(
+        select(query.c.value).order_by(query.c.source, query.c.owner_id, query.c.id)
+    )
+    return list(rows.scalars())
+
+
+# Bind parameters per IN clause, well below SQLite's variable limit
+CHUNK_SIZE = 500
+
+
+def chunked(values: list, size: int = CHUNK_SIZE):
+    """Split a list into consecutive slices of at most `size` items."""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def resolve_tags(db: Session, values: Iterable[str]) -> dict[str, Tag]:
+    """
+    Get or create tags for a batch of values, matching case-insensitively.
+
+    Existing tags are looked up by their normalized key with one indexed
+    query per 500 distinct values, and missing ones are inserted in a single
+    flush. New tags keep the case of their first occurrence.
+
+    Returns:
+        Dict of normalized key -> Tag
+    """
+    wanted: dict[str, str] = {}
+    for value in values:
+        wanted.setdefault(normalize_tag(value), value)
+
+    tags: dict[str, Tag] = {}
+    for chunk in chunked(list(wanted)):
+        for tag in db.query(Tag).filter(Tag.key.in_(chunk)):
+            tags[tag.key] = tag
+
+    missing = [Tag(value=value) for key, value in wanted.items() if key not in tags]
+    if missing:
+        db.add_all(missing)
+        db.flush()
+        tags.update((tag.key, tag) for tag in missing)
+
+    return tags
+
+
+def get_catalog_version(db: Session) -> int:
+    """Current value of the shared catalog change counter (1 query)."""
+    return db.execute(
+        select(CatalogVersion.version).where(CatalogVersion.id == CATALOG_VERSION_ID)
+    ).scalar_one()
+
+
+def increment_catalog_version(db: Session) -> int:
+    """
+    Count a catalog change in the current transaction and return the new version (1 query).
+
+    The row stays locked until the transaction ends, so concurrent writers
+    commit their versions in order.
+    """
+    return db.execute(
+        update(CatalogVersion)
+        .where(CatalogVersion.id == CATALOG_VERSION_ID)
+        .values(version=CatalogVersion.version + 1)
+        .returning(CatalogVersion.version)
+    ).scalar_one()
+
+
+def get_delta_range(db: Session) -> tuple[int, int]:
+    """
+    Oldest catalog version a tree delta can start from, and the current one (1 query).
+
+    Tombstones up to the oldest have been pruned, so a delta from before it
+    would miss deletions.
+    """
+    row = db.execute(
+        select(CatalogVersion.pruned_version, CatalogVersion.version).where(CatalogVersion.id == CATALOG_VERSION_ID)
+    ).one()
+    return row.pruned_version, row.version
+
+
+# Tombstone kind of each catalog entity
+TOMBSTONE_KINDS = {Application: "application", Capability: "capability"}
+
+
+def stamp_changes(db: Session, version: int) -> None:
+    """
+    Stamp the applications and capabilities changed in this session with a catalog version.
+
+    Deleted ones get a tombstone instead. Call just before committing, so
+    that the stamps are flushed with the rest of the changes.
+    """
+    for entity in chain(db.new, db.dirty):
+        if type(entity) in TOMBSTONE_KINDS:
+            entity.catalog_version = version
+    for entity in db.deleted:
+        kind = TOMBSTONE_KINDS.get(type(entity))
+        if kind is not None:
+            db.add(CatalogTombstone(kind=kind, entity_id=entity.id, catalog_version=version))
+
+
+def list_changes(db: Session, since: int) -> tuple[list, list, list]:
+    """
+    Applications, capabilities and tombstones stamped after a catalog version (3 queries).
+
+    Returns:
+        (id, name, description) application rows, (id, application_id, name,
+        description) capability rows and (kind, entity_id) tombstone rows,
+        each in id order
+    """
+    applications = db.execute(
+        select(Application.id, Application.name, Application.description)
+        .where(Application.catalog_version > since)
+        .order_by(Application.id)
+    ).all()
+    capabilities = db.execute(
+        select(Capability.id, Capability.application_id, Capability.name, Capability.description)
+        .where(Capability.catalog_version > since)
+        .order_by(Capability.id)
+    ).all()
+    tombstones = db.execute(
+        select(CatalogTombstone.kind, CatalogTombstone.entity_id)
+        .where(CatalogTombstone.catalog_version > since)
+        .order_by(CatalogTombstone.id)
+    ).all()
+    return applications, capabilities, tombstones
+
+
+def prune_tombstones(db: Session, before: datetime) -> int:
+    """
+    Delete tombstones of deletions made before a time, and raise the delta floor to match (3 queries).
+
+    The floor is the newest pruned deletion's version, and every tombstone
+    up to it goes, so that a delta from the floor on is still complete.
+    Tombstones are stamped under the catalog_version row lock, so one
+    committed later always has a higher version.
+
+    Returns:
+        Number of tombstones deleted
+    """
+    floor = db.execute(
+        select(func.max(CatalogTombstone.catalog_version)).where(CatalogTombstone.deleted_at < before)
+    ).scalar_one()
+    if floor is None:
+        return 0
+    deleted = db.execute(delete(CatalogTombstone).where(CatalogTombstone.catalog_version <= floor)).rowcount
+    db.execute(
+        update(CatalogVersion)
+        .where(CatalogVersion.id == CATALOG_VERSION_ID, CatalogVersion.pruned_version < floor)
+        .values(pruned_version=floor)
+    )
+    return deleted
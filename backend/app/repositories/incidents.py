@@ -0,0 +1,165 @@
+"""
+Incident log queries.
+
+Like the catalog queries, each function costs a fixed number of SQL round
+trips. The history is read newest first with (created_at, id) keyset
+pagination, served by the composite indexes on incident_log.
+"""
+from datetime import datetime
+from typing import Iterator, Optional, Sequence
+from sqlalchemy import delete, insert, select, tuple_
+from sqlalchemy.orm import Session, selectinload
+from app.models import IncidentLog, IncidentLogTag, normalize_tag
+from app.repositories.catalog import chunked
+
+
+def add_incident_log(
+    db: Session,
+    title: str,
+    severity_internal: str,
+    severity_grafana: str,
+    tags: Sequence[str],
+    grafana_incident_id: Optional[str] = None,
+) -> IncidentLog:
+    """
+    Add an incident log entry with its tags (2 queries).
+
+    Tags are stored as given, in order, in the log's own tag table; the
+    catalog's tags are left alone. The caller commits.
+    """
+    incident = IncidentLog(
+        grafana_incident_id=grafana_incident_id,
+        title=title,
+        severity_internal=severity_internal,
+        severity_grafana=severity_grafana,
+    )
+    db.add(incident)
+    db.flush()
+
+    if tags:
+        db.execute(insert(IncidentLogTag), [
+            {"incident_log_id": incident.id, "position": position, "value": value, "key": normalize_tag(value)}
+            for position, value in enumerate(tags)
+        ])
+    return incident
+
+
+def list_incidents(
+    db: Session,
+    limit: int,
+    before: Optional[tuple[datetime, int]] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    severities: Sequence[str] = (),
+    tags: Sequence[str] = (),
+) -> list[IncidentLog]:
+    """
+    List logged incidents newest first, with their tags (2 queries).
+
+    Args:
+        db: Database session
+        limit: Maximum number of incidents
+        before: (created_at, id) of the last incident of the previous page
+        since: Only incidents created at or after this time (UTC)
+        until: Only incidents created before this time (UTC)
+        severities: Only incidents with one of these internal severities
+        tags: Tag values that every returned incident has
+    """
+    query = db.query(IncidentLog).options(selectinload(IncidentLog.tags))
+    if before is not None:
+        query = query.filter(tuple_(IncidentLog.created_at, IncidentLog.id) < tuple_(*before))
+    query = filter_incidents(query, since, until, severities, tags)
+    return query.order_by(IncidentLog.created_at.desc(), IncidentLog.id.desc()).limit(limit).all()
+
+
+def stream_incidents(
+    db: Session,
+    batch_size: int,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    severities: Sequence[str] = (),
+    tags: Sequence[str] = (),
+) -> Iterator[list[dict]]:
+    """
+    Stream logged incidents oldest first, in batches of plain dicts.
+
+    Rows are read through a server-side cursor where the driver has one, and
+    the tags of each batch are loaded with one extra query, so memory use
+    depends on the batch size and not on the number of incidents. Takes the
+    same filters as list_incidents.
+    """
+    query = filter_incidents(
+        select(
+            IncidentLog.id,
+            IncidentLog.grafana_incident_id,
+            IncidentLog.title,
+            IncidentLog.severity_internal,
+            IncidentLog.severity_grafana,
+            IncidentLog.created_at,
+        ),
+        since, until, severities, tags,
+    ).order_by(IncidentLog.created_at, IncidentLog.id)
+
+    result = db.execute(query.execution_options(yield_per=batch_size))
+    for rows in result.partitions():
+        tag_values: dict[int, list[str]] = {}
+        for incident_id, value in db.execute(
+            select(IncidentLogTag.incident_log_id, IncidentLogTag.value)
+            .where(IncidentLogTag.incident_log_id.in_([row.id for row in rows]))
+            .order_by(IncidentLogTag.incident_log_id, IncidentLogTag.position)
+        ):
+            tag_values.setdefault(incident_id, []).append(value)
+
+        yield [
+            {
+                "id": row.id,
+                "grafana_incident_id": row.grafana_incident_id,
+                "title": row.title,
+                "severity": row.severity_internal,
+                "severity_grafana": row.severity_grafana,
+                "tags": tag_values.get(row.id, []),
+                "created_at": row.created_at,
+            }
+            for row in rows
+        ]
+
+
+def filter_incidents(query, since, until, severities, tags):
+    """Apply the time, severity and tag filters shared by the incident queries."""
+    if since is not None:
+        query = query.filter(IncidentLog.created_at >= since)
+    if until is not None:
+        query = query.filter(IncidentLog.created_at < until)
+    if severities:
+        query = query.filter(IncidentLog.severity_internal.in_(severities))
+    for value in tags:
+        query = query.filter(IncidentLog.id.in_(
+            select(IncidentLogTag.incident_log_id).where(IncidentLogTag.key == normalize_tag(value))
+        ))
+    return query
+
+
+def list_expired_incidents(db: Session, cutoff: datetime, limit: int) -> list[IncidentLog]:
+    """
+    Oldest incidents created before a cutoff, with their tags (2 queries).
+
+    On PostgreSQL the rows are locked and rows locked by another process
+    are skipped, so that concurrent retention runs don't archive the same
+    incidents twice.
+    """
+    return (
+        db.query(IncidentLog)
+        .options(selectinload(IncidentLog.tags))
+        .filter(IncidentLog.created_at < cutoff)
+        .order_by(IncidentLog.created_at, IncidentLog.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True, of=IncidentLog)
+        .all()
+    )
+
+
+def delete_incidents(db: Session, ids: list[int]) -> None:
+    """Delete incidents and their tags (2 queries per 500 ids). The caller commits."""
+    for chunk in chunked(ids):
+        db.execute(delete(IncidentLogTag).where(IncidentLogTag.incident_log_id.in_(chunk)))
+        db.execute(delete(IncidentLog).where(IncidentLog.id.in_(chunk)))
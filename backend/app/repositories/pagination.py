@@ -0,0 +1,41 @@
+"""
+Keyset pagination helpers.
+
+A cursor is the sort key of the last row on a page, encoded as URL-safe
+base64 JSON. Clients treat it as opaque and pass it back to get the next page.
+"""
+import base64
+import binascii
+import json
+from typing import Any
+
+# Largest page a listing endpoint will return
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded."""
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last row on a page."""
+    data = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """Decode a cursor holding `size` sort key values."""
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(data)
+    except (binascii.Error, ValueError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursor("Invalid cursor")
+    return values
+
+
+def is_row_id(value: Any) -> bool:
+    """Whether a decoded cursor value is a row id (JSON true and false decode to bools, which are ints)."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
@@ -0,0 +1,47 @@
+"""
+Fast JSON responses (the "orjson" extra).
+
+Endpoints that return many rows build plain dicts in the field order of
+their response model. By default FastAPI validates those dicts against the
+response_model once and serializes them. With FAST_JSON_RESPONSES, they are
+instead written straight to bytes with orjson, skipping the validation. The
+JSON is the same either way, and response_model still documents the
+endpoint.
+"""
+from typing import Any, Mapping, Optional
+from fastapi import Response
+from app.config import get_settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def orjson_available() -> bool:
+    return orjson is not None
+
+
+def fast_json_enabled() -> bool:
+    return orjson is not None and get_settings().fast_json_responses
+
+
+def json_response(content: Any, status_code: int = 200, headers: Optional[Mapping[str, str]] = None) -> Response:
+    """Serialize content with orjson into a response."""
+    # OPT_UTC_Z writes UTC datetimes with a "Z" suffix, as pydantic does
+    body = orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return Response(body, status_code=status_code, headers=headers, media_type="application/json")
+
+
+def render(content: Any, status_code: int = 200, response: Optional[Response] = None) -> Any:
+    """
+    Return an endpoint's content, serialized here on the fast path.
+
+    Args:
+        content: JSON-compatible data matching the route's response_model
+        status_code: The route's status code
+        response: The endpoint's injected Response, whose headers are kept
+    """
+    if not fast_json_enabled():
+        return content
+    return json_response(content, status_code, response.headers if response is not None else None)
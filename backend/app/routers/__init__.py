@@ -1,5 +1,7 @@
 from app.routers.tree import router as tree_router
 from app.routers.incidents import router as incidents_router
 from app.routers.admin import router as admin_router
+from app.routers.search import router as search_router
+from app.routers.events import router as events_router
 
-__all__ = ["tree_router", "incidents_router", "admin_router"]
+__all__ = ["tree_router", "incidents_router", "admin_router", "search_router", "events_router"]
@@ -1,7 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models import Application, Capability, Tag
+from app.database import get_db, get_read_db
+from app.models import Application, Capability, Tag, normalize_tag
+from app.repositories import catalog as catalog_repo
+from app.repositories.pagination import MAX_PAGE_SIZE, InvalidCursor, decode_cursor, encode_cursor, is_row_id
 from app.schemas.application import (
     ApplicationCreate,
     ApplicationUpdate,
@@ -13,23 +18,22 @@ from app.schemas.capability import (
     CapabilityUpdate,
     CapabilityResponse,
 )
+from app.schemas.catalog import CatalogImportResponse
+from app.responses import render
+from app.services import catalog_io
+from app.services.catalog_sync import catalog_sync
+from app.services.events import APPLICATION, CAPABILITY, publish_catalog_change, publish_catalog_reset
+from app.services.search_index import search_index
+from app.services.tag_index import tag_index
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
 
 # Helper function to sync tags
 def sync_tags(db: Session, tag_values: list[str]) -> list[Tag]:
-    """Get or create tags and return them."""
-    tags = []
-    for value in tag_values:
-        # Case-insensitive lookup
-        tag = db.query(Tag).filter(Tag.value.ilike(value)).first()
-        if not tag:
-            tag = Tag(value=value)
-            db.add(tag)
-            db.flush()
-        tags.append(tag)
-    return tags
+    """Get or create tags and return them, deduplicated case-insensitively."""
+    tags = catalog_repo.resolve_tags(db, tag_values)
+    return [tags[key] for key in dict.fromkeys(normalize_tag(value) for value in tag_values)]
 
 
 def serialize_tags(entity) -> list[str]:
@@ -37,22 +41,76 @@ def serialize_tags(entity) -> list[str]:
     return [tag.value for tag in entity.tags]
 
 
+# Responses are built as dicts in the field order of their schema, so that
+# FastAPI validates them once, or the fast path writes the same JSON directly
+def application_dict(app: Application) -> dict:
+    """ApplicationResponse fields of an application."""
+    return {
+        "name": app.name,
+        "description": app.description,
+        "id": app.id,
+        "created_at": app.created_at,
+        "updated_at": app.updated_at,
+        "tags": serialize_tags(app),
+    }
+
+
+def capability_dict(cap: Capability) -> dict:
+    """CapabilityResponse fields of a capability."""
+    return {
+        "name": cap.name,
+        "description": cap.description,
+        "id": cap.id,
+        "application_id": cap.application_id,
+        "created_at": cap.created_at,
+        "updated_at": cap.updated_at,
+        "tags": serialize_tags(cap),
+    }
+
+
+def parse_cursor(cursor: Optional[str]) -> Optional[tuple[str, int]]:
+    """Decode a listing cursor into the (name, id) of the last row seen."""
+    if cursor is None:
+        return None
+    try:
+        name, row_id = decode_cursor(cursor, 2)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not isinstance(name, str) or not is_row_id(row_id):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return name, row_id
+
+
 # Application endpoints
 @router.get("/apps", response_model=list[ApplicationResponse])
-def list_applications(db: Session = Depends(get_db)):
-    """List all applications."""
-    apps = db.query(Application).order_by(Application.name).all()
-    return [
-        ApplicationResponse(
-            id=app.id,
-            name=app.name,
-            description=app.description,
-            created_at=app.created_at,
-            updated_at=app.updated_at,
-            tags=serialize_tags(app),
-        )
-        for app in apps
-    ]
+def list_applications(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size (all applications if omitted)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    q: Optional[str] = Query(None, min_length=1, max_length=255, description="Name contains (case-insensitive)"),
+    prefix: Optional[str] = Query(None, min_length=1, max_length=255, description="Name starts with (case-insensitive)"),
+    tag: list[str] = Query([], description="Only applications with this tag (repeatable)"),
+    db: Session = Depends(get_read_db),
+):
+    """
+    List applications ordered by name.
+
+    With a limit, the response is one page and the X-Next-Cursor header
+    holds the cursor for the next one (absent on the last page).
+    """
+    apps = catalog_repo.list_applications(
+        db,
+        limit=limit + 1 if limit else None,
+        after=parse_cursor(cursor),
+        q=q,
+        prefix=prefix,
+        tags=tag,
+    )
+    if limit and len(apps) > limit:
+        apps = apps[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(apps[-1].name, apps[-1].id)
+
+    return render([application_dict(app) for app in apps], response=response)
 
 
 @router.post("/apps", response_model=ApplicationResponse, status_code=201)
@@ -72,52 +130,33 @@ def create_application(app_data: ApplicationCreate, db: Session = Depends(get_db
         app.tags = sync_tags(db, app_data.tags)
 
     db.add(app)
-    db.commit()
+    version = catalog_sync.commit(db)
     db.refresh(app)
 
-    return ApplicationResponse(
-        id=app.id,
-        name=app.name,
-        description=app.description,
-        created_at=app.created_at,
-        updated_at=app.updated_at,
-        tags=serialize_tags(app),
-    )
+    tag_index.set_application(app.id, app.tags)
+    search_index.set_application(app)
+    publish_catalog_change("upsert", APPLICATION, app.id, version, name=app.name, description=app.description)
+
+    return render(application_dict(app), status_code=201)
 
 
 @router.get("/apps/{app_id}", response_model=ApplicationWithCapabilities)
-def get_application(app_id: int, db: Session = Depends(get_db)):
+def get_application(app_id: int, db: Session = Depends(get_read_db)):
     """Get application details including capabilities."""
-    app = db.query(Application).filter(Application.id == app_id).first()
+    app = catalog_repo.get_application(db, app_id, with_capabilities=True)
     if not app:
         raise HTTPException(status_code=404, detail="Application not found")
 
-    return ApplicationWithCapabilities(
-        id=app.id,
-        name=app.name,
-        description=app.description,
-        created_at=app.created_at,
-        updated_at=app.updated_at,
-        tags=serialize_tags(app),
-        capabilities=[
-            CapabilityResponse(
-                id=cap.id,
-                application_id=cap.application_id,
-                name=cap.name,
-                description=cap.description,
-                created_at=cap.created_at,
-                updated_at=cap.updated_at,
-                tags=serialize_tags(cap),
-            )
-            for cap in app.capabilities
-        ],
-    )
+    return render({
+        **application_dict(app),
+        "capabilities": [capability_dict(cap) for cap in app.capabilities],
+    })
 
 
 @router.put("/apps/{app_id}", response_model=ApplicationResponse)
 def update_application(app_id: int, app_data: ApplicationUpdate, db: Session = Depends(get_db)):
     """Update an application."""
-    app = db.query(Application).filter(Application.id == app_id).first()
+    app = catalog_repo.get_application(db, app_id)
     if not app:
         raise HTTPException(status_code=404, detail="Application not found")
 
@@ -137,31 +176,64 @@ def update_application(app_id: int, app_data: ApplicationUpdate, db: Session = D
     if app_data.tags is not None:
         app.tags = sync_tags(db, app_data.tags)
 
-    db.commit()
+    version = catalog_sync.commit(db)
     db.refresh(app)
 
-    return ApplicationResponse(
-        id=app.id,
-        name=app.name,
-        description=app.description,
-        created_at=app.created_at,
-        updated_at=app.updated_at,
-        tags=serialize_tags(app),
-    )
+    tag_index.set_application(app.id, app.tags)
+    search_index.set_application(app)
+    publish_catalog_change("upsert", APPLICATION, app.id, version, name=app.name, description=app.description)
+
+    return render(application_dict(app))
 
 
 @router.delete("/apps/{app_id}", status_code=204)
 def delete_application(app_id: int, db: Session = Depends(get_db)):
     """Delete an application (cascades to capabilities)."""
-    app = db.query(Application).filter(Application.id == app_id).first()
+    app = catalog_repo.get_application(db, app_id, with_capabilities=True)
     if not app:
         raise HTTPException(status_code=404, detail="Application not found")
 
     db.delete(app)
-    db.commit()
+    version = catalog_sync.commit(db)
+    tag_index.remove_application(app_id)
+    search_index.remove_application(app_id)
+    publish_catalog_change("delete", APPLICATION, app_id, version)
 
 
 # Capability endpoints
+@router.get("/capabilities", response_model=list[CapabilityResponse])
+def list_capabilities(
+    response: Response,
+    application_id: Optional[int] = Query(None, description="Only capabilities of this application"),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    q: Optional[str] = Query(None, min_length=1, max_length=255, description="Name contains (case-insensitive)"),
+    prefix: Optional[str] = Query(None, min_length=1, max_length=255, description="Name starts with (case-insensitive)"),
+    tag: list[str] = Query([], description="Only capabilities with this tag (repeatable)"),
+    db: Session = Depends(get_read_db),
+):
+    """
+    List capabilities ordered by name, one page at a time.
+
+    The X-Next-Cursor header holds the cursor for the next page (absent on
+    the last page).
+    """
+    caps = catalog_repo.list_capabilities(
+        db,
+        application_id=application_id,
+        limit=limit + 1,
+        after=parse_cursor(cursor),
+        q=q,
+        prefix=prefix,
+        tags=tag,
+    )
+    if len(caps) > limit:
+        caps = caps[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(caps[-1].name, caps[-1].id)
+
+    return render([capability_dict(cap) for cap in caps], response=response)
+
+
 @router.post("/capabilities", response_model=CapabilityResponse, status_code=201)
 def create_capability(cap_data: CapabilityCreate, db: Session = Depends(get_db)):
     """Create a new capability."""
@@ -188,42 +260,33 @@ def create_capability(cap_data: CapabilityCreate, db: Session = Depends(get_db))
         cap.tags = sync_tags(db, cap_data.tags)
 
     db.add(cap)
-    db.commit()
+    version = catalog_sync.commit(db)
     db.refresh(cap)
 
-    return CapabilityResponse(
-        id=cap.id,
-        application_id=cap.application_id,
-        name=cap.name,
-        description=cap.description,
-        created_at=cap.created_at,
-        updated_at=cap.updated_at,
-        tags=serialize_tags(cap),
+    tag_index.set_capability(cap.id, cap.application_id, cap.tags)
+    search_index.set_capability(cap)
+    publish_catalog_change(
+        "upsert", CAPABILITY, cap.id, version,
+        application_id=cap.application_id, name=cap.name, description=cap.description,
     )
 
+    return render(capability_dict(cap), status_code=201)
+
 
 @router.get("/capabilities/{cap_id}", response_model=CapabilityResponse)
-def get_capability(cap_id: int, db: Session = Depends(get_db)):
+def get_capability(cap_id: int, db: Session = Depends(get_read_db)):
     """Get capability details."""
-    cap = db.query(Capability).filter(Capability.id == cap_id).first()
+    cap = catalog_repo.get_capability(db, cap_id)
     if not cap:
         raise HTTPException(status_code=404, detail="Capability not found")
 
-    return CapabilityResponse(
-        id=cap.id,
-        application_id=cap.application_id,
-        name=cap.name,
-        description=cap.description,
-        created_at=cap.created_at,
-        updated_at=cap.updated_at,
-        tags=serialize_tags(cap),
-    )
+    return render(capability_dict(cap))
 
 
 @router.put("/capabilities/{cap_id}", response_model=CapabilityResponse)
 def update_capability(cap_id: int, cap_data: CapabilityUpdate, db: Session = Depends(get_db)):
     """Update a capability."""
-    cap = db.query(Capability).filter(Capability.id == cap_id).first()
+    cap = catalog_repo.get_capability(db, cap_id)
     if not cap:
         raise HTTPException(status_code=404, detail="Capability not found")
 
@@ -244,26 +307,66 @@ def update_capability(cap_id: int, cap_data: CapabilityUpdate, db: Session = Dep
     if cap_data.tags is not None:
         cap.tags = sync_tags(db, cap_data.tags)
 
-    db.commit()
+    version = catalog_sync.commit(db)
     db.refresh(cap)
 
-    return CapabilityResponse(
-        id=cap.id,
-        application_id=cap.application_id,
-        name=cap.name,
-        description=cap.description,
-        created_at=cap.created_at,
-        updated_at=cap.updated_at,
-        tags=serialize_tags(cap),
+    tag_index.set_capability(cap.id, cap.application_id, cap.tags)
+    search_index.set_capability(cap)
+    publish_catalog_change(
+        "upsert", CAPABILITY, cap.id, version,
+        application_id=cap.application_id, name=cap.name, description=cap.description,
     )
 
+    return render(capability_dict(cap))
+
 
 @router.delete("/capabilities/{cap_id}", status_code=204)
 def delete_capability(cap_id: int, db: Session = Depends(get_db)):
     """Delete a capability."""
-    cap = db.query(Capability).filter(Capability.id == cap_id).first()
+    cap = catalog_repo.get_capability(db, cap_id)
     if not cap:
         raise HTTPException(status_code=404, detail="Capability not found")
 
     db.delete(cap)
-    db.commit()
+    version = catalog_sync.commit(db)
+    tag_index.remove_capability(cap_id)
+    search_index.remove_capability(cap_id)
+    publish_catalog_change("delete", CAPABILITY, cap_id, version)
+
+
+# Bulk import/export endpoints
+@router.post("/import", response_model=CatalogImportResponse)
+async def import_catalog(
+    request: Request,
+    format: catalog_io.CatalogFormat = "ndjson",
+    db: Session = Depends(get_db),
+):
+    """
+    Bulk upsert applications, capabilities and tags from NDJSON or CSV.
+
+    The whole import is applied in one transaction; an invalid record
+    rejects the entire file.
+    """
+    body = await request.body()
+
+    def apply_import() -> CatalogImportResponse:
+        records = catalog_io.parse_records(body, format)
+        result = catalog_io.import_catalog(db, records)
+        catalog_sync.load(db)
+        publish_catalog_reset(catalog_sync.version)
+        return result
+
+    try:
+        return await run_in_threadpool(apply_import)
+    except catalog_io.CatalogImportError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@router.get("/export")
+def export_catalog(format: catalog_io.CatalogFormat = "ndjson"):
+    """Stream the whole catalog as NDJSON or CSV."""
+    return StreamingResponse(
+        catalog_io.export_catalog(format),
+        media_type=catalog_io.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="catalog.{format}"'},
+    )
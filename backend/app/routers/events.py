@@ -0,0 +1,25 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from app.services.events import event_broadcaster
+
+router = APIRouter(prefix="/api", tags=["events"])
+
+
+@router.get("/events")
+async def stream_events(request: Request):
+    """
+    Stream catalog changes and queued incident status as server-sent events.
+
+    A client that reconnects (with Last-Event-ID) or falls behind gets a
+    "resync" event, after which it should refetch /api/tree and any incident
+    status it shows.
+    """
+    if event_broadcaster.full:
+        raise HTTPException(status_code=503, detail="Too many event stream clients")
+
+    return StreamingResponse(
+        event_broadcaster.stream(resync="last-event-id" in request.headers),
+        media_type="text/event-stream",
+        # Stop proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,22 +1,106 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.schemas.incident import IncidentCreate, IncidentResponse
+from datetime import datetime, timezone
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.repositories import incidents as incidents_repo
+from app.repositories.pagination import MAX_PAGE_SIZE, InvalidCursor, decode_cursor, encode_cursor, is_row_id
+from app.schemas.incident import (
+    IncidentCreate,
+    IncidentResponse,
+    IncidentStatusResponse,
+    IncidentLogResponse,
+    Severity,
+)
+from app.responses import render
+from app.services import incident_export
 from app.services.incident import IncidentService
 
 router = APIRouter(prefix="/api", tags=["incidents"])
 
 
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Convert a timestamp to naive UTC, the format stored in the database."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def parse_cursor(cursor: Optional[str]) -> Optional[tuple[datetime, int]]:
+    """Decode a history cursor into the (created_at, id) of the last incident seen."""
+    if cursor is None:
+        return None
+    try:
+        created_at, row_id = decode_cursor(cursor, 2)
+        if not isinstance(created_at, str) or not is_row_id(row_id):
+            raise InvalidCursor("Invalid cursor")
+        return datetime.fromisoformat(created_at), row_id
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+@router.get("/incidents", response_model=list[IncidentLogResponse])
+async def list_incidents(
+    response: Response,
+    since: Optional[datetime] = Query(None, description="Created at or after (ISO 8601, UTC if no offset)"),
+    until: Optional[datetime] = Query(None, description="Created before (ISO 8601, UTC if no offset)"),
+    severity: list[Severity] = Query([], description="Only this severity (repeatable)"),
+    tag: list[str] = Query([], description="Only incidents with this tag (repeatable)"),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Incident history, newest first.
+
+    The X-Next-Cursor header holds the cursor for the next (older) page and
+    is absent on the last page. Entries older than the configured retention
+    period are no longer listed.
+    """
+    incidents = await db.run_sync(
+        incidents_repo.list_incidents,
+        limit=limit + 1,
+        before=parse_cursor(cursor),
+        since=as_utc(since),
+        until=as_utc(until),
+        severities=[s.value for s in severity],
+        tags=tag,
+    )
+    if len(incidents) > limit:
+        incidents = incidents[:limit]
+        last = incidents[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at.isoformat(), last.id)
+
+    return render(
+        [
+            {
+                "id": incident.id,
+                "grafana_incident_id": incident.grafana_incident_id,
+                "title": incident.title,
+                "severity": incident.severity_internal,
+                "severity_grafana": incident.severity_grafana,
+                "tags": [tag.value for tag in incident.tags],
+                "created_at": incident.created_at,
+            }
+            for incident in incidents
+        ],
+        response=response,
+    )
+
+
 @router.post("/incidents", response_model=IncidentResponse)
 async def create_incident(
     incident: IncidentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Create a new incident in Grafana IRM.
 
     Validates input, aggregates tags from selected applications/capabilities,
-    maps severity, and calls the Grafana IRM API.
+    maps severity, and calls the Grafana IRM API. When the delivery queue is
+    enabled, returns straight away with status "queued" and the id of the
+    outbox entry, whose delivery status is at /api/incidents/outbox/{id}.
     """
     service = IncidentService(db)
 
@@ -28,3 +112,47 @@ async def create_incident(
     )
 
     return IncidentResponse(**result)
+
+
+@router.get("/incidents/export")
+def export_incidents(
+    format: incident_export.IncidentExportFormat = "ndjson",
+    since: Optional[datetime] = Query(None, description="Created at or after (ISO 8601, UTC if no offset)"),
+    until: Optional[datetime] = Query(None, description="Created before (ISO 8601, UTC if no offset)"),
+    severity: list[Severity] = Query([], description="Only this severity (repeatable)"),
+    tag: list[str] = Query([], description="Only incidents with this tag (repeatable)"),
+):
+    """
+    Stream the incident history, oldest first, as NDJSON, CSV or Parquet.
+
+    Takes the same filters as the history listing, without pagination.
+    Parquet needs the "parquet" extra.
+    """
+    if format == "parquet" and not incident_export.parquet_available():
+        raise HTTPException(status_code=400, detail="Parquet export requires the 'parquet' extra (pyarrow)")
+
+    return StreamingResponse(
+        incident_export.export_incidents(
+            format,
+            since=as_utc(since),
+            until=as_utc(until),
+            severities=[s.value for s in severity],
+            tags=tag,
+        ),
+        media_type=incident_export.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="incidents.{format}"'},
+    )
+
+
+@router.get("/incidents/outbox/{outbox_id}", response_model=IncidentStatusResponse)
+async def get_incident_status(outbox_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get the delivery status of a queued incident.
+
+    Takes the incident_id returned by POST /api/incidents with status
+    "queued", an outbox id. History entries have ids of their own.
+    """
+    outbox = await IncidentService(db).get_queued_incident(outbox_id)
+    if not outbox:
+        raise HTTPException(status_code=404, detail="Incident not found")
+    return outbox
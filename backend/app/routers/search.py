@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.database import get_read_db
+from app.schemas.search import SearchResult
+from app.services.search_index import search_index
+
+router = APIRouter(prefix="/api", tags=["search"])
+
+# Upper bound on results per search
+MAX_SEARCH_RESULTS = 50
+
+
+@router.get("/search", response_model=list[SearchResult])
+def search(
+    q: str = Query(..., min_length=1, max_length=100, description="Search terms"),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_RESULTS),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Typeahead search over application and capability names, tags and descriptions.
+
+    Results are ranked best first: name matches, then tag matches, then
+    description matches. Served from an in-memory index.
+    """
+    if not search_index.loaded:
+        search_index.load(db)
+
+    return [
+        SearchResult(
+            type=doc.kind,
+            id=doc.id,
+            name=doc.name,
+            description=doc.description,
+            tags=list(doc.tags),
+            application_id=doc.application_id,
+            application_name=parent.name if parent else None,
+        )
+        for doc, parent in search_index.search(q, limit)
+    ]
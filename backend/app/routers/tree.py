@@ -1,37 +1,58 @@
-from fastapi import APIRouter, Depends
+from typing import Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models import Application
-from app.schemas.tree import TreeNode, CapabilityNode
+from app.database import get_read_db
+from app.responses import render
+from app.schemas.tree import TreeDelta, TreeNode
+from app.services.catalog import build_tree_delta, catalog_cache
+
+# Catalog version of the full tree, to pass as since= for the next delta
+CATALOG_VERSION_HEADER = "X-Catalog-Version"
 
 router = APIRouter(prefix="/api", tags=["tree"])
 
 
-@router.get("/tree", response_model=list[TreeNode])
-def get_tree(db: Session = Depends(get_db)):
+def etag_matches(etag: str, if_none_match: str | None) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+@router.get("/tree", response_model=Union[list[TreeNode], TreeDelta])
+def get_tree(
+    request: Request,
+    since: Optional[int] = Query(None, ge=0, description="Only changes after this catalog version (X-Catalog-Version)"),
+    db: Session = Depends(get_read_db),
+):
     """
     Get the full application/capability tree for the main page.
 
-    Returns all applications with their capabilities.
+    Returns all applications with their capabilities. The serialized tree is
+    cached until the next admin write, and clients can revalidate with
+    If-None-Match to receive a 304. The X-Catalog-Version header holds the
+    catalog version it reflects.
+
+    With since, returns only what changed after that version: created or
+    changed nodes, and the ids of deleted ones (a TreeDelta, whose version is
+    the next since). A version newer than the catalog's, or too old for the
+    deletions since to still be known, gets a 410, and the client should
+    refetch the whole tree.
     """
-    applications = db.query(Application).order_by(Application.name).all()
-
-    tree = []
-    for app in applications:
-        capabilities = [
-            CapabilityNode(
-                id=cap.id,
-                name=cap.name,
-                description=cap.description,
-            )
-            for cap in sorted(app.capabilities, key=lambda c: c.name)
-        ]
-
-        tree.append(TreeNode(
-            id=app.id,
-            name=app.name,
-            description=app.description,
-            capabilities=capabilities,
-        ))
-
-    return tree
+    if since is not None:
+        delta = build_tree_delta(db, since)
+        if delta is None:
+            raise HTTPException(status_code=410, detail="Unknown catalog version, refetch the tree")
+        return render(delta)
+
+    snapshot = catalog_cache.get_tree(db)
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache", CATALOG_VERSION_HEADER: str(snapshot.catalog_version)}
+
+    if etag_matches(snapshot.etag, request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
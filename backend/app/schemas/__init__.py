@@ -9,11 +9,16 @@ from app.schemas.capability import (
     CapabilityUpdate,
     CapabilityResponse,
 )
+from app.schemas.catalog import CatalogRecord, CatalogImportResponse
 from app.schemas.incident import (
     IncidentCreate,
     IncidentResponse,
+    IncidentStatusResponse,
+    IncidentLogResponse,
 )
-from app.schemas.tree import TreeNode, CapabilityNode
+from app.schemas.search import SearchResult
+from app.schemas.tag import TagValue
+from app.schemas.tree import TreeNode, CapabilityNode, ApplicationNode, CapabilityChange, TreeDelta
 
 __all__ = [
     "ApplicationCreate",
@@ -23,8 +28,17 @@ __all__ = [
     "CapabilityCreate",
     "CapabilityUpdate",
     "CapabilityResponse",
+    "CatalogRecord",
+    "CatalogImportResponse",
     "IncidentCreate",
     "IncidentResponse",
+    "IncidentStatusResponse",
+    "IncidentLogResponse",
+    "SearchResult",
+    "TagValue",
     "TreeNode",
     "CapabilityNode",
+    "ApplicationNode",
+    "CapabilityChange",
+    "TreeDelta",
 ]
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional
+from app.schemas.tag import TagValue
 
 
 class ApplicationBase(BaseModel):
@@ -11,14 +12,14 @@ class ApplicationBase(BaseModel):
 
 class ApplicationCreate(ApplicationBase):
     """Schema for creating an application."""
-    tags: list[str] = Field(default_factory=list)
+    tags: list[TagValue] = Field(default_factory=list)
 
 
 class ApplicationUpdate(BaseModel):
     """Schema for updating an application."""
     name: Optional[str] = Field(None, min_length=1, max_length=255)
     description: Optional[str] = None
-    tags: Optional[list[str]] = None
+    tags: Optional[list[TagValue]] = None
 
 
 class ApplicationResponse(ApplicationBase):
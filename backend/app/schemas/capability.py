@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional
+from app.schemas.tag import TagValue
 
 
 class CapabilityBase(BaseModel):
@@ -12,14 +13,14 @@ class CapabilityBase(BaseModel):
 class CapabilityCreate(CapabilityBase):
     """Schema for creating a capability."""
     application_id: int
-    tags: list[str] = Field(default_factory=list)
+    tags: list[TagValue] = Field(default_factory=list)
 
 
 class CapabilityUpdate(BaseModel):
     """Schema for updating a capability."""
     name: Optional[str] = Field(None, min_length=1, max_length=255)
     description: Optional[str] = None
-    tags: Optional[list[str]] = None
+    tags: Optional[list[TagValue]] = None
 
 
 class CapabilityResponse(CapabilityBase):
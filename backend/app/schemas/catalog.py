@@ -0,0 +1,24 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from app.schemas.tag import TagValue
+
+
+class CatalogRecord(BaseModel):
+    """
+    One line of a bulk catalog import or export.
+
+    A record without a capability describes the application itself; a record
+    with one describes that capability of the application.
+    """
+    application: str = Field(..., min_length=1, max_length=255)
+    capability: Optional[str] = Field(None, min_length=1, max_length=255)
+    description: Optional[str] = None
+    tags: list[TagValue] = Field(default_factory=list)
+
+
+class CatalogImportResponse(BaseModel):
+    """Summary of a bulk catalog import."""
+    applications_created: int = 0
+    applications_updated: int = 0
+    capabilities_created: int = 0
+    capabilities_updated: int = 0
@@ -1,4 +1,5 @@
 from pydantic import BaseModel, Field, field_validator
+from datetime import datetime
 from typing import Optional
 from enum import Enum
 
@@ -11,6 +12,14 @@ class Severity(str, Enum):
     P4 = "P4"
 
 
+class DeliveryStatus(str, Enum):
+    """Delivery states of a queued incident."""
+    PENDING = "pending"
+    DELIVERING = "delivering"
+    DELIVERED = "delivered"
+    FAILED = "failed"
+
+
 class IncidentCreate(BaseModel):
     """Schema for creating an incident."""
     title: str = Field(..., min_length=1, max_length=500)
@@ -32,7 +41,35 @@ class IncidentCreate(BaseModel):
 
 class IncidentResponse(BaseModel):
     """Schema for incident creation response."""
-    status: str
+    status: str  # ok, queued, error
+    incident_id: Optional[int] = None  # outbox id when queued (GET /api/incidents/outbox/{id})
     grafana_incident_id: Optional[str] = None
     grafana_incident_url: Optional[str] = None
     message: Optional[str] = None
+    deduplicated: bool = False  # an identical incident was submitted recently
+
+
+class IncidentStatusResponse(BaseModel):
+    """Schema for the delivery status of a queued incident."""
+    id: int
+    status: DeliveryStatus
+    attempts: int
+    grafana_incident_id: Optional[str] = None
+    grafana_incident_url: Optional[str] = None
+    last_error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class IncidentLogResponse(BaseModel):
+    """Schema for an entry of the incident history."""
+    id: int
+    grafana_incident_id: Optional[str] = None
+    title: str
+    severity: Severity
+    severity_grafana: str
+    tags: list[str]
+    created_at: datetime
@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
+
+
+class SearchResult(BaseModel):
+    """A ranked application or capability match."""
+    type: Literal["application", "capability"]
+    id: int
+    name: str
+    description: Optional[str] = None
+    tags: list[str] = Field(default_factory=list)
+    application_id: int
+    application_name: Optional[str] = None  # Set for capabilities
@@ -0,0 +1,6 @@
+from typing import Annotated
+from pydantic import StringConstraints
+
+# A tag value as accepted by the admin API and bulk import: surrounding
+# whitespace is stripped, and the result must fit the tags.value column
+TagValue = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=255)]
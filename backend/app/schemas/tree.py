@@ -12,12 +12,30 @@ class CapabilityNode(BaseModel):
         from_attributes = True
 
 
-class TreeNode(BaseModel):
-    """Schema for application node in tree view."""
+class ApplicationNode(BaseModel):
+    """Schema for an application in tree view, without its capabilities."""
     id: int
     name: str
     description: Optional[str] = None
-    capabilities: list[CapabilityNode] = []
 
     class Config:
         from_attributes = True
+
+
+class TreeNode(ApplicationNode):
+    """Schema for application node in tree view."""
+    capabilities: list[CapabilityNode] = []
+
+
+class CapabilityChange(CapabilityNode):
+    """Schema for a changed capability in a tree delta."""
+    application_id: int
+
+
+class TreeDelta(BaseModel):
+    """Changes to the tree after a catalog version (GET /api/tree?since=)."""
+    version: int  # catalog version to pass as since next time
+    applications: list[ApplicationNode]  # created or changed
+    capabilities: list[CapabilityChange]  # created or changed
+    deleted_applications: list[int]  # with their capabilities
+    deleted_capabilities: list[int]
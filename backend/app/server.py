@@ -0,0 +1,53 @@
+"""
+Run the app with uvicorn, using the server settings (HOST, PORT, WORKERS, SHUTDOWN_TIMEOUT).
+
+    python -m app.server
+
+With more than one worker, uvicorn starts that many processes sharing the
+port and restarts any that die. Migrations are run once here, before the
+workers start, instead of in each worker's lifespan. Prometheus metrics are
+collected across workers in PROMETHEUS_MULTIPROC_DIR (a fresh temporary
+directory unless set).
+"""
+import glob
+import os
+import tempfile
+import uvicorn
+from app.config import get_settings
+
+
+def prepare_multiprocess_metrics() -> None:
+    """Point the workers at an empty Prometheus multiprocess directory."""
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not path:
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+        return
+    # Samples left by a previous run would be added to this one's
+    os.makedirs(path, exist_ok=True)
+    for stale in glob.glob(os.path.join(path, "*.db")):
+        os.remove(stale)
+
+
+def main() -> None:
+    settings = get_settings()
+    if settings.workers > 1:
+        if settings.database_migrate_on_startup:
+            from app.database import run_migrations
+            run_migrations()
+            # Workers read their settings from the environment
+            os.environ["DATABASE_MIGRATE_ON_STARTUP"] = "false"
+        if settings.metrics_enabled:
+            prepare_multiprocess_metrics()
+
+    uvicorn.run(
+        "app.main:app",
+        host=settings.host,
+        port=settings.port,
+        workers=settings.workers,
+        # Backstop for requests still open when the server stops
+        timeout_graceful_shutdown=settings.shutdown_timeout,
+    )
+
+
+if __name__ == "__main__":
+    main()
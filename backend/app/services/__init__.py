@@ -1,4 +1,42 @@
+from app.services.catalog import CatalogCache, catalog_cache
+from app.services.catalog_sync import CatalogSync, catalog_sync
+from app.services.dedup import IncidentDeduplicator, incident_dedup
+from app.services.delivery import DeliveryWorkerPool, delivery_pool
+from app.services.events import EventBroadcaster, event_broadcaster
 from app.services.grafana import GrafanaIRMClient
 from app.services.incident import IncidentService
+from app.services.resilience import CircuitBreaker, IRMUnavailableError, TokenBucket
+from app.services.retention import (
+    CatalogTombstoneRetention,
+    IncidentLogRetention,
+    catalog_tombstone_retention,
+    incident_log_retention,
+)
+from app.services.search_index import SearchIndex, search_index
+from app.services.tag_index import TagIndex, tag_index
 
-__all__ = ["GrafanaIRMClient", "IncidentService"]
+__all__ = [
+    "CatalogCache",
+    "catalog_cache",
+    "CatalogSync",
+    "catalog_sync",
+    "IncidentDeduplicator",
+    "incident_dedup",
+    "DeliveryWorkerPool",
+    "delivery_pool",
+    "EventBroadcaster",
+    "event_broadcaster",
+    "GrafanaIRMClient",
+    "IncidentService",
+    "CircuitBreaker",
+    "IRMUnavailableError",
+    "TokenBucket",
+    "IncidentLogRetention",
+    "incident_log_retention",
+    "CatalogTombstoneRetention",
+    "catalog_tombstone_retention",
+    "SearchIndex",
+    "search_index",
+    "TagIndex",
+    "tag_index",
+]
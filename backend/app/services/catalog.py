@@ -0,0 +1,121 @@
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Optional
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+from app.repositories import catalog as catalog_repo
+from app.schemas.tree import TreeNode
+from app.services.catalog_model import CatalogModel, load_catalog
+
+_tree_adapter = TypeAdapter(list[TreeNode])
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """The catalog at a given version, and its serialized application/capability tree."""
+    version: int
+    catalog_version: int  # shared catalog version, for GET /api/tree?since=
+    catalog: CatalogModel
+    body: bytes
+    etag: str
+
+
+class CatalogCache:
+    """
+    Process-wide cache of the catalog tree.
+
+    The catalog is loaded into a compact read model, and the tree serialized
+    to JSON, once per catalog version. Catalog writes call bump() after
+    committing (through catalog_sync.commit()), which makes the next read
+    rebuild both.
+    """
+
+    def __init__(self):
+        self._version = 0
+        self._version_lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._snapshot: CatalogSnapshot | None = None
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def bump(self) -> int:
+        """Invalidate cached data after a catalog write."""
+        with self._version_lock:
+            self._version += 1
+            return self._version
+
+    def get_catalog(self, db: Session) -> CatalogModel:
+        """Return the current catalog read model."""
+        return self.get_tree(db).catalog
+
+    def get_tree(self, db: Session) -> CatalogSnapshot:
+        """Return the current snapshot, rebuilding it if the catalog changed."""
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self._version:
+            return snapshot
+
+        with self._build_lock:
+            # Another request may have rebuilt the snapshot while we waited
+            snapshot = self._snapshot
+            version = self._version
+            if snapshot is not None and snapshot.version == version:
+                return snapshot
+
+            # Read first: changes committed during the load are then in the next delta
+            catalog_version = catalog_repo.get_catalog_version(db)
+            catalog = load_catalog(db)
+            body = _tree_adapter.dump_json(build_tree(catalog))
+            snapshot = CatalogSnapshot(
+                version=version,
+                catalog_version=catalog_version,
+                catalog=catalog,
+                body=body,
+                etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            )
+            self._snapshot = snapshot
+            return snapshot
+
+
+def build_tree(catalog: CatalogModel) -> list[TreeNode]:
+    """Build the application/capability tree from the catalog read model."""
+    return _tree_adapter.validate_python(catalog.applications, from_attributes=True)
+
+
+def build_tree_delta(db: Session, since: int) -> Optional[dict]:
+    """
+    Changes to the tree after a catalog version, as a TreeDelta (1 query if there are none, else 4).
+
+    Changed applications come without their capabilities. Clients apply the
+    deletions first: a row deleted and then re-created can come back with
+    the same id.
+
+    Returns:
+        None if since is newer than the catalog, or older than the pruned
+        tombstones
+    """
+    oldest, version = catalog_repo.get_delta_range(db)
+    if not oldest <= since <= version:
+        return None
+    applications, capabilities, tombstones = catalog_repo.list_changes(db, since) if since < version else ([], [], [])
+    deleted: dict[str, list[int]] = {"application": [], "capability": []}
+    for kind, entity_id in tombstones:
+        deleted[kind].append(entity_id)
+    return {
+        "version": version,
+        "applications": [
+            {"id": row.id, "name": row.name, "description": row.description}
+            for row in applications
+        ],
+        "capabilities": [
+            {"id": row.id, "name": row.name, "description": row.description, "application_id": row.application_id}
+            for row in capabilities
+        ],
+        "deleted_applications": deleted["application"],
+        "deleted_capabilities": deleted["capability"],
+    }
+
+
+catalog_cache = CatalogCache()
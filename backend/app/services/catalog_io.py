@@ -0,0 +1,267 @@
+"""
+Bulk catalog import and export.
+
+The catalog is exchanged as flat CatalogRecord lines in NDJSON or CSV: one
+record per application, followed by one per capability of that application.
+CSV files have the columns application, capability, description and tags,
+with tags separated by semicolons.
+"""
+import csv
+import io
+from itertools import chain
+from typing import Iterable, Iterator, Literal
+from pydantic import ValidationError
+from sqlalchemy import Column, Table, delete, insert
+from sqlalchemy.orm import Session, selectinload
+from app.database import ReadSessionLocal
+from app.models import Application, Capability, Tag, application_tags, capability_tags, normalize_tag
+from app.repositories import catalog as catalog_repo
+from app.repositories.catalog import chunked
+from app.schemas.catalog import CatalogRecord, CatalogImportResponse
+
+CatalogFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+CSV_FIELDS = ["application", "capability", "description", "tags"]
+CSV_TAG_SEPARATOR = ";"
+
+# Applications loaded per batch while exporting
+EXPORT_BATCH_SIZE = 500
+# Approximate bytes per chunk of a streamed export
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+class CatalogImportError(ValueError):
+    """Raised when an import contains an invalid record."""
+
+
+def format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'record'}: {e['msg']}"
+        for e in error.errors()
+    )
+
+
+def parse_ndjson(text: str) -> Iterator[CatalogRecord]:
+    """Parse NDJSON records, skipping blank lines."""
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            yield CatalogRecord.model_validate_json(line)
+        except ValidationError as e:
+            raise CatalogImportError(f"Line {line_number}: {format_validation_error(e)}") from e
+
+
+def parse_csv(text: str) -> Iterator[CatalogRecord]:
+    """Parse CSV records. Empty capability and description cells mean none."""
+    reader = csv.DictReader(io.StringIO(text))
+    if "application" not in (reader.fieldnames or ()):
+        raise CatalogImportError("CSV header must include an application column")
+
+    for row in reader:
+        tags = (row.get("tags") or "").split(CSV_TAG_SEPARATOR)
+        try:
+            yield CatalogRecord(
+                application=row["application"] or "",
+                capability=row.get("capability") or None,
+                description=row.get("description") or None,
+                tags=[tag.strip() for tag in tags if tag.strip()],
+            )
+        except ValidationError as e:
+            raise CatalogImportError(f"Line {reader.line_num}: {format_validation_error(e)}") from e
+
+
+def parse_records(body: bytes, format: CatalogFormat) -> list[CatalogRecord]:
+    """Decode and validate an import body."""
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError as e:
+        raise CatalogImportError("Import must be UTF-8 encoded") from e
+
+    if format == "csv":
+        return list(parse_csv(text))
+    return list(parse_ndjson(text))
+
+
+def replace_tag_links(
+    db: Session,
+    table: Table,
+    owner_column: Column,
+    owner_tags: dict[int, list[str]],
+    tags: dict[str, Tag],
+) -> None:
+    """Replace the tags of many applications or capabilities at once."""
+    owner_ids = list(owner_tags)
+    for chunk in chunked(owner_ids):
+        db.execute(delete(table).where(owner_column.in_(chunk)))
+
+    rows = [
+        {owner_column.name: owner_id, "tag_id": tag_id}
+        for owner_id, values in owner_tags.items()
+        for tag_id in dict.fromkeys(tags[normalize_tag(value)].id for value in values)
+    ]
+    if rows:
+        db.execute(insert(table), rows)
+
+
+def import_catalog(db: Session, records: Iterable[CatalogRecord]) -> CatalogImportResponse:
+    """
+    Upsert applications, capabilities and tags in a single transaction.
+
+    Applications are matched by name, and capabilities by application and
+    name. Each record replaces the description and tags of the entry it
+    matches; entries missing from the import are left untouched. When a file
+    repeats an entry, the last record wins. Capabilities must belong to an
+    application that is in the import or already exists.
+
+    Args:
+        db: Database session
+        records: Records to import
+
+    Returns:
+        Counts of created and updated applications and capabilities
+    """
+    app_records: dict[str, CatalogRecord] = {}
+    cap_records: dict[tuple[str, str], CatalogRecord] = {}
+    for record in records:
+        if record.capability is None:
+            app_records[record.application] = record
+        else:
+            cap_records[(record.application, record.capability)] = record
+
+    result = CatalogImportResponse()
+    try:
+        # Every entry the import writes is stamped with the catalog version it creates
+        version = catalog_repo.increment_catalog_version(db)
+        tags = catalog_repo.resolve_tags(
+            db,
+            chain.from_iterable(r.tags for r in chain(app_records.values(), cap_records.values())),
+        )
+
+        # Applications
+        cap_app_names = {app_name for app_name, _ in cap_records}
+        apps: dict[str, Application] = {}
+        for chunk in chunked(list(app_records.keys() | cap_app_names)):
+            for app in db.query(Application).filter(Application.name.in_(chunk)):
+                apps[app.name] = app
+
+        unknown = sorted(cap_app_names - app_records.keys() - apps.keys())
+        if unknown:
+            raise CatalogImportError(f"Unknown application: {unknown[0]}")
+
+        for name, record in app_records.items():
+            app = apps.get(name)
+            if app is None:
+                apps[name] = Application(name=name, description=record.description, catalog_version=version)
+                db.add(apps[name])
+                result.applications_created += 1
+            else:
+                app.description = record.description
+                app.catalog_version = version
+                result.applications_updated += 1
+        db.flush()
+
+        # Capabilities
+        caps: dict[tuple[int, str], Capability] = {}
+        for chunk in chunked([apps[name].id for name in cap_app_names]):
+            for cap in db.query(Capability).filter(Capability.application_id.in_(chunk)):
+                caps[(cap.application_id, cap.name)] = cap
+
+        cap_tags: dict[Capability, list[str]] = {}
+        for (app_name, name), record in cap_records.items():
+            app_id = apps[app_name].id
+            cap = caps.get((app_id, name))
+            if cap is None:
+                cap = Capability(application_id=app_id, name=name, description=record.description, catalog_version=version)
+                db.add(cap)
+                result.capabilities_created += 1
+            else:
+                cap.description = record.description
+                cap.catalog_version = version
+                result.capabilities_updated += 1
+            cap_tags[cap] = record.tags
+        db.flush()
+
+        # Tags
+        replace_tag_links(
+            db, application_tags, application_tags.c.application_id,
+            {apps[name].id: record.tags for name, record in app_records.items()},
+            tags,
+        )
+        replace_tag_links(
+            db, capability_tags, capability_tags.c.capability_id,
+            {cap.id: values for cap, values in cap_tags.items()},
+            tags,
+        )
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return result
+
+
+def export_records(db: Session) -> Iterator[CatalogRecord]:
+    """Yield the whole catalog as records, loading applications in batches."""
+    apps = (
+        db.query(Application)
+        .options(
+            selectinload(Application.tags),
+            selectinload(Application.capabilities).selectinload(Capability.tags),
+        )
+        .order_by(Application.name)
+        .yield_per(EXPORT_BATCH_SIZE)
+    )
+    for app in apps:
+        yield CatalogRecord(
+            application=app.name,
+            description=app.description,
+            tags=[tag.value for tag in app.tags],
+        )
+        for cap in sorted(app.capabilities, key=lambda c: c.name):
+            yield CatalogRecord(
+                application=app.name,
+                capability=cap.name,
+                description=cap.description,
+                tags=[tag.value for tag in cap.tags],
+            )
+
+
+def export_catalog(format: CatalogFormat, session_factory=ReadSessionLocal) -> Iterator[str]:
+    """
+    Stream the catalog as NDJSON or CSV.
+
+    The export opens its own session so it can outlive the request handler,
+    and yields text in chunks of about 64 KiB.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if format == "csv":
+        writer.writerow(CSV_FIELDS)
+
+    with session_factory() as db:
+        for record in export_records(db):
+            if format == "csv":
+                writer.writerow([
+                    record.application,
+                    record.capability or "",
+                    record.description or "",
+                    CSV_TAG_SEPARATOR.join(record.tags),
+                ])
+            else:
+                buffer.write(record.model_dump_json())
+                buffer.write("\n")
+
+            if buffer.tell() >= EXPORT_CHUNK_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -0,0 +1,108 @@
+"""
+Compact in-memory read model of the catalog.
+
+Applications and capabilities are held as frozen __slots__ dataclasses
+instead of ORM instances or Pydantic models. Each one carries only its
+fields, with no per-object __dict__, identity map entry or instance state.
+Tag values are interned, and items with the same tags share one tuple, so a
+tag costs a single pointer however many items carry it. The model is loaded
+with one column query and never touches the ORM.
+"""
+import itertools
+import sys
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Optional
+from sqlalchemy import literal, select, union_all
+from sqlalchemy.orm import Session
+from app.models import Application, Capability, Tag, application_tags, capability_tags
+
+# Row kinds of the load query; applications sort first
+_APPLICATION_ROW = 0
+_CAPABILITY_ROW = 1
+
+
+@dataclass(frozen=True, slots=True)
+class CapabilityRecord:
+    id: int
+    application_id: int
+    name: str
+    description: Optional[str]
+    tags: tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class ApplicationRecord:
+    id: int
+    name: str
+    description: Optional[str]
+    tags: tuple[str, ...]
+    capabilities: tuple[CapabilityRecord, ...]  # by name
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogModel:
+    """The whole catalog: applications by name, each with its capabilities by name."""
+    applications: tuple[ApplicationRecord, ...]
+
+    @property
+    def capability_count(self) -> int:
+        return sum(len(app.capabilities) for app in self.applications)
+
+
+def load_catalog(db: Session) -> CatalogModel:
+    """Load the catalog with its tags (1 query). Tags are in tag id order."""
+    applications = (
+        select(
+            literal(_APPLICATION_ROW).label("kind"),
+            Application.id,
+            Application.id.label("application_id"),
+            Application.name,
+            Application.description,
+            Tag.id.label("tag_id"),
+            Tag.value.label("tag"),
+        )
+        .outerjoin(application_tags, application_tags.c.application_id == Application.id)
+        .outerjoin(Tag, Tag.id == application_tags.c.tag_id)
+    )
+    capabilities = (
+        select(
+            literal(_CAPABILITY_ROW).label("kind"),
+            Capability.id,
+            Capability.application_id,
+            Capability.name,
+            Capability.description,
+            Tag.id.label("tag_id"),
+            Tag.value.label("tag"),
+        )
+        .outerjoin(capability_tags, capability_tags.c.capability_id == Capability.id)
+        .outerjoin(Tag, Tag.id == capability_tags.c.tag_id)
+    )
+    query = union_all(applications, capabilities).subquery()
+    rows = db.execute(
+        select(query).order_by(query.c.kind, query.c.name, query.c.id, query.c.tag_id)
+    )
+
+    intern = sys.intern
+    tag_sets: dict[tuple[str, ...], tuple[str, ...]] = {}
+    app_rows: list[tuple[int, str, Optional[str], tuple[str, ...]]] = []
+    app_capabilities: dict[int, list[CapabilityRecord]] = {}
+
+    # One row per (item, tag), or a single row with no tag
+    for (kind, _), group in itertools.groupby(rows, key=attrgetter("kind", "id")):
+        group = list(group)
+        row = group[0]
+        tags = tuple(intern(r.tag) for r in group if r.tag is not None)
+        tags = tag_sets.setdefault(tags, tags)
+        if kind == _APPLICATION_ROW:
+            app_rows.append((row.id, row.name, row.description, tags))
+        else:
+            app_capabilities.setdefault(row.application_id, []).append(
+                CapabilityRecord(row.id, row.application_id, row.name, row.description, tags)
+            )
+
+    by_name = attrgetter("name")
+    return CatalogModel(tuple(
+        ApplicationRecord(app_id, name, description, tags, tuple(sorted(app_capabilities.get(app_id, ()), key=by_name)))
+        for app_id, name, description, tags in app_rows
+    ))
@@ -0,0 +1,105 @@
+import asyncio
+import logging
+import threading
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.config import get_settings
+from app.database import SessionLocal
+from app.repositories import catalog as catalog_repo
+from app.services.catalog import catalog_cache
+from app.services.events import publish_catalog_reset
+from app.services.search_index import search_index
+from app.services.tag_index import tag_index
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogSync:
+    """
+    Keeps this process's in-memory copies of the catalog in step with the database.
+
+    The catalog cache, tag index and search index live in each app process.
+    Every transaction that changes the catalog goes through commit(), which
+    increments the shared catalog_version row, and every process polls that
+    row each interval. When it changed for a reason other than this process's
+    own writes, which update the copies directly, the copies are reloaded.
+    A write through one worker is therefore seen by all of them within one
+    interval.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self.interval = get_settings().catalog_sync_interval
+        self.version: Optional[int] = None  # catalog version the copies reflect
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def commit(self, db: Session) -> int:
+        """
+        Commit a catalog change, counting it in the shared version, and invalidate the tree.
+
+        The changed applications and capabilities are stamped with the new
+        version, and deleted ones get a tombstone, for GET /api/tree?since=.
+
+        Returns:
+            The catalog version after the change
+        """
+        version = catalog_repo.increment_catalog_version(db)
+        catalog_repo.stamp_changes(db, version)
+        db.commit()
+        catalog_cache.bump()
+        with self._lock:
+            # The caller updates the indexes itself; only skip the reload if
+            # no other process's change came in between
+            if self.version is not None and version == self.version + 1:
+                self.version = version
+        return version
+
+    def load(self, db: Session) -> None:
+        """(Re)load every in-memory copy of the catalog."""
+        # Read before the data, so a change committed meanwhile is picked up next time
+        version = catalog_repo.get_catalog_version(db)
+        tag_index.load(db)
+        search_index.load(db)
+        catalog_cache.bump()
+        with self._lock:
+            self.version = version
+
+    def check(self) -> bool:
+        """Reload the copies if the catalog changed elsewhere. Returns whether it did."""
+        with self.session_factory() as db:
+            if catalog_repo.get_catalog_version(db) == self.version:
+                return False
+            self.load(db)
+        publish_catalog_reset(self.version)
+        return True
+
+    async def start(self) -> None:
+        """Start checking for changes every interval."""
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run(), name="catalog-sync")
+        logger.info("Catalog sync started (every %.1fs)", self.interval)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                if await asyncio.to_thread(self.check):
+                    logger.info("Catalog changed by another process, reloaded (version %s)", self.version)
+            except Exception:
+                logger.exception("Catalog sync check failed")
+
+
+catalog_sync = CatalogSync()
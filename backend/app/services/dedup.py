@@ -0,0 +1,105 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Iterable, Optional
+from app.config import get_settings
+from app.models import normalize_tag
+
+# (normalized title, severity, sorted tag keys)
+DedupKey = tuple[str, str, tuple[str, ...]]
+
+# Statuses of results that identify an incident worth returning again
+REUSABLE_STATUSES = ("ok", "queued")
+
+# Bound on remembered incidents, in case of a flood of distinct ones
+MAX_ENTRIES = 10_000
+
+
+def dedup_key(title: str, severity: str, tags: Iterable[str]) -> DedupKey:
+    """Key under which near-identical incidents collapse: case and spacing of the title are ignored."""
+    return " ".join(title.casefold().split()), severity, tuple(sorted({normalize_tag(tag) for tag in tags}))
+
+
+class IncidentDeduplicator:
+    """
+    Collapses repeated incident submissions into one IRM incident.
+
+    A successful result is remembered for the dedup window, and the same
+    incident is returned to anyone submitting an identical one in that time.
+    Identical submissions that arrive while the first is still being created
+    wait for it instead of calling IRM themselves. Only successes are shared:
+    if the first one fails, the waiters retry rather than report its failure
+    as theirs, and nothing is remembered. State is per process.
+    """
+
+    def __init__(self, window: Optional[float] = None):
+        self.window = get_settings().incident_dedup_window if window is None else window
+        self._results: OrderedDict[DedupKey, tuple[float, dict]] = OrderedDict()
+        self._inflight: dict[DedupKey, asyncio.Future] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0
+
+    async def run(self, key: DedupKey, create: Callable[[], Awaitable[dict]]) -> tuple[dict, bool]:
+        """
+        Create an incident unless an identical one is recent or in flight.
+
+        Returns:
+            (result, deduplicated) - deduplicated is True when the result
+            belongs to an earlier submission
+        """
+        while True:
+            result = self._cached(key)
+            if result is not None:
+                return result, True
+
+            future = self._inflight.get(key)
+            if future is None:
+                break
+            # None if the submission failed or was cancelled: retry, and one
+            # of the waiters becomes the next leader
+            result = await asyncio.shield(future)
+            if result is not None:
+                return result, True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        result = None
+        try:
+            result = await create()
+            return result, False
+        finally:
+            shared = result if result is not None and result.get("status") in REUSABLE_STATUSES else None
+            if shared is not None:
+                self._remember(key, shared)
+            del self._inflight[key]
+            future.set_result(shared)
+
+    def clear(self) -> None:
+        """Forget remembered incidents."""
+        self._results.clear()
+
+    def _cached(self, key: DedupKey) -> Optional[dict]:
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        expires, result = entry
+        if expires <= time.monotonic():
+            del self._results[key]
+            return None
+        return result
+
+    def _remember(self, key: DedupKey, result: dict) -> None:
+        now = time.monotonic()
+        # Entries share one window, so insertion order is expiry order
+        while self._results:
+            oldest, (expires, _) = next(iter(self._results.items()))
+            if expires > now and len(self._results) < MAX_ENTRIES:
+                break
+            del self._results[oldest]
+        self._results[key] = (now + self.window, result)
+        self._results.move_to_end(key)
+
+
+incident_dedup = IncidentDeduplicator()
@@ -0,0 +1,268 @@
+import asyncio
+import json
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import and_, or_, select, update
+from app.config import get_settings
+from app.database import AsyncSessionLocal, utcnow
+from app.metrics import INCIDENT_DELIVERIES
+from app.models import IncidentOutbox
+from app.repositories import incidents as incidents_repo
+from app.schemas.incident import DeliveryStatus
+from app.services.events import publish_incident_status
+from app.services.grafana import GrafanaIRMClient, get_grafana_client
+from app.services.resilience import IRMUnavailableError
+from app.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Shortest wait before retrying an incident held back by the rate limiter or circuit breaker
+MIN_HOLD_DELAY = 0.1
+
+
+class DeliveryWorkerPool:
+    """
+    Background workers that deliver queued incidents to Grafana IRM.
+
+    Incidents are written to the incident_outbox table before the request
+    returns, then picked up here. Failed deliveries are retried with
+    exponential backoff until the attempt limit is reached. Rows left pending
+    by a previous process are picked up again on start(). A claimed row is
+    only taken over once its claim has expired, so that several app processes
+    can share the outbox without delivering an incident twice, and an
+    incident in flight in a process that died is still delivered.
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal, grafana_client: Optional[GrafanaIRMClient] = None):
+        settings = get_settings()
+        self.session_factory = session_factory
+        self.grafana_client = grafana_client
+        self.workers = settings.incident_delivery_workers
+        self.max_attempts = settings.incident_delivery_max_attempts
+        self.backoff_base = settings.incident_delivery_backoff_base
+        self.backoff_max = settings.incident_delivery_backoff_max
+        # Longest a delivery can take (rate limit wait and IRM call), with a margin
+        self.claim_timeout = 2 * (settings.grafana_irm_rate_limit_wait + settings.grafana_irm_timeout)
+        self._queue: Optional[asyncio.Queue[int]] = None
+        self._tasks: list[asyncio.Task] = []
+        self._timers: set[asyncio.TimerHandle] = set()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        """Start the workers and re-queue undelivered incidents."""
+        if self.running:
+            return
+        if self.grafana_client is None:
+            self.grafana_client = get_grafana_client()
+        self._queue = asyncio.Queue()
+
+        for outbox_id, next_attempt_at in await self._recover():
+            delay = (next_attempt_at - utcnow()).total_seconds()
+            self._schedule(outbox_id, min(delay, self.backoff_max))
+
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"incident-delivery-{i}")
+            for i in range(self.workers)
+        ]
+        logger.info("Started %d incident delivery workers", self.workers)
+
+    async def stop(self) -> None:
+        """Stop the workers. Undelivered incidents stay in the outbox."""
+        for timer in self._timers:
+            timer.cancel()
+        self._timers.clear()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def submit(self, outbox_id: int) -> None:
+        """Queue an outbox row for immediate delivery."""
+        self._queue.put_nowait(outbox_id)
+
+    def backoff(self, attempts: int) -> float:
+        """Delay before the next attempt, with jitter."""
+        delay = min(self.backoff_base * 2 ** (attempts - 1), self.backoff_max)
+        return delay * random.uniform(0.5, 1.0)
+
+    def _schedule(self, outbox_id: int, delay: float) -> None:
+        if delay <= 0:
+            self.submit(outbox_id)
+            return
+        loop = asyncio.get_running_loop()
+        timer: asyncio.TimerHandle
+
+        def fire():
+            self._timers.discard(timer)
+            if self._queue is not None:
+                self.submit(outbox_id)
+
+        timer = loop.call_later(delay, fire)
+        self._timers.add(timer)
+
+    async def _worker(self) -> None:
+        while True:
+            outbox_id = await self._queue.get()
+            try:
+                with span("incident.deliver", outbox_id=outbox_id):
+                    await self._deliver(outbox_id)
+            except Exception:
+                logger.exception("Unexpected error delivering queued incident %s", outbox_id)
+            finally:
+                self._queue.task_done()
+
+    async def _deliver(self, outbox_id: int) -> None:
+        hold = self.grafana_client.breaker.retry_after()
+        if hold:
+            self._schedule(outbox_id, hold)
+            return
+
+        row = await self._claim(outbox_id)
+        if row is None:
+            return  # already delivered, failed, or claimed by another worker
+        publish_incident_status(outbox_id, DeliveryStatus.DELIVERING.value, row["attempts"])
+
+        try:
+            result = await self.grafana_client.create_incident(
+                title=row["title"],
+                severity=row["severity_grafana"],
+                tags=row["tags"],
+            )
+        except IRMUnavailableError as e:
+            # IRM was not called, so this doesn't use up an attempt
+            delay = max(e.retry_after, MIN_HOLD_DELAY)
+            await self._release(outbox_id, delay)
+            publish_incident_status(outbox_id, DeliveryStatus.PENDING.value, row["attempts"] - 1)
+            logger.info("Holding incident %s for %.1fs: %s", outbox_id, delay, e)
+            self._schedule(outbox_id, delay)
+            return
+        except Exception as e:
+            delay = await self._record_failure(outbox_id, row["attempts"], str(e))
+            INCIDENT_DELIVERIES.labels("retry" if delay is not None else "failed").inc()
+            publish_incident_status(
+                outbox_id,
+                (DeliveryStatus.PENDING if delay is not None else DeliveryStatus.FAILED).value,
+                row["attempts"],
+                last_error=str(e),
+            )
+            if delay is not None:
+                logger.warning(
+                    "Delivery of incident %s failed (attempt %d), retrying in %.1fs: %s",
+                    outbox_id, row["attempts"], delay, e,
+                )
+                self._schedule(outbox_id, delay)
+            else:
+                logger.error("Giving up on incident %s after %d attempts: %s", outbox_id, row["attempts"], e)
+            return
+
+        await self._record_success(outbox_id, row, result)
+        INCIDENT_DELIVERIES.labels("delivered").inc()
+        publish_incident_status(
+            outbox_id, DeliveryStatus.DELIVERED.value, row["attempts"],
+            grafana_incident_id=result["incident_id"], grafana_incident_url=result["incident_url"],
+        )
+        logger.info("Delivered queued incident %s as %s", outbox_id, result["incident_id"])
+
+    async def _recover(self) -> list[tuple[int, datetime]]:
+        """List undelivered rows with when to try them: claimed ones once their claim expires."""
+        async with self.session_factory() as db:
+            rows = await db.execute(
+                select(IncidentOutbox.id, IncidentOutbox.status, IncidentOutbox.next_attempt_at, IncidentOutbox.updated_at)
+                .where(IncidentOutbox.status.in_([DeliveryStatus.PENDING.value, DeliveryStatus.DELIVERING.value]))
+                .order_by(IncidentOutbox.next_attempt_at)
+            )
+            claim_timeout = timedelta(seconds=self.claim_timeout)
+            return [
+                (row.id, row.next_attempt_at if row.status == DeliveryStatus.PENDING.value else row.updated_at + claim_timeout)
+                for row in rows
+            ]
+
+    async def _claim(self, outbox_id: int) -> Optional[dict]:
+        """Atomically mark a pending row (or one with an expired claim) as delivering and return its payload."""
+        now = utcnow()
+        async with self.session_factory() as db:
+            claimed = (await db.execute(
+                update(IncidentOutbox)
+                .where(
+                    IncidentOutbox.id == outbox_id,
+                    or_(
+                        IncidentOutbox.status == DeliveryStatus.PENDING.value,
+                        and_(
+                            IncidentOutbox.status == DeliveryStatus.DELIVERING.value,
+                            IncidentOutbox.updated_at < now - timedelta(seconds=self.claim_timeout),
+                        ),
+                    ),
+                )
+                .values(
+                    status=DeliveryStatus.DELIVERING.value,
+                    attempts=IncidentOutbox.attempts + 1,
+                    updated_at=now,  # when the claim was made
+                )
+            )).rowcount
+            await db.commit()
+            if not claimed:
+                return None
+
+            row = await db.get(IncidentOutbox, outbox_id)
+            return {
+                "title": row.title,
+                "severity_internal": row.severity_internal,
+                "severity_grafana": row.severity_grafana,
+                "tags": json.loads(row.tags) if row.tags else [],
+                "attempts": row.attempts,
+            }
+
+    async def _release(self, outbox_id: int, delay: float) -> None:
+        """Return a claimed row to pending without counting the attempt."""
+        async with self.session_factory() as db:
+            await db.execute(
+                update(IncidentOutbox)
+                .where(IncidentOutbox.id == outbox_id)
+                .values(
+                    status=DeliveryStatus.PENDING.value,
+                    attempts=IncidentOutbox.attempts - 1,
+                    next_attempt_at=utcnow() + timedelta(seconds=delay),
+                )
+            )
+            await db.commit()
+
+    async def _record_failure(self, outbox_id: int, attempts: int, error: str) -> Optional[float]:
+        """Record a failed attempt. Returns the retry delay, or None if giving up."""
+        delay = self.backoff(attempts) if attempts < self.max_attempts else None
+        async with self.session_factory() as db:
+            row = await db.get(IncidentOutbox, outbox_id)
+            row.last_error = error
+            if delay is None:
+                row.status = DeliveryStatus.FAILED.value
+            else:
+                row.status = DeliveryStatus.PENDING.value
+                row.next_attempt_at = utcnow() + timedelta(seconds=delay)
+            await db.commit()
+        return delay
+
+    async def _record_success(self, outbox_id: int, row: dict, result: dict) -> None:
+        """Mark a row delivered and write the incident log entry in one transaction."""
+        async with self.session_factory() as db:
+            outbox = await db.get(IncidentOutbox, outbox_id)
+            outbox.status = DeliveryStatus.DELIVERED.value
+            outbox.grafana_incident_id = result["incident_id"]
+            outbox.grafana_incident_url = result["incident_url"]
+            outbox.last_error = None
+            await db.run_sync(
+                incidents_repo.add_incident_log,
+                title=row["title"],
+                severity_internal=row["severity_internal"],
+                severity_grafana=row["severity_grafana"],
+                tags=row["tags"],
+                grafana_incident_id=result["incident_id"],
+            )
+            await db.commit()
+
+
+delivery_pool = DeliveryWorkerPool()
@@ -0,0 +1,166 @@
+"""
+Server-sent events: catalog changes and incident delivery status.
+
+Publishers (the admin routes, incident service and delivery workers) hand
+an event to the broadcaster from any thread. It is encoded once, then copied
+onto the bounded queue of every connected client on the event loop. A client
+whose queue is full has fallen too far behind to be sent a consistent stream,
+so its backlog is replaced with a single "resync" event telling it to
+refetch what it shows.
+
+Events (the data is JSON):
+
+    catalog    {"op": "upsert" | "delete", "kind": "application" | "capability", "id", ...}
+               upserts carry the node's tree fields (name, description, and
+               application_id for capabilities); deleting an application
+               deletes its capabilities. {"op": "reset"} after a bulk import
+               or a change made by another process means the tree must be
+               refetched. "version" is the catalog version after the change.
+    incident   {"id", "status", "attempts", "grafana_incident_id", "grafana_incident_url", "last_error"}
+               for each status change of a queued incident
+    resync     {} the client missed events and should refetch
+
+A stream never ends by itself, and uvicorn waits for open responses before
+running the lifespan shutdown. It only waits timeout_graceful_shutdown
+seconds (SHUTDOWN_TIMEOUT in app.server) before cancelling them, so streams
+hold up shutdown for at most that long; stop() then ends any that remain.
+"""
+import asyncio
+import itertools
+import json
+from typing import AsyncIterator, Optional
+from app.config import get_settings
+from app.metrics import EVENT_STREAM_RESYNCS
+
+APPLICATION = "application"
+CAPABILITY = "capability"
+
+# Reconnection delay suggested to EventSource clients, in milliseconds
+RETRY_MS = 3000
+
+_CLOSE = b""  # queued to end a stream
+
+
+def encode_event(event_id: int, event: str, data: dict) -> bytes:
+    """One event in the text/event-stream format."""
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+
+
+class EventBroadcaster:
+    """
+    Fans out events to every connected /api/events client.
+
+    Each client has its own queue of at most queue_size encoded events, so a
+    slow client never holds up publishers or other clients.
+    """
+
+    def __init__(self, queue_size: Optional[int] = None, max_clients: Optional[int] = None):
+        settings = get_settings()
+        self.queue_size = settings.events_queue_size if queue_size is None else queue_size
+        self.max_clients = settings.events_max_clients if max_clients is None else max_clients
+        self.heartbeat_interval = settings.events_heartbeat_interval
+        self._clients: set[asyncio.Queue[bytes]] = set()
+        self._ids = itertools.count(1)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def clients(self) -> int:
+        return len(self._clients)
+
+    @property
+    def full(self) -> bool:
+        return len(self._clients) >= self.max_clients
+
+    def start(self) -> None:
+        """Accept events, delivering them on the running event loop."""
+        self._loop = asyncio.get_running_loop()
+
+    def stop(self) -> None:
+        """Stop accepting events and end every open stream."""
+        self._loop = None
+        for queue in self._clients:
+            self._replace_backlog(queue, _CLOSE)
+
+    def publish(self, event: str, data: dict) -> None:
+        """Send an event to every client. Safe to call from any thread."""
+        loop = self._loop
+        if loop is None or not self._clients:
+            return
+        frame = encode_event(next(self._ids), event, data)
+        try:
+            loop.call_soon_threadsafe(self._fan_out, frame)
+        except RuntimeError:
+            pass  # the loop has closed
+
+    def _fan_out(self, frame: bytes) -> None:
+        for queue in self._clients:
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                self._replace_backlog(queue, encode_event(next(self._ids), "resync", {}))
+                EVENT_STREAM_RESYNCS.inc()
+
+    @staticmethod
+    def _replace_backlog(queue: asyncio.Queue[bytes], frame: bytes) -> None:
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(frame)
+
+    async def stream(self, resync: bool = False) -> AsyncIterator[bytes]:
+        """
+        Events for one client, with a keep-alive comment when idle.
+
+        Args:
+            resync: Start with a resync event (a reconnecting client that
+                may have missed events)
+        """
+        queue: asyncio.Queue[bytes] = asyncio.Queue(self.queue_size)
+        self._clients.add(queue)
+        try:
+            yield f"retry: {RETRY_MS}\n\n".encode()
+            if resync:
+                yield encode_event(next(self._ids), "resync", {})
+            while True:
+                try:
+                    async with asyncio.timeout(self.heartbeat_interval):
+                        frame = await queue.get()
+                except TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                if frame is _CLOSE:
+                    return
+                yield frame
+        finally:
+            self._clients.discard(queue)
+
+
+event_broadcaster = EventBroadcaster()
+
+
+def publish_catalog_change(op: str, kind: str, id: int, version: Optional[int], **fields) -> None:
+    """Publish a change to one application or capability."""
+    event_broadcaster.publish("catalog", {"op": op, "kind": kind, "id": id, "version": version, **fields})
+
+
+def publish_catalog_reset(version: Optional[int]) -> None:
+    """Tell clients to refetch the tree, after a change too large or remote to describe."""
+    event_broadcaster.publish("catalog", {"op": "reset", "version": version})
+
+
+def publish_incident_status(
+    incident_id: int,
+    status: str,
+    attempts: int,
+    grafana_incident_id: Optional[str] = None,
+    grafana_incident_url: Optional[str] = None,
+    last_error: Optional[str] = None,
+) -> None:
+    """Publish a status change of a queued incident."""
+    event_broadcaster.publish("incident", {
+        "id": incident_id,
+        "status": status,
+        "attempts": attempts,
+        "grafana_incident_id": grafana_incident_id,
+        "grafana_incident_url": grafana_incident_url,
+        "last_error": last_error,
+    })
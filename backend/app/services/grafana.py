@@ -1,18 +1,92 @@
 import httpx
 import logging
+import time
+from functools import lru_cache
 from typing import Optional
 from app.config import get_settings
+from app.metrics import IRM_REQUEST_DURATION
+from app.services.resilience import CircuitBreaker, TokenBucket
+from app.tracing import span
 
 logger = logging.getLogger(__name__)
 
+# Application-scoped HTTP client, opened and closed by the app lifespan
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create a pooled HTTP client configured for Grafana IRM."""
+    settings = get_settings()
+    limits = httpx.Limits(
+        max_connections=settings.grafana_irm_max_connections,
+        max_keepalive_connections=settings.grafana_irm_max_keepalive_connections,
+        keepalive_expiry=settings.grafana_irm_keepalive_expiry,
+    )
+    timeout = httpx.Timeout(
+        settings.grafana_irm_timeout,
+        connect=settings.grafana_irm_connect_timeout,
+    )
+    http2 = settings.grafana_irm_http2
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("HTTP/2 requested for Grafana IRM but 'h2' is not installed, using HTTP/1.1")
+            http2 = False
+    return httpx.AsyncClient(limits=limits, timeout=timeout, http2=http2)
+
+
+async def open_http_client() -> httpx.AsyncClient:
+    """Open the shared HTTP client. Called on application startup."""
+    global _http_client
+    if _http_client is None:
+        _http_client = create_http_client()
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client. Called on application shutdown."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+class GrafanaIRMError(Exception):
+    """
+    A failed call to Grafana IRM.
+
+    Transient errors (timeouts, network errors, 429 and 5xx responses) count
+    towards opening the circuit breaker; others mean IRM is up but rejected
+    the request.
+    """
+
+    def __init__(self, message: str, transient: bool = True):
+        super().__init__(message)
+        self.transient = transient
+
 
 class GrafanaIRMClient:
-    """Client for interacting with Grafana IRM API."""
+    """
+    Client for interacting with Grafana IRM API.
+
+    Calls go through a token bucket rate limiter and a circuit breaker, so
+    that a degraded IRM gets a bounded request rate and callers fail fast
+    while it is down. Both raise IRMUnavailableError without calling IRM.
+    """
 
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
         settings = get_settings()
         self.base_url = settings.grafana_irm_base_url.rstrip("/")
         self.api_token = settings.grafana_irm_api_token
+        self._http_client = http_client
+        self.rate_limit_wait = settings.grafana_irm_rate_limit_wait
+        self.rate_limiter = TokenBucket(settings.grafana_irm_rate_limit, settings.grafana_irm_rate_limit_burst)
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.grafana_irm_breaker_failure_threshold,
+            recovery_timeout=settings.grafana_irm_breaker_recovery_timeout,
+            half_open_max_calls=settings.grafana_irm_breaker_half_open_max_calls,
+        )
 
     def _get_headers(self) -> dict:
         """Get headers for API requests."""
@@ -39,6 +113,8 @@ class GrafanaIRMClient:
             Dict with incident_id and incident_url on success
 
         Raises:
+            IRMUnavailableError: if the circuit is open or the rate limit was
+                not met in time (IRM was not called)
             Exception on failure
         """
         if not self.api_token:
@@ -62,38 +138,76 @@ class GrafanaIRMClient:
 
         url = f"{self.base_url}/api/plugins/grafana-irm-app/resources/api/v1/IncidentsService.CreateIncident"
 
-        logger.info(f"Creating incident in Grafana IRM: {title}")
-        logger.debug(f"Payload: {payload}")
-
+        logger.info("Creating incident in Grafana IRM: %s", title)
+        logger.debug("Payload: %s", payload)
+
+        with span("grafana_irm.create_incident", severity=severity, tag_count=len(tags)):
+            self.breaker.before_call()
+            try:
+                with span("grafana_irm.rate_limit"):
+                    await self.rate_limiter.acquire(self.rate_limit_wait)
+                result = await self._send(url, payload)
+            except GrafanaIRMError as e:
+                if e.transient:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                raise
+            except BaseException:
+                self.breaker.release()
+                raise
+            self.breaker.record_success()
+            return result
+
+    async def _send(self, url: str, payload: dict) -> dict:
+        client = self._http_client or _http_client
+        if client is None:
+            # No shared client (e.g. outside the app lifespan): use a one-off client
+            async with create_http_client() as client:
+                return await self._post_incident(client, url, payload)
+        return await self._post_incident(client, url, payload)
+
+    async def _post_incident(self, client: httpx.AsyncClient, url: str, payload: dict) -> dict:
+        """Send the create request and parse the incident from the response."""
+        start = time.perf_counter()
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    url,
-                    json=payload,
-                    headers=self._get_headers(),
-                    timeout=30.0,
-                )
-
-                if response.status_code >= 400:
-                    logger.error(f"Grafana IRM API error: {response.status_code} - {response.text}")
-                    raise Exception(f"Grafana IRM API error: {response.status_code}")
-
-                data = response.json()
-                incident = data.get("incident", {})
-                incident_id = incident.get("incidentID", "unknown")
-                overview_url = incident.get("overviewURL", "")
-                incident_url = f"{self.base_url}{overview_url}" if overview_url else f"{self.base_url}/a/grafana-irm-app/incidents/{incident_id}"
-
-                logger.info(f"Incident created successfully: {incident_id}")
-
-                return {
-                    "incident_id": str(incident_id),
-                    "incident_url": incident_url,
-                }
-
+            response = await client.post(
+                url,
+                json=payload,
+                headers=self._get_headers(),
+            )
         except httpx.TimeoutException:
+            IRM_REQUEST_DURATION.labels("timeout").observe(time.perf_counter() - start)
             logger.error("Timeout while creating incident in Grafana IRM")
-            raise Exception("Request to Grafana IRM timed out")
+            raise GrafanaIRMError("Request to Grafana IRM timed out")
         except httpx.RequestError as e:
-            logger.error(f"Network error while creating incident: {e}")
-            raise Exception(f"Failed to connect to Grafana IRM: {e}")
+            IRM_REQUEST_DURATION.labels("network_error").observe(time.perf_counter() - start)
+            logger.error("Network error while creating incident: %s", e)
+            raise GrafanaIRMError(f"Failed to connect to Grafana IRM: {e}")
+        IRM_REQUEST_DURATION.labels(str(response.status_code)).observe(time.perf_counter() - start)
+
+        if response.status_code >= 400:
+            logger.error("Grafana IRM API error: %s - %s", response.status_code, response.text)
+            raise GrafanaIRMError(
+                f"Grafana IRM API error: {response.status_code}",
+                transient=response.status_code == 429 or response.status_code >= 500,
+            )
+
+        data = response.json()
+        incident = data.get("incident", {})
+        incident_id = incident.get("incidentID", "unknown")
+        overview_url = incident.get("overviewURL", "")
+        incident_url = f"{self.base_url}{overview_url}" if overview_url else f"{self.base_url}/a/grafana-irm-app/incidents/{incident_id}"
+
+        logger.info("Incident created successfully: %s", incident_id)
+
+        return {
+            "incident_id": str(incident_id),
+            "incident_url": incident_url,
+        }
+
+
+@lru_cache
+def get_grafana_client() -> GrafanaIRMClient:
+    """Get the application-wide Grafana IRM client."""
+    return GrafanaIRMClient()
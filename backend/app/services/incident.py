@@ -1,9 +1,20 @@
 import json
 import logging
-from sqlalchemy.orm import Session
-from app.models import Application, Capability, IncidentLog
-from app.schemas.incident import Severity
-from app.services.grafana import GrafanaIRMClient
+import math
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import get_settings
+from app.metrics import INCIDENTS
+from app.models import IncidentOutbox
+from app.repositories import incidents as incidents_repo
+from app.schemas.incident import Severity, DeliveryStatus
+from app.services.dedup import dedup_key, incident_dedup
+from app.services.delivery import delivery_pool
+from app.services.events import publish_incident_status
+from app.services.grafana import GrafanaIRMClient, get_grafana_client
+from app.services.resilience import IRMUnavailableError
+from app.services.tag_index import tag_index
+from app.tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -20,15 +31,15 @@ SEVERITY_MAPPING = {
 class IncidentService:
     """Service for incident creation and management."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession, grafana_client: Optional[GrafanaIRMClient] = None):
         self.db = db
-        self.grafana_client = GrafanaIRMClient()
+        self.grafana_client = grafana_client or get_grafana_client()
 
     def map_severity(self, severity: Severity) -> str:
         """Map internal severity to Grafana severity."""
         return SEVERITY_MAPPING[severity]
 
-    def aggregate_tags(
+    async def aggregate_tags(
         self,
         application_ids: list[int],
         capability_ids: list[int],
@@ -37,28 +48,12 @@ class IncidentService:
         Aggregate and deduplicate tags from selected applications and capabilities.
 
         Tags are deduplicated case-insensitively, preserving the first occurrence's case.
+        Tags are resolved from the in-memory tag index, which is loaded on first use.
         """
-        tags_seen: dict[str, str] = {}  # lowercase -> original case
-
-        # Get tags from applications
-        if application_ids:
-            apps = self.db.query(Application).filter(Application.id.in_(application_ids)).all()
-            for app in apps:
-                for tag in app.tags:
-                    lower_value = tag.value.lower()
-                    if lower_value not in tags_seen:
-                        tags_seen[lower_value] = tag.value
-
-        # Get tags from capabilities
-        if capability_ids:
-            caps = self.db.query(Capability).filter(Capability.id.in_(capability_ids)).all()
-            for cap in caps:
-                for tag in cap.tags:
-                    lower_value = tag.value.lower()
-                    if lower_value not in tags_seen:
-                        tags_seen[lower_value] = tag.value
-
-        return list(tags_seen.values())
+        if not tag_index.loaded:
+            await self.db.run_sync(tag_index.load)
+
+        return tag_index.resolve(application_ids, capability_ids)
 
     async def create_incident(
         self,
@@ -77,15 +72,46 @@ class IncidentService:
             capability_ids: List of selected capability IDs
 
         Returns:
-            Dict with status, incident_id, and incident_url
+            Dict with status, incident_id, and incident_url. When the delivery
+            queue is enabled, returns status "queued" with the outbox id.
+            An incident identical to one submitted within the dedup window
+            gets that submission's result, with deduplicated set.
         """
         # Map severity
         grafana_severity = self.map_severity(severity)
 
         # Aggregate tags
-        tags = self.aggregate_tags(application_ids, capability_ids)
-
-        logger.info(f"Creating incident: {title}, severity: {severity.value} -> {grafana_severity}, tags: {tags}")
+        with span("incident.aggregate_tags"):
+            tags = await self.aggregate_tags(application_ids, capability_ids)
+
+        logger.info("Creating incident: %s, severity: %s -> %s, tags: %s", title, severity.value, grafana_severity, tags)
+
+        if not incident_dedup.enabled:
+            result = await self.submit_incident(title, severity, grafana_severity, tags)
+            INCIDENTS.labels(severity.value, result["status"]).inc()
+            return result
+
+        result, deduplicated = await incident_dedup.run(
+            dedup_key(title, severity.value, tags),
+            lambda: self.submit_incident(title, severity, grafana_severity, tags),
+        )
+        if deduplicated:
+            logger.info("Deduplicated incident: %s, returning the earlier submission", title)
+            INCIDENTS.labels(severity.value, "deduplicated").inc()
+            return {**result, "deduplicated": True}
+        INCIDENTS.labels(severity.value, result["status"]).inc()
+        return result
+
+    async def submit_incident(
+        self,
+        title: str,
+        severity: Severity,
+        grafana_severity: str,
+        tags: list[str],
+    ) -> dict:
+        """Create the incident in Grafana IRM, or queue it for delivery."""
+        if get_settings().incident_queue_enabled and delivery_pool.running:
+            return await self.enqueue_incident(title, severity, grafana_severity, tags)
 
         try:
             # Call Grafana IRM API
@@ -96,15 +122,16 @@ class IncidentService:
             )
 
             # Log the incident
-            incident_log = IncidentLog(
-                grafana_incident_id=result["incident_id"],
-                title=title,
-                severity_internal=severity.value,
-                severity_grafana=grafana_severity,
-                tags=json.dumps(tags),
-            )
-            self.db.add(incident_log)
-            self.db.commit()
+            with span("incident.log"):
+                await self.db.run_sync(
+                    incidents_repo.add_incident_log,
+                    title=title,
+                    severity_internal=severity.value,
+                    severity_grafana=grafana_severity,
+                    tags=tags,
+                    grafana_incident_id=result["incident_id"],
+                )
+                await self.db.commit()
 
             return {
                 "status": "ok",
@@ -112,9 +139,48 @@ class IncidentService:
                 "grafana_incident_url": result["incident_url"],
             }
 
+        except IRMUnavailableError as e:
+            logger.warning("Not creating incident: %s", e)
+            return {
+                "status": "error",
+                "message": f"{e}, retry in {math.ceil(e.retry_after)}s",
+            }
+
         except Exception as e:
-            logger.error(f"Failed to create incident: {e}")
+            logger.error("Failed to create incident: %s", e)
             return {
                 "status": "error",
                 "message": str(e),
             }
+
+    async def enqueue_incident(
+        self,
+        title: str,
+        severity: Severity,
+        grafana_severity: str,
+        tags: list[str],
+    ) -> dict:
+        """Write the incident to the outbox and hand it to the delivery workers."""
+        outbox = IncidentOutbox(
+            title=title,
+            severity_internal=severity.value,
+            severity_grafana=grafana_severity,
+            tags=json.dumps(tags),
+            status=DeliveryStatus.PENDING.value,
+        )
+        with span("incident.enqueue"):
+            self.db.add(outbox)
+            await self.db.commit()
+
+        delivery_pool.submit(outbox.id)
+        publish_incident_status(outbox.id, DeliveryStatus.PENDING.value, 0)
+        logger.info("Queued incident %s for delivery", outbox.id)
+
+        return {
+            "status": "queued",
+            "incident_id": outbox.id,
+        }
+
+    async def get_queued_incident(self, outbox_id: int) -> Optional[IncidentOutbox]:
+        """Get a queued incident and its delivery status."""
+        return await self.db.get(IncidentOutbox, outbox_id)
@@ -0,0 +1,140 @@
+"""
+Streaming export of the incident log.
+
+Incidents are read in batches through a server-side cursor and written out
+as they arrive, so an export of any size runs in constant memory. NDJSON and
+CSV are always available. Parquet needs pyarrow (the "parquet" extra) and is
+written as one row group per batch.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterator, Literal, Optional, Sequence
+from app.database import ReadSessionLocal
+from app.repositories import incidents as incidents_repo
+
+IncidentExportFormat = Literal["ndjson", "csv", "parquet"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+CSV_FIELDS = ["id", "grafana_incident_id", "title", "severity", "severity_grafana", "tags", "created_at"]
+CSV_TAG_SEPARATOR = ";"
+
+# Incidents read per batch (and per Parquet row group)
+EXPORT_BATCH_SIZE = 2000
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def export_incidents(
+    format: IncidentExportFormat,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    severities: Sequence[str] = (),
+    tags: Sequence[str] = (),
+    session_factory=ReadSessionLocal,
+) -> Iterator[bytes]:
+    """
+    Stream the incident log, oldest first, one chunk per batch.
+
+    The export opens its own session so it can outlive the request handler.
+    """
+    writers = {"ndjson": write_ndjson, "csv": write_csv, "parquet": write_parquet}
+    with session_factory() as db:
+        batches = incidents_repo.stream_incidents(
+            db, EXPORT_BATCH_SIZE, since=since, until=until, severities=severities, tags=tags,
+        )
+        yield from writers[format](batches)
+
+
+def write_ndjson(batches: Iterator[list[dict]]) -> Iterator[bytes]:
+    for batch in batches:
+        yield "".join(
+            json.dumps({**record, "created_at": record["created_at"].isoformat()}) + "\n"
+            for record in batch
+        ).encode()
+
+
+def write_csv(batches: Iterator[list[dict]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(CSV_FIELDS)
+    for batch in batches:
+        writer.writerows(
+            [
+                record["id"],
+                record["grafana_incident_id"] or "",
+                record["title"],
+                record["severity"],
+                record["severity_grafana"],
+                CSV_TAG_SEPARATOR.join(record["tags"]),
+                record["created_at"].isoformat(),
+            ]
+            for record in batch
+        )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class ChunkSink(io.RawIOBase):
+    """
+    Write-only file that hands its contents out in chunks.
+
+    Parquet footers record absolute offsets, so tell() keeps counting across
+    drains.
+    """
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def write_parquet(batches: Iterator[list[dict]]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id", pa.int64()),
+        ("grafana_incident_id", pa.string()),
+        ("title", pa.string()),
+        ("severity", pa.string()),
+        ("severity_grafana", pa.string()),
+        ("tags", pa.list_(pa.string())),
+        ("created_at", pa.timestamp("us")),
+    ])
+    sink = ChunkSink()
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for batch in batches:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
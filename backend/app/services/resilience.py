@@ -0,0 +1,182 @@
+"""
+Client-side protection for calls to Grafana IRM.
+
+A token bucket caps the request rate we send, and a circuit breaker stops
+calling IRM after repeated failures so that requests fail in milliseconds
+instead of each waiting for a timeout. Both are used from the event loop
+only, so they need no locking. Their read-only properties (tokens, state,
+snapshot) change nothing, so they are also safe to read from other threads.
+"""
+import asyncio
+import time
+from enum import Enum
+
+
+class IRMUnavailableError(Exception):
+    """Raised instead of calling IRM when the call is not allowed right now."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(IRMUnavailableError):
+    """The circuit breaker is open (or half-open with its trial calls in progress)."""
+
+
+class RateLimitedError(IRMUnavailableError):
+    """No rate limit token became available in time."""
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+
+    Holds up to `burst` tokens and refills at `rate` tokens per second. A
+    rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    @property
+    def tokens(self) -> float:
+        """Tokens available now (without taking or refilling any)."""
+        return self._available(time.monotonic())
+
+    def _available(self, now: float) -> float:
+        return min(self.burst, self._tokens + (now - self._updated) * self.rate)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = self._available(now)
+        self._updated = now
+
+    def try_acquire(self) -> float:
+        """
+        Take a token if one is available.
+
+        Returns:
+            0 if a token was taken, otherwise the seconds until one will be
+        """
+        if not self.enabled:
+            return 0.0
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    async def acquire(self, timeout: float) -> None:
+        """
+        Take a token, waiting up to `timeout` seconds for one.
+
+        Raises:
+            RateLimitedError: if no token is available in time
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            if time.monotonic() + wait > deadline:
+                raise RateLimitedError("Grafana IRM rate limit reached", retry_after=wait)
+            await asyncio.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker with closed, open and half-open states.
+
+    Closed: calls go through, and `failure_threshold` consecutive failures
+    open the circuit. Open: calls are rejected until `recovery_timeout`
+    seconds have passed. Half-open: up to `half_open_max_calls` trial calls
+    go through; a success closes the circuit and a failure opens it again.
+    A threshold of 0 disables the breaker.
+    """
+
+    def __init__(self, failure_threshold: int, recovery_timeout: float, half_open_max_calls: int = 1):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = max(half_open_max_calls, 1)
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_calls = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.failure_threshold > 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state: an open circuit whose recovery timeout has passed reads as half-open."""
+        if self._state == CircuitState.OPEN and self.retry_after() == 0:
+            return CircuitState.HALF_OPEN
+        return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a trial call through (0 if not open)."""
+        if self._state != CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.recovery_timeout - time.monotonic())
+
+    def before_call(self) -> None:
+        """
+        Check that a call may go ahead, and count it if it is a trial call.
+
+        Raises:
+            CircuitOpenError: if the call is not allowed
+        """
+        if not self.enabled:
+            return
+        state = self.state
+        if state != self._state:
+            # The recovery timeout has passed: start a round of trial calls
+            self._state = state
+            self._trial_calls = 0
+        if state == CircuitState.OPEN:
+            raise CircuitOpenError("Grafana IRM is unavailable (circuit open)", retry_after=self.retry_after())
+        if state == CircuitState.HALF_OPEN:
+            if self._trial_calls >= self.half_open_max_calls:
+                raise CircuitOpenError("Grafana IRM is unavailable (recovery check in progress)", retry_after=1.0)
+            self._trial_calls += 1
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._state = CircuitState.CLOSED
+
+    def record_failure(self) -> None:
+        if not self.enabled:
+            return
+        self._failures += 1
+        if self._state == CircuitState.HALF_OPEN or self._failures >= self.failure_threshold:
+            self._state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Give back a trial call slot when a call ends without a verdict on IRM's health."""
+        if self._state == CircuitState.HALF_OPEN and self._trial_calls:
+            self._trial_calls -= 1
+
+    def snapshot(self) -> dict:
+        """State for the health endpoint."""
+        state = self.state
+        snapshot = {"state": state.value, "consecutive_failures": self._failures}
+        if state == CircuitState.OPEN:
+            snapshot["retry_after"] = round(self.retry_after(), 1)
+        return snapshot
+
@@ -0,0 +1,165 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+from app.config import get_settings
+from app.database import SessionLocal, utcnow
+from app.models import IncidentLog
+from app.repositories import catalog as catalog_repo
+from app.repositories import incidents as incidents_repo
+
+logger = logging.getLogger(__name__)
+
+
+def archive_record(incident: IncidentLog) -> dict:
+    """JSON-serializable form of an incident log entry."""
+    return {
+        "id": incident.id,
+        "grafana_incident_id": incident.grafana_incident_id,
+        "title": incident.title,
+        "severity": incident.severity_internal,
+        "severity_grafana": incident.severity_grafana,
+        "tags": [tag.value for tag in incident.tags],
+        "created_at": incident.created_at.isoformat(),
+    }
+
+
+class RetentionJob:
+    """Background job that runs purge() in a thread every interval, beginning at start()."""
+
+    name = "retention"
+
+    def __init__(self, session_factory, interval: float):
+        self.session_factory = session_factory
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    async def start(self) -> None:
+        """Start purging periodically, beginning now."""
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run(), name=self.name)
+
+    async def stop(self) -> None:
+        """Stop purging. A run in progress finishes in its thread."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.purge)
+            except Exception:
+                logger.exception("%s run failed", self.name)
+            await asyncio.sleep(self.interval)
+
+    def purge(self) -> int:
+        raise NotImplementedError
+
+
+class IncidentLogRetention(RetentionJob):
+    """
+    Background job that keeps the incident_log table small.
+
+    Every interval, entries older than the retention period are deleted in
+    batches, oldest first. If an archive directory is configured, each batch
+    is first appended to a gzipped NDJSON file there, one file per run. A
+    batch is archived before its delete is committed, so a failed run can
+    archive an entry twice but never loses one.
+    """
+
+    name = "incident-log-retention"
+
+    def __init__(self, session_factory=SessionLocal):
+        settings = get_settings()
+        super().__init__(session_factory, settings.incident_log_retention_interval)
+        self.retention_days = settings.incident_log_retention_days
+        self.archive_dir = settings.incident_log_archive_dir
+        self.batch_size = settings.incident_log_retention_batch_size
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        await super().start()
+        logger.info("Incident log retention started (%d days)", self.retention_days)
+
+    def purge(self, now: Optional[datetime] = None) -> int:
+        """
+        Archive and delete entries older than the retention period.
+
+        Returns:
+            Number of entries deleted
+        """
+        now = now or utcnow()
+        cutoff = now - timedelta(days=self.retention_days)
+        path = None
+        if self.archive_dir:
+            os.makedirs(self.archive_dir, exist_ok=True)
+            path = os.path.join(self.archive_dir, f"incident_log-{now:%Y%m%dT%H%M%S}.ndjson.gz")
+
+        deleted = 0
+        with self.session_factory() as db:
+            while True:
+                incidents = incidents_repo.list_expired_incidents(db, cutoff, self.batch_size)
+                if not incidents:
+                    break
+                if path:
+                    self.archive(path, incidents)
+                incidents_repo.delete_incidents(db, [incident.id for incident in incidents])
+                db.commit()
+                deleted += len(incidents)
+
+        if deleted:
+            logger.info("Purged %d incident log entries created before %s", deleted, cutoff.replace(microsecond=0))
+        return deleted
+
+    def archive(self, path: str, incidents: list[IncidentLog]) -> None:
+        """Append entries to a gzipped NDJSON file."""
+        lines = "".join(json.dumps(archive_record(incident)) + "\n" for incident in incidents)
+        with gzip.open(path, "at", encoding="utf-8") as f:
+            f.write(lines)
+
+
+class CatalogTombstoneRetention(RetentionJob):
+    """
+    Background job that prunes catalog tombstones older than the retention period.
+
+    Tree deltas from a version before the pruned tombstones get a 410, so
+    clients that far behind refetch the whole tree.
+    """
+
+    name = "catalog-tombstone-retention"
+
+    def __init__(self, session_factory=SessionLocal):
+        settings = get_settings()
+        super().__init__(session_factory, settings.catalog_tombstone_retention_interval)
+        self.retention_days = settings.catalog_tombstone_retention_days
+
+    def purge(self, now: Optional[datetime] = None) -> int:
+        """
+        Delete tombstones older than the retention period.
+
+        Returns:
+            Number of tombstones deleted
+        """
+        cutoff = (now or utcnow()) - timedelta(days=self.retention_days)
+        with self.session_factory() as db:
+            deleted = catalog_repo.prune_tombstones(db, cutoff)
+            db.commit()
+        if deleted:
+            logger.info("Pruned %d catalog tombstones from before %s", deleted, cutoff.replace(microsecond=0))
+        return deleted
+
+
+incident_log_retention = IncidentLogRetention()
+catalog_tombstone_retention = CatalogTombstoneRetention()
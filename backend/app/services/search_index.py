@@ -0,0 +1,329 @@
+import bisect
+import heapq
+import re
+import threading
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models import Application, Capability, Tag, application_tags, capability_tags
+
+APPLICATION = "application"
+CAPABILITY = "capability"
+
+# (kind, id) of an indexed application or capability
+DocKey = tuple[str, int]
+
+_WORD = re.compile(r"\w+")
+
+
+def trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+@dataclass(frozen=True)
+class SearchDocument:
+    """An application or capability as seen by the search index (lowercased fields)."""
+    kind: str
+    id: int
+    application_id: int
+    name: str
+    description: Optional[str]
+    tags: tuple[str, ...]
+    name_key: str
+    name_words: tuple[str, ...]
+    description_key: str
+    tag_keys: tuple[str, ...]
+
+    @classmethod
+    def create(
+        cls,
+        kind: str,
+        id: int,
+        application_id: int,
+        name: str,
+        description: Optional[str],
+        tags: Iterable[str],
+    ) -> "SearchDocument":
+        tags = tuple(tags)
+        name_key = name.lower()
+        tag_keys = tuple(dict.fromkeys(tag.lower() for tag in tags))
+        return cls(
+            kind=kind,
+            id=id,
+            application_id=application_id,
+            name=name,
+            description=description,
+            tags=tags,
+            name_key=name_key,
+            name_words=tuple(_WORD.findall(name_key)),
+            description_key=(description or "").lower(),
+            tag_keys=tag_keys,
+        )
+
+    @property
+    def key(self) -> DocKey:
+        return self.kind, self.id
+
+    def grams(self) -> set[str]:
+        """Trigrams of every searchable field."""
+        grams = trigrams(self.name_key) | trigrams(self.description_key)
+        for tag in self.tag_keys:
+            grams |= trigrams(tag)
+        return grams
+
+    def name_word_entries(self) -> list[tuple[str, str, DocKey]]:
+        """(word, name, key) entries for every word of the name."""
+        return [(word, self.name_key, self.key) for word in set(self.name_words)]
+
+    def tag_word_entries(self) -> list[tuple[str, str, DocKey]]:
+        """(word, name, key) entries for every tag and every word of it."""
+        words = set(self.tag_keys)
+        for tag in self.tag_keys:
+            words.update(_WORD.findall(tag))
+        return [(word, self.name_key, self.key) for word in words]
+
+    def score(self, term: str) -> int:
+        """How well one query term matches; 0 if it doesn't."""
+        if self.name_key == term:
+            return 100
+        if self.name_key.startswith(term):
+            return 80
+        if any(word.startswith(term) for word in self.name_words):
+            return 60
+        if term in self.name_key:
+            return 40
+        if term in self.tag_keys:
+            return 35
+        if any(term in tag for tag in self.tag_keys):
+            return 30
+        if term in self.description_key:
+            return 10
+        return 0
+
+
+class SearchIndex:
+    """
+    In-process typeahead index over application and capability names,
+    descriptions and tags.
+
+    Prefix matches are read in order from sorted lists of names, name words
+    and tag words, so the common typeahead case stops as soon as it has
+    enough results. Substring matches come from a trigram index, and only
+    those candidates are checked and ranked. Loaded at startup and updated
+    by the admin endpoints.
+    """
+
+    def __init__(self):
+        self._docs: dict[DocKey, SearchDocument] = {}
+        self._names: list[tuple[str, DocKey]] = []
+        self._name_words: list[tuple[str, str, DocKey]] = []
+        self._tag_words: list[tuple[str, str, DocKey]] = []
+        self._grams: dict[str, set[DocKey]] = {}
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    def load(self, db: Session) -> None:
+        """Rebuild the whole index from the database (4 queries)."""
+        app_tags: dict[int, list[str]] = {}
+        for app_id, value in db.execute(
+            select(application_tags.c.application_id, Tag.value)
+            .join(Tag, Tag.id == application_tags.c.tag_id)
+            .order_by(application_tags.c.application_id, Tag.id)
+        ):
+            app_tags.setdefault(app_id, []).append(value)
+
+        cap_tags: dict[int, list[str]] = {}
+        for cap_id, value in db.execute(
+            select(capability_tags.c.capability_id, Tag.value)
+            .join(Tag, Tag.id == capability_tags.c.tag_id)
+            .order_by(capability_tags.c.capability_id, Tag.id)
+        ):
+            cap_tags.setdefault(cap_id, []).append(value)
+
+        docs = [
+            SearchDocument.create(APPLICATION, id, id, name, description, app_tags.get(id, ()))
+            for id, name, description in db.execute(
+                select(Application.id, Application.name, Application.description)
+            )
+        ]
+        docs += [
+            SearchDocument.create(CAPABILITY, id, app_id, name, description, cap_tags.get(id, ()))
+            for id, app_id, name, description in db.execute(
+                select(Capability.id, Capability.application_id, Capability.name, Capability.description)
+            )
+        ]
+
+        names, name_words, tag_words = [], [], []
+        grams: dict[str, set[DocKey]] = {}
+        for doc in docs:
+            names.append((doc.name_key, doc.key))
+            name_words.extend(doc.name_word_entries())
+            tag_words.extend(doc.tag_word_entries())
+            for gram in doc.grams():
+                grams.setdefault(gram, set()).add(doc.key)
+
+        with self._lock:
+            self._docs = {doc.key: doc for doc in docs}
+            self._names = sorted(names)
+            self._name_words = sorted(name_words)
+            self._tag_words = sorted(tag_words)
+            self._grams = grams
+            self.loaded = True
+
+    def set_application(self, app: Application) -> None:
+        """Index or re-index an application."""
+        self._set(SearchDocument.create(
+            APPLICATION, app.id, app.id, app.name, app.description, [tag.value for tag in app.tags],
+        ))
+
+    def set_capability(self, cap: Capability) -> None:
+        """Index or re-index a capability."""
+        self._set(SearchDocument.create(
+            CAPABILITY, cap.id, cap.application_id, cap.name, cap.description, [tag.value for tag in cap.tags],
+        ))
+
+    def remove_application(self, app_id: int) -> None:
+        """Remove an application and its capabilities."""
+        with self._lock:
+            self._remove((APPLICATION, app_id))
+            for key in [k for k, doc in self._docs.items() if k[0] == CAPABILITY and doc.application_id == app_id]:
+                self._remove(key)
+
+    def remove_capability(self, cap_id: int) -> None:
+        """Remove a capability."""
+        with self._lock:
+            self._remove((CAPABILITY, cap_id))
+
+    def search(self, query: str, limit: int = 20) -> list[tuple[SearchDocument, Optional[SearchDocument]]]:
+        """
+        Find the best matches for a query.
+
+        A single term matches, in rank order: names starting with it, names
+        with a word starting with it, tags with a word starting with it, and
+        then (for three or more characters) names, tags and descriptions
+        containing it. Name prefix matches are ordered by name, word prefix
+        matches by the matched word and then name (so they can be read off
+        the sorted word lists), and substring matches by score and then
+        name. With several terms, every term must match and the best
+        combined matches come first.
+
+        Returns:
+            Up to `limit` (document, parent application document) pairs. The
+            parent is None for applications.
+        """
+        terms = list(dict.fromkeys(query.lower().split()))
+        if not terms:
+            return []
+
+        with self._lock:
+            if len(terms) == 1:
+                keys = self._search_term(terms[0], limit)
+            else:
+                keys = self._search_terms(terms, limit)
+            docs = [self._docs[key] for key in keys]
+            return [
+                (doc, self._docs.get((APPLICATION, doc.application_id)) if doc.kind == CAPABILITY else None)
+                for doc in docs
+            ]
+
+    def _search_term(self, term: str, limit: int) -> list[DocKey]:
+        found: dict[DocKey, None] = {}
+        for entries in (self._names, self._name_words, self._tag_words):
+            for key in prefix_range(entries, term):
+                found[key] = None
+                if len(found) >= limit:
+                    return list(found)
+
+        if len(term) >= 3:
+            ranked = []
+            for key in self._gram_candidates(term):
+                if key not in found:
+                    doc = self._docs[key]
+                    score = doc.score(term)
+                    if score:
+                        ranked.append((-score, doc.name_key, key))
+            found.update((key, None) for *_, key in heapq.nsmallest(limit - len(found), ranked))
+        return list(found)
+
+    def _search_terms(self, terms: list[str], limit: int) -> list[DocKey]:
+        # Every term must match, so candidates are the intersection of each
+        # term's candidates, narrowest first
+        candidates = None
+        for term in sorted(terms, key=len, reverse=True):
+            if len(term) >= 3:
+                matches = self._gram_candidates(term)
+            else:
+                matches = set(prefix_range(self._name_words, term)) | set(prefix_range(self._tag_words, term))
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return []
+
+        ranked = []
+        for key in candidates:
+            doc = self._docs[key]
+            total = 0
+            for term in terms:
+                score = doc.score(term)
+                if not score:
+                    break
+                total += score
+            else:
+                ranked.append((-total, doc.name_key, key))
+        return [key for *_, key in heapq.nsmallest(limit, ranked)]
+
+    def _gram_candidates(self, term: str) -> set[DocKey]:
+        """Documents containing every trigram of a term (a superset of the matches)."""
+        postings = sorted((self._grams.get(gram, set()) for gram in trigrams(term)), key=len)
+        candidates = postings[0]
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates = candidates & posting
+        return candidates
+
+    def _set(self, doc: SearchDocument) -> None:
+        with self._lock:
+            self._remove(doc.key)
+            self._docs[doc.key] = doc
+            bisect.insort(self._names, (doc.name_key, doc.key))
+            for entry in doc.name_word_entries():
+                bisect.insort(self._name_words, entry)
+            for entry in doc.tag_word_entries():
+                bisect.insort(self._tag_words, entry)
+            for gram in doc.grams():
+                self._grams.setdefault(gram, set()).add(doc.key)
+
+    def _remove(self, key: DocKey) -> None:
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return
+        remove_sorted(self._names, (doc.name_key, doc.key))
+        for entry in doc.name_word_entries():
+            remove_sorted(self._name_words, entry)
+        for entry in doc.tag_word_entries():
+            remove_sorted(self._tag_words, entry)
+        for gram in doc.grams():
+            keys = self._grams.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._grams[gram]
+
+
+def prefix_range(entries: list[tuple], prefix: str) -> Iterator[DocKey]:
+    """Keys of sorted entries whose first field starts with prefix, in order."""
+    for i in range(bisect.bisect_left(entries, (prefix,)), len(entries)):
+        entry = entries[i]
+        if not entry[0].startswith(prefix):
+            return
+        yield entry[-1]
+
+
+def remove_sorted(entries: list, entry) -> None:
+    i = bisect.bisect_left(entries, entry)
+    if i < len(entries) and entries[i] == entry:
+        del entries[i]
+
+
+search_index = SearchIndex()
@@ -0,0 +1,113 @@
+import threading
+from typing import Iterable
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models import Capability, Tag, application_tags, capability_tags
+
+# (key, value) pairs, deduplicated by the tag's normalized key
+TagEntries = tuple[tuple[str, str], ...]
+
+
+def build_entries(pairs: Iterable[tuple[str, str]]) -> TagEntries:
+    """Deduplicate (key, value) pairs by key, keeping the first occurrence."""
+    seen: dict[str, str] = {}
+    for key, value in pairs:
+        seen.setdefault(key, value)
+    return tuple(seen.items())
+
+
+class TagIndex:
+    """
+    In-process index of routing tags by application and capability.
+
+    Loaded once at startup and kept up to date by the admin endpoints, so
+    resolving an incident's tags needs no database access.
+    """
+
+    def __init__(self):
+        self._applications: dict[int, TagEntries] = {}
+        self._capabilities: dict[int, TagEntries] = {}
+        self._capability_apps: dict[int, int] = {}  # capability_id -> application_id
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    def load(self, db: Session) -> None:
+        """Rebuild the whole index from the database (2 queries)."""
+        app_values: dict[int, list[tuple[str, str]]] = {}
+        rows = db.execute(
+            select(application_tags.c.application_id, Tag.key, Tag.value)
+            .join(Tag, Tag.id == application_tags.c.tag_id)
+            .order_by(application_tags.c.application_id, Tag.id)
+        )
+        for app_id, key, value in rows:
+            app_values.setdefault(app_id, []).append((key, value))
+
+        cap_values: dict[int, list[tuple[str, str]]] = {}
+        capability_apps: dict[int, int] = {}
+        rows = db.execute(
+            select(Capability.id, Capability.application_id, Tag.key, Tag.value)
+            .outerjoin(capability_tags, capability_tags.c.capability_id == Capability.id)
+            .outerjoin(Tag, Tag.id == capability_tags.c.tag_id)
+            .order_by(Capability.id, Tag.id)
+        )
+        for cap_id, app_id, key, value in rows:
+            capability_apps[cap_id] = app_id
+            values = cap_values.setdefault(cap_id, [])
+            if key is not None:
+                values.append((key, value))
+
+        with self._lock:
+            self._applications = {k: build_entries(v) for k, v in app_values.items()}
+            self._capabilities = {k: build_entries(v) for k, v in cap_values.items()}
+            self._capability_apps = capability_apps
+            self.loaded = True
+
+    def set_application(self, app_id: int, tags: Iterable[Tag]) -> None:
+        """Replace the tags of an application."""
+        entries = build_entries((tag.key, tag.value) for tag in tags)
+        with self._lock:
+            self._applications[app_id] = entries
+
+    def set_capability(self, cap_id: int, app_id: int, tags: Iterable[Tag]) -> None:
+        """Replace the tags of a capability."""
+        entries = build_entries((tag.key, tag.value) for tag in tags)
+        with self._lock:
+            self._capabilities[cap_id] = entries
+            self._capability_apps[cap_id] = app_id
+
+    def remove_application(self, app_id: int) -> None:
+        """Remove an application and its capabilities."""
+        with self._lock:
+            self._applications.pop(app_id, None)
+            for cap_id in [c for c, a in self._capability_apps.items() if a == app_id]:
+                self._capabilities.pop(cap_id, None)
+                del self._capability_apps[cap_id]
+
+    def remove_capability(self, cap_id: int) -> None:
+        """Remove a capability."""
+        with self._lock:
+            self._capabilities.pop(cap_id, None)
+            self._capability_apps.pop(cap_id, None)
+
+    def resolve(self, application_ids: list[int], capability_ids: list[int]) -> list[str]:
+        """
+        Aggregate and deduplicate tags for the selected applications and capabilities.
+
+        Application tags come first, in application id order, followed by
+        capability tags. Unknown ids are ignored.
+        """
+        applications = self._applications
+        capabilities = self._capabilities
+        tags_seen: dict[str, str] = {}
+
+        for app_id in sorted(set(application_ids)):
+            for key, value in applications.get(app_id, ()):
+                tags_seen.setdefault(key, value)
+        for cap_id in sorted(set(capability_ids)):
+            for key, value in capabilities.get(cap_id, ()):
+                tags_seen.setdefault(key, value)
+
+        return list(tags_seen.values())
+
+
+tag_index = TagIndex()
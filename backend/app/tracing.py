@@ -0,0 +1,96 @@
+"""
+Optional OpenTelemetry tracing (the "otel" extra).
+
+With TRACING_ENABLED, setup_tracing() instruments the FastAPI routes, the
+SQLAlchemy engines and httpx. httpx is instrumented globally, so calls to
+Grafana IRM get client spans and carry the W3C trace context. The incident
+path adds spans for its own steps with span(). Spans are exported over OTLP
+(configured with the standard OTEL_EXPORTER_OTLP_* variables) or, with
+TRACING_EXPORTER=memory, kept in memory_exporter for tests.
+
+Without the extra installed, or with tracing disabled, span() is a no-op.
+"""
+import logging
+from contextlib import nullcontext
+from typing import Optional
+
+try:
+    from opentelemetry import trace
+except ImportError:
+    trace = None
+
+logger = logging.getLogger(__name__)
+
+_tracer = trace.get_tracer("app") if trace else None
+_provider = None
+
+# Finished spans when TRACING_EXPORTER=memory
+memory_exporter = None
+
+
+def span(name: str, **attributes):
+    """Context manager timing one step as a child of the current span."""
+    if _tracer is None:
+        return nullcontext()
+    return _tracer.start_as_current_span(name, attributes=attributes)
+
+
+def setup_tracing(app, engines: list, exporter: Optional[str] = None) -> bool:
+    """
+    Configure the tracer provider and instrument the app, engines and httpx.
+
+    Args:
+        app: FastAPI app
+        engines: Sync SQLAlchemy engines (use async_engine.sync_engine for the async one)
+        exporter: "otlp" or "memory"; defaults to the TRACING_EXPORTER setting
+
+    Returns:
+        False if the "otel" extra is not installed
+    """
+    global _provider, memory_exporter
+    try:
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+        from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+        from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBasedTraceIdRatio
+    except ImportError:
+        logger.warning("Tracing enabled but the 'otel' extra is not installed, tracing is off")
+        return False
+
+    from app.config import get_settings
+    settings = get_settings()
+    exporter = exporter or settings.tracing_exporter
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.tracing_service_name}),
+        sampler=ParentBasedTraceIdRatio(settings.tracing_sample_ratio),
+    )
+    if exporter == "memory":
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+        memory_exporter = InMemorySpanExporter()
+        provider.add_span_processor(SimpleSpanProcessor(memory_exporter))
+    else:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+    _provider = provider
+
+    FastAPIInstrumentor.instrument_app(app, tracer_provider=provider, excluded_urls="health,metrics")
+    # read_engine is the primary engine unless SQLite performance mode is on.
+    # The instrumentation only uses engine events, which are stable across
+    # SQLAlchemy 2.x, but its declared range lags SQLAlchemy releases.
+    SQLAlchemyInstrumentor().instrument(
+        engines=list(dict.fromkeys(engines)), tracer_provider=provider, skip_dep_check=True,
+    )
+    HTTPXClientInstrumentor().instrument(tracer_provider=provider)
+    logger.info("Tracing enabled (%s exporter)", exporter)
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Flush and stop span export. Called on application shutdown."""
+    if _provider is not None:
+        _provider.shutdown()
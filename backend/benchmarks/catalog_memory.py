@@ -0,0 +1,102 @@
+"""
+Benchmark the memory and load time of the whole catalog in each representation.
+
+Seeds a synthetic catalog (see benchmarks.load) in a temporary SQLite
+database and loads all of it, with tags, as:
+
+    orm        Application/Capability/Tag instances, as the admin routes load them
+    pydantic   the TreeNode list that /api/tree serializes (no tags; built
+               from the compact model, so its load time includes that)
+    compact    the CatalogModel that the catalog cache holds
+
+Memory is what tracemalloc sees still allocated once the representation is
+built, with the session closed. Load time is the median of --repeat loads,
+measured without tracemalloc.
+
+Usage:
+    uv run python -m benchmarks.catalog_memory --apps 5000 --capabilities 10
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+
+def main(args) -> None:
+    workdir = tempfile.mkdtemp()
+    os.environ.update(DATABASE_URL=f"sqlite:///{workdir}/bench.db", LOG_LEVEL="WARNING")
+    from sqlalchemy.orm import selectinload
+    from app.database import SessionLocal, run_migrations
+    from app.models import Application, Capability
+    from app.services import catalog_io
+    from app.services.catalog import build_tree
+    from app.services.catalog_model import load_catalog
+    from benchmarks.load import catalog_records
+
+    run_migrations()
+    records = catalog_records(args.apps, args.capabilities, args.tags, args.tag_pool, random.Random(1))
+    body = "".join(json.dumps(record) + "\n" for record in records).encode()
+    with SessionLocal() as db:
+        catalog_io.import_catalog(db, catalog_io.parse_records(body, "ndjson"))
+
+    def load_orm(db):
+        # Detached objects keep their loaded attributes once the session closes
+        return (
+            db.query(Application)
+            .options(
+                selectinload(Application.tags),
+                selectinload(Application.capabilities).selectinload(Capability.tags),
+            )
+            .order_by(Application.name)
+            .all()
+        )
+
+    loaders = {
+        "orm": load_orm,
+        "pydantic": lambda db: build_tree(load_catalog(db)),
+        "compact": load_catalog,
+    }
+
+    items = args.apps * (args.capabilities + 1)
+    print(f"{args.apps} applications, {items - args.apps} capabilities, {args.tags} tags each")
+    print(f"{'representation':<16} {'memory':>10} {'per item':>10} {'load':>10}")
+    for name, loader in loaders.items():
+        def load():
+            with SessionLocal() as db:
+                return loader(db)
+
+        times = []
+        for _ in range(args.repeat):
+            gc.collect()
+            start = time.perf_counter()
+            load()
+            times.append(time.perf_counter() - start)
+
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        result = load()
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        del result
+
+        print(
+            f"{name:<16} {retained / 2**20:7.1f} MiB {retained / items:7.0f} B "
+            f"{statistics.median(times) * 1000:7.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apps", type=int, default=5000)
+    parser.add_argument("--capabilities", type=int, default=10, help="Capabilities per application")
+    parser.add_argument("--tags", type=int, default=3, help="Tags per application and capability")
+    parser.add_argument("--tag-pool", type=int, default=500, help="Distinct tag values")
+    parser.add_argument("--repeat", type=int, default=5, help="Loads per representation for the timing")
+    main(parser.parse_args())
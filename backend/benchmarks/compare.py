@@ -0,0 +1,64 @@
+"""
+Compare two benchmarks.load result files.
+
+Prints throughput and p50/p99 latency per scenario and concurrency, with the
+change from the baseline. Exits with status 1 if any throughput dropped, or
+p99 latency grew, by more than --threshold percent.
+
+Usage:
+    uv run python -m benchmarks.compare before.json after.json --threshold 15
+"""
+import argparse
+import json
+import sys
+
+
+def change(baseline: float, current: float) -> float:
+    """Percentage change from baseline."""
+    return (current - baseline) / baseline * 100 if baseline else 0.0
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """Print the comparison table and return the regressions found."""
+    rows = {(row["scenario"], row["concurrency"]): row for row in baseline["results"]}
+    regressions = []
+    print(f"baseline {baseline['meta']['revision']}, current {current['meta']['revision']}")
+    print(f"{'scenario':<12} {'conc':>4}  {'req/s':>16}  {'p50 ms':>18}  {'p99 ms':>18}")
+    for row in current["results"]:
+        key = (row["scenario"], row["concurrency"])
+        before = rows.get(key)
+        if before is None or "p99_ms" not in row or "p99_ms" not in before:
+            continue
+        throughput = change(before["throughput"], row["throughput"])
+        p50 = change(before["p50_ms"], row["p50_ms"])
+        p99 = change(before["p99_ms"], row["p99_ms"])
+        flag = ""
+        if throughput < -threshold or p99 > threshold:
+            flag = "  REGRESSION"
+            regressions.append(f"{key[0]} at concurrency {key[1]}")
+        print(
+            f"{key[0]:<12} {key[1]:>4}  {row['throughput']:8.0f} {throughput:+6.1f}%  "
+            f"{row['p50_ms']:9.2f} {p50:+6.1f}%  {row['p99_ms']:9.2f} {p99:+6.1f}%{flag}"
+        )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Percent change counted as a regression")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    for name in ("catalog", "settings", "database"):
+        if baseline["meta"].get(name) != current["meta"].get(name):
+            print(f"warning: runs differ in {name}: {baseline['meta'].get(name)} vs {current['meta'].get(name)}")
+
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:g}%: {', '.join(regressions)}")
+        sys.exit(1)
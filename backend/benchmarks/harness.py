@@ -0,0 +1,55 @@
+"""Run the app in a uvicorn subprocess for benchmarks."""
+import os
+import socket
+import subprocess
+import sys
+import time
+import httpx
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_app(settings: dict[str, str], log_file) -> tuple[subprocess.Popen, str]:
+    """
+    Start the app in a uvicorn subprocess and wait until it is healthy.
+
+    Args:
+        settings: Environment variables for the app (DATABASE_URL, GRAFANA_IRM_BASE_URL, ...)
+        log_file: File receiving the app's output
+
+    Returns:
+        (process, base URL)
+    """
+    port = free_port()
+    env = dict(os.environ, GRAFANA_IRM_API_TOKEN="bench", **settings)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+        stdout=log_file,
+        stderr=subprocess.STDOUT,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(300):
+        if process.poll() is not None:
+            raise RuntimeError(f"App exited with status {process.returncode}, see {log_file.name}")
+        try:
+            if httpx.get(f"{base_url}/health").status_code == 200:
+                return process, base_url
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("App did not start")
+
+
+def stop_app(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
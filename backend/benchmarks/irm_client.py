@@ -0,0 +1,67 @@
+"""
+Benchmark GrafanaIRMClient with a per-call HTTP client vs the shared pooled client.
+
+Runs against a local stub IRM server, so the difference measured is connection
+setup (TCP, and TLS/DNS in production) rather than IRM processing time.
+
+Usage:
+    uv run python -m benchmarks.irm_client --requests 500 --concurrency 10
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from app.services.grafana import GrafanaIRMClient, create_http_client
+from benchmarks.stub_irm import StubIRMServer
+
+
+async def run(client: GrafanaIRMClient, requests: int, concurrency: int) -> list[float]:
+    """Create `requests` incidents with bounded concurrency, returning per-call latencies."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            await client.create_incident(title=f"bench {i}", severity="minor", tags=["team:bench"])
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return latencies
+
+
+def report(name: str, latencies: list[float], elapsed: float) -> None:
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(f"{name:<10} {len(latencies) / elapsed:8.0f} req/s   p50 {p50:6.2f} ms   p99 {p99:6.2f} ms")
+
+
+async def main(args) -> None:
+    with StubIRMServer(delay=args.delay) as server:
+        def make_client(http_client=None) -> GrafanaIRMClient:
+            client = GrafanaIRMClient(http_client=http_client)
+            client.base_url = server.base_url
+            client.api_token = "bench"
+            client.rate_limiter.rate = 0  # measure the connection handling, not the rate limit
+            return client
+
+        # Warm up the stub server
+        await run(make_client(), 10, 1)
+
+        start = time.perf_counter()
+        latencies = await run(make_client(), args.requests, args.concurrency)
+        report("per-call", latencies, time.perf_counter() - start)
+
+        async with create_http_client() as http_client:
+            start = time.perf_counter()
+            latencies = await run(make_client(http_client), args.requests, args.concurrency)
+            report("pooled", latencies, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--delay", type=float, default=0.0, help="Simulated IRM processing time in seconds")
+    asyncio.run(main(parser.parse_args()))
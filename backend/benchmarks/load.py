@@ -0,0 +1,276 @@
+"""
+Load test of the main API routes at rising concurrency.
+
+Seeds a synthetic catalog through the bulk import: --apps applications with
+--capabilities capabilities each, every item carrying --tags tags drawn from
+a pool of --tag-pool values. The app runs in a uvicorn subprocess on a fresh
+database, and a stub Grafana IRM server runs in this process. Each scenario
+is driven by 1, 4, 16 and 64 concurrent clients (--concurrency) for
+--duration seconds:
+
+    tree          GET /api/tree
+    admin_list    GET /api/admin/apps?limit=50
+    admin_get     GET /api/admin/apps/{id}
+    admin_write   POST, PUT and DELETE /api/admin/apps, in turn
+    incident      POST /api/incidents (unique titles, so nothing is deduplicated)
+
+Throughput and latency percentiles per scenario and concurrency are written
+as JSON, together with the commit and settings they were measured with. The
+client runs in one process, so at high concurrency on a small machine it can
+become the bottleneck; compare runs made on the same machine only.
+
+Usage:
+    uv run python -m benchmarks.load --apps 200 --capabilities 10 --output before.json
+    uv run python -m benchmarks.load --apps 200 --capabilities 10 --output after.json
+    uv run python -m benchmarks.compare before.json after.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+import httpx
+from benchmarks.harness import start_app, stop_app
+from benchmarks.stub_irm import StubIRMServer
+
+SCENARIOS = ["tree", "admin_list", "admin_get", "admin_write", "incident"]
+
+# One request of a scenario, made by one client: (http client, client number) -> response
+Request = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+def catalog_records(apps: int, capabilities: int, tags: int, tag_pool: int, rng: random.Random) -> list[dict]:
+    """Synthetic catalog in the bulk import format."""
+    pool = [f"{kind}:{i}" for i, kind in zip(range(tag_pool), itertools.cycle(["team", "service", "env", "region"]))]
+    records = []
+    for i in range(apps):
+        application = f"app-{i:05d}"
+        records.append({
+            "application": application,
+            "description": f"Synthetic application {i}",
+            "tags": rng.sample(pool, min(tags, tag_pool)),
+        })
+        for j in range(capabilities):
+            records.append({
+                "application": application,
+                "capability": f"cap-{j:03d}",
+                "tags": rng.sample(pool, min(tags, tag_pool)),
+            })
+    return records
+
+
+async def seed(client: httpx.AsyncClient, records: list[dict]) -> tuple[list[int], list[int]]:
+    """Import the catalog and return the application and capability ids."""
+    body = "".join(json.dumps(record) + "\n" for record in records)
+    response = await client.post("/api/admin/import", params={"format": "ndjson"}, content=body)
+    response.raise_for_status()
+    app_ids = [app["id"] for app in (await client.get("/api/admin/apps")).json()]
+    capability_ids = [cap["id"] for cap in (await client.get("/api/admin/capabilities")).json()]
+    return app_ids, capability_ids
+
+
+def scenarios(app_ids: list[int], capability_ids: list[int], rng: random.Random) -> dict[str, Request]:
+    counter = itertools.count()
+    # Per admin_write client: the application it created, and its next step
+    # (0 create, 1 update, 2 delete)
+    written: dict[int, int] = {}
+    steps: dict[int, int] = {}
+
+    async def tree(client, worker):
+        return await client.get("/api/tree")
+
+    async def admin_list(client, worker):
+        return await client.get("/api/admin/apps", params={"limit": 50})
+
+    async def admin_get(client, worker):
+        return await client.get(f"/api/admin/apps/{rng.choice(app_ids)}")
+
+    async def admin_write(client, worker):
+        step = steps.get(worker, 0)
+        app_id = written.get(worker)
+        if step == 0 or app_id is None:
+            steps[worker] = 1
+            response = await client.post("/api/admin/apps", json={
+                "name": f"bench-{worker}-{next(counter)}", "tags": [f"team:bench-{worker}", "env:bench"],
+            })
+            if response.status_code == 201:
+                written[worker] = response.json()["id"]
+            return response
+        if step == 1:
+            steps[worker] = 2
+            return await client.put(f"/api/admin/apps/{app_id}", json={"description": f"update {next(counter)}"})
+        steps[worker] = 0
+        del written[worker]
+        return await client.delete(f"/api/admin/apps/{app_id}")
+
+    async def incident(client, worker):
+        return await client.post("/api/incidents", json={
+            "title": f"bench incident {next(counter)}",
+            "severity": rng.choice(["P1", "P2", "P3", "P4"]),
+            "application_ids": rng.sample(app_ids, min(len(app_ids), rng.randint(1, 3))),
+            "capability_ids": rng.sample(capability_ids, min(len(capability_ids), rng.randint(0, 3))),
+        })
+
+    requests = {
+        "tree": tree,
+        "admin_list": admin_list,
+        "admin_get": admin_get,
+        "admin_write": admin_write,
+        "incident": incident,
+    }
+    return {name: requests[name] for name in SCENARIOS}
+
+
+def succeeded(response: httpx.Response) -> bool:
+    """2xx, and for incidents a result other than "error" (IRM failures are reported in the body)."""
+    if response.is_error:
+        return False
+    return response.request.url.path != "/api/incidents" or response.json()["status"] != "error"
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    return values[max(math.ceil(q * len(values)) - 1, 0)]
+
+
+async def run_level(client: httpx.AsyncClient, request: Request, concurrency: int, duration: float) -> dict:
+    """Drive one scenario with `concurrency` clients for `duration` seconds."""
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker(number: int):
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                ok = succeeded(await request(client, number))
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    result = {"concurrency": concurrency, "requests": len(latencies), "errors": errors, "throughput": len(latencies) / elapsed}
+    if latencies:
+        result.update({
+            "mean_ms": sum(latencies) / len(latencies) * 1000,
+            "p50_ms": percentile(latencies, 0.50) * 1000,
+            "p90_ms": percentile(latencies, 0.90) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+            "max_ms": latencies[-1] * 1000,
+        })
+    return result
+
+
+def git_revision() -> str:
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{revision}-dirty" if dirty.strip() else revision
+
+
+def parse_settings(values: list[str]) -> dict[str, str]:
+    settings = {}
+    for value in values:
+        key, sep, setting = value.partition("=")
+        if not sep:
+            raise SystemExit(f"--set expects NAME=VALUE, got {value!r}")
+        settings[key.upper()] = setting
+    return settings
+
+
+async def main(args) -> None:
+    rng = random.Random(args.seed)
+    levels = [int(level) for level in args.concurrency.split(",")]
+    names = args.scenario or SCENARIOS
+    workdir = tempfile.mkdtemp()
+    settings = {
+        "DATABASE_URL": args.database_url or f"sqlite:///{workdir}/bench.db",
+        # Measure the app, not the protection in front of IRM or the dedup window
+        "GRAFANA_IRM_RATE_LIMIT": "0",
+        "INCIDENT_DEDUP_WINDOW": "0",
+        **parse_settings(args.set),
+    }
+
+    results = []
+    with StubIRMServer(delay=args.irm_delay) as irm, open(os.path.join(workdir, "app.log"), "w") as log_file:
+        settings["GRAFANA_IRM_BASE_URL"] = irm.base_url
+        process, base_url = start_app(settings, log_file)
+        try:
+            limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+            async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+                started = time.perf_counter()
+                records = catalog_records(args.apps, args.capabilities, args.tags, args.tag_pool, rng)
+                app_ids, capability_ids = await seed(client, records)
+                print(f"Seeded {len(app_ids)} applications and {len(capability_ids)} capabilities "
+                      f"in {time.perf_counter() - started:.1f}s")
+
+                requests = scenarios(app_ids, capability_ids, rng)
+                for name in names:
+                    # Warm up caches and connections
+                    await run_level(client, requests[name], 1, min(args.duration, 1.0))
+                    for concurrency in levels:
+                        result = {"scenario": name, **await run_level(client, requests[name], concurrency, args.duration)}
+                        results.append(result)
+                        print(
+                            f"{name:<12} c={concurrency:<4} {result['throughput']:8.0f} req/s   "
+                            f"p50 {result.get('p50_ms', 0):8.2f} ms   p99 {result.get('p99_ms', 0):8.2f} ms"
+                            + (f"   {result['errors']} errors" if result["errors"] else "")
+                        )
+        finally:
+            stop_app(process)
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "catalog": {"apps": args.apps, "capabilities": args.capabilities, "tags": args.tags, "tag_pool": args.tag_pool},
+            "duration": args.duration,
+            "irm_delay": args.irm_delay,
+            "settings": {key: value for key, value in settings.items() if key not in ("DATABASE_URL", "GRAFANA_IRM_BASE_URL")},
+            "database": "postgresql" if args.database_url and args.database_url.startswith("postgresql") else "sqlite",
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apps", type=int, default=200)
+    parser.add_argument("--capabilities", type=int, default=10, help="Capabilities per application")
+    parser.add_argument("--tags", type=int, default=3, help="Tags per application and capability")
+    parser.add_argument("--tag-pool", type=int, default=500, help="Distinct tag values")
+    parser.add_argument("--concurrency", default="1,4,16,64", help="Comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per scenario and concurrency level")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="Scenario to run (repeatable; default all)")
+    parser.add_argument("--irm-delay", type=float, default=0.01, help="Simulated IRM processing time in seconds")
+    parser.add_argument("--database-url", help="Database to run against (default: a fresh SQLite file)")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE", help="App setting, e.g. SQLITE_PERFORMANCE_MODE=true")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the catalog and requests")
+    parser.add_argument("--output", default="benchmark-results.json")
+    asyncio.run(main(parser.parse_args()))
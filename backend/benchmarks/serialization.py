@@ -0,0 +1,95 @@
+"""
+Benchmark response serialization per endpoint, with and without FAST_JSON_RESPONSES.
+
+Seeds a synthetic catalog and incident history in a temporary SQLite
+database, then requests each listing and detail endpoint in process and
+reports the median CPU time per request in both modes. It also checks that both
+modes return the same bytes. CPU time covers the whole request (routing,
+database and serialization), so the saving shown is what an app process
+actually gains.
+
+Usage:
+    uv run python -m benchmarks.serialization --apps 2000 --capabilities 5 --requests 20
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+
+def main(args) -> None:
+    workdir = tempfile.mkdtemp()
+    os.environ.update(
+        DATABASE_URL=f"sqlite:///{workdir}/bench.db",
+        LOG_LEVEL="WARNING",
+        METRICS_ENABLED="false",
+    )
+    from fastapi.testclient import TestClient
+    from app.config import get_settings
+    from app.database import SessionLocal
+    from app.main import app
+    from app.repositories import incidents as incidents_repo
+    from app.responses import orjson_available
+    from benchmarks.load import catalog_records
+
+    if not orjson_available():
+        sys.exit("orjson is not installed (uv sync --extra orjson)")
+
+    rng = random.Random(1)
+    settings = get_settings()
+    with TestClient(app) as client:
+        records = catalog_records(args.apps, args.capabilities, 3, 500, rng)
+        body = "".join(json.dumps(record) + "\n" for record in records)
+        client.post("/api/admin/import", content=body).raise_for_status()
+        with SessionLocal() as db:
+            for i in range(args.incidents):
+                incidents_repo.add_incident_log(
+                    db, f"incident {i}", "P2", "major", [f"team:{i % 50}", "env:prod"], str(i),
+                )
+            db.commit()
+
+        app_id = client.get("/api/admin/apps", params={"limit": 1}).json()[0]["id"]
+        capability_id = client.get("/api/admin/capabilities", params={"limit": 1}).json()[0]["id"]
+        endpoints = {
+            f"apps (all {args.apps})": "/api/admin/apps",
+            "apps (page of 100)": "/api/admin/apps?limit=100",
+            "capabilities (page of 500)": "/api/admin/capabilities?limit=500",
+            "app with capabilities": f"/api/admin/apps/{app_id}",
+            "capability": f"/api/admin/capabilities/{capability_id}",
+            "incidents (page of 500)": "/api/incidents?limit=500",
+        }
+
+        print(f"{'endpoint':<28} {'default':>12} {'fast':>12} {'saving':>8}")
+        for name, url in endpoints.items():
+            bodies = {}
+            for fast in (False, True):
+                settings.fast_json_responses = fast
+                bodies[fast] = client.get(url).content
+            # Alternate the modes so that drift (caches, heap growth) hits both equally
+            samples = {False: [], True: []}
+            gc.collect()
+            for _ in range(args.requests):
+                for fast in (False, True):
+                    settings.fast_json_responses = fast
+                    start = time.process_time()
+                    client.get(url)
+                    samples[fast].append(time.process_time() - start)
+            cpu = {fast: statistics.median(values) * 1000 for fast, values in samples.items()}
+            settings.fast_json_responses = False
+            same = "" if bodies[False] == bodies[True] else "   OUTPUT DIFFERS"
+            saving = (1 - cpu[True] / cpu[False]) * 100
+            print(f"{name:<28} {cpu[False]:9.2f} ms {cpu[True]:9.2f} ms {saving:7.1f}%{same}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apps", type=int, default=2000)
+    parser.add_argument("--capabilities", type=int, default=5, help="Capabilities per application")
+    parser.add_argument("--incidents", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=20, help="Requests per endpoint and mode")
+    main(parser.parse_args())
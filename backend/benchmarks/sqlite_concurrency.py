@@ -0,0 +1,102 @@
+"""
+Benchmark concurrent catalog reads and incident writes against SQLite, with
+and without SQLITE_PERFORMANCE_MODE.
+
+Each mode runs the app in a uvicorn subprocess on a fresh database, seeded
+with a small catalog, while a stub Grafana IRM server answers incident calls.
+Readers hit /api/tree and /api/admin/apps (which is not cached) while writers
+submit /api/incidents, each of which commits an IncidentLog row.
+
+Usage:
+    uv run python -m benchmarks.sqlite_concurrency --duration 10 --readers 32 --writers 8
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+import httpx
+from benchmarks.harness import start_app, stop_app
+from benchmarks.stub_irm import StubIRMServer
+
+
+async def seed(client: httpx.AsyncClient, apps: int, capabilities: int) -> list[int]:
+    app_ids = []
+    for i in range(apps):
+        response = await client.post("/api/admin/apps", json={"name": f"app-{i}", "tags": [f"team:{i}"]})
+        app_ids.append(response.json()["id"])
+        for j in range(capabilities):
+            await client.post("/api/admin/capabilities", json={
+                "application_id": app_ids[-1],
+                "name": f"cap-{j}",
+                "tags": [f"service:{i}-{j}"],
+            })
+    return app_ids
+
+
+async def run_mode(args, irm_url: str, performance_mode: bool) -> dict:
+    workdir = tempfile.mkdtemp()
+    log_file = open(os.path.join(workdir, "app.log"), "w")
+    process, base_url = start_app({
+        "DATABASE_URL": f"sqlite:///{workdir}/bench.db",
+        "GRAFANA_IRM_BASE_URL": irm_url,
+        "SQLITE_PERFORMANCE_MODE": str(performance_mode).lower(),
+    }, log_file)
+    latencies: dict[str, list[float]] = {"tree": [], "admin_list": [], "incident": []}
+    try:
+        limits = httpx.Limits(max_connections=args.readers + args.writers)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            app_ids = await seed(client, args.apps, args.capabilities)
+            deadline = time.perf_counter() + args.duration
+
+            async def loop(name: str, request):
+                while time.perf_counter() < deadline:
+                    start = time.perf_counter()
+                    response = await request()
+                    response.raise_for_status()
+                    latencies[name].append(time.perf_counter() - start)
+
+            def incident():
+                return client.post("/api/incidents", json={
+                    "title": "bench", "severity": "P3", "application_ids": app_ids[:3],
+                })
+
+            tasks = [loop("incident", incident) for _ in range(args.writers)]
+            for i in range(args.readers):
+                if i % 2:
+                    tasks.append(loop("tree", lambda: client.get("/api/tree")))
+                else:
+                    tasks.append(loop("admin_list", lambda: client.get("/api/admin/apps")))
+            await asyncio.gather(*tasks)
+    finally:
+        stop_app(process)
+        log_file.close()
+    return latencies
+
+
+def report(mode: str, latencies: dict, duration: float) -> None:
+    for name, values in latencies.items():
+        if not values:
+            continue
+        values = sorted(values)
+        p50 = statistics.median(values) * 1000
+        p99 = values[max(int(len(values) * 0.99) - 1, 0)] * 1000
+        print(f"{mode:<12} {name:<11} {len(values) / duration:8.0f} req/s   p50 {p50:7.2f} ms   p99 {p99:7.2f} ms")
+
+
+async def main(args) -> None:
+    with StubIRMServer() as irm:
+        for performance_mode in (False, True):
+            latencies = await run_mode(args, irm.base_url, performance_mode)
+            report("performance" if performance_mode else "default", latencies, args.duration)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run each mode")
+    parser.add_argument("--readers", type=int, default=32)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--apps", type=int, default=50)
+    parser.add_argument("--capabilities", type=int, default=10, help="Capabilities per application")
+    asyncio.run(main(parser.parse_args()))
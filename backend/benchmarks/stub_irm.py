@@ -0,0 +1,66 @@
+"""Local stub of the Grafana IRM CreateIncident API for benchmarks."""
+import asyncio
+import itertools
+import socket
+import threading
+import time
+import uvicorn
+from fastapi import FastAPI
+
+CREATE_INCIDENT_PATH = "/api/plugins/grafana-irm-app/resources/api/v1/IncidentsService.CreateIncident"
+
+
+def create_stub_app(delay: float = 0.0) -> FastAPI:
+    """Create a stub IRM app that answers CreateIncident after an optional delay."""
+    app = FastAPI()
+    counter = itertools.count(1)
+
+    @app.post(CREATE_INCIDENT_PATH)
+    async def create_incident():
+        if delay:
+            await asyncio.sleep(delay)
+        incident_id = next(counter)
+        return {
+            "incident": {
+                "incidentID": str(incident_id),
+                "overviewURL": f"/a/grafana-irm-app/incidents/{incident_id}",
+            }
+        }
+
+    return app
+
+
+class StubIRMServer:
+    """
+    Runs the stub IRM app with uvicorn on a free local port in a background thread.
+
+    Usage:
+        with StubIRMServer(delay=0.01) as server:
+            print(server.base_url)
+    """
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.base_url = ""
+        self._server: uvicorn.Server | None = None
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(("127.0.0.1", 0))
+        host, port = sock.getsockname()
+        self.base_url = f"http://{host}:{port}"
+
+        config = uvicorn.Config(create_stub_app(self.delay), log_level="warning", access_log=False)
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, kwargs={"sockets": [sock]}, daemon=True)
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
+        return False
@@ -0,0 +1,84 @@
+"""
+Benchmark tag writes as the tags table grows.
+
+Compares the previous per-tag case-insensitive ILIKE lookup with the batched
+lookup on the indexed tags.key column used by the admin endpoints. Each write
+resolves a mix of existing and new tag values, as an application update does.
+
+Usage:
+    uv run python -m benchmarks.tag_writes --rows 100000 --writes 200
+"""
+import argparse
+import random
+import tempfile
+import time
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from app.database import Base
+from app.models import Tag, normalize_tag
+from app.repositories import catalog as catalog_repo
+
+
+def resolve_tags_ilike(db: Session, values: list[str]) -> list[Tag]:
+    """The previous sync_tags: one ILIKE query and flush per tag."""
+    tags = []
+    for value in values:
+        tag = db.query(Tag).filter(Tag.value.ilike(value)).first()
+        if not tag:
+            tag = Tag(value=value)
+            db.add(tag)
+            db.flush()
+        tags.append(tag)
+    return tags
+
+
+def resolve_tags_key(db: Session, values: list[str]) -> list[Tag]:
+    tags = catalog_repo.resolve_tags(db, values)
+    return [tags[normalize_tag(value)] for value in values]
+
+
+def grow(db: Session, start: int, stop: int) -> None:
+    """Insert tags with ids start..stop-1."""
+    db.execute(insert(Tag), [
+        {"value": f"Team:{i}", "key": normalize_tag(f"Team:{i}")}
+        for i in range(start, stop)
+    ])
+    db.commit()
+
+
+def measure(db: Session, resolve, size: int, writes: int, tags_per_write: int) -> float:
+    """Average milliseconds per write. Tags created here are rolled back."""
+    rng = random.Random(size)
+    transaction = db.begin_nested()
+    start = time.perf_counter()
+    for i in range(writes):
+        values = [f"team:{rng.randrange(size)}" for _ in range(tags_per_write - 1)]
+        values.append(f"new:{size}:{i}")
+        resolve(db, values)
+    elapsed = time.perf_counter() - start
+    transaction.rollback()
+    return elapsed / writes * 1000
+
+
+def main(args) -> None:
+    engine = create_engine(f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+    Base.metadata.create_all(engine)
+
+    sizes = [size for size in (1_000, 10_000, 50_000, 100_000) if size < args.rows] + [args.rows]
+    print(f"{'rows':>8} {'ilike ms/write':>15} {'key ms/write':>13}")
+    with Session(engine) as db:
+        current = 0
+        for size in sizes:
+            grow(db, current, size)
+            current = size
+            ilike = measure(db, resolve_tags_ilike, size, args.writes, args.tags)
+            key = measure(db, resolve_tags_key, size, args.writes, args.tags)
+            print(f"{size:>8} {ilike:>15.2f} {key:>13.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="Final size of the tags table")
+    parser.add_argument("--writes", type=int, default=200, help="Writes measured at each size")
+    parser.add_argument("--tags", type=int, default=5, help="Tags per write")
+    main(parser.parse_args())
@@ -0,0 +1,79 @@
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import text
+from app.database import Base, engine
+import app.models  # noqa: F401 - register models on Base.metadata
+
+config = context.config
+
+# Keep the app's logging setup when migrations run from the lifespan
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Search indexes created by migration 0004 outside the model metadata
+SEARCH_INDEX_PREFIXES = ("applications_fts", "capabilities_fts")
+SEARCH_INDEX_SUFFIX = "_name_trgm"
+
+
+def include_name(name, type_, parent_names) -> bool:
+    """Keep autogenerate from proposing to drop the search indexes."""
+    if type_ == "table":
+        return not name.startswith(SEARCH_INDEX_PREFIXES)
+    if type_ == "index":
+        return not (name or "").endswith(SEARCH_INDEX_SUFFIX)
+    return True
+
+
+# Arbitrary key for the advisory lock that serializes migrations across replicas
+MIGRATION_LOCK_ID = 7261849
+
+
+def run_migrations_offline() -> None:
+    """Emit migration SQL without connecting to the database."""
+    context.configure(
+        url=str(engine.url),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        include_name=include_name,
+        render_as_batch=engine.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations against the app's engine."""
+    with engine.connect() as connection:
+        if connection.dialect.name == "postgresql":
+            # Replicas starting together wait here instead of racing each other
+            connection.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+            connection.commit()
+        if connection.dialect.name == "sqlite":
+            # Batch migrations copy a table and drop the original; with foreign
+            # keys enforced the drop would cascade to rows referencing it
+            connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+            connection.commit()
+        try:
+            context.configure(
+                connection=connection,
+                target_metadata=target_metadata,
+                include_name=include_name,
+                render_as_batch=connection.dialect.name == "sqlite",
+            )
+            with context.begin_transaction():
+                context.run_migrations()
+        finally:
+            if connection.dialect.name == "sqlite":
+                connection.exec_driver_sql("PRAGMA foreign_keys=ON")
+                connection.commit()
+            if connection.dialect.name == "postgresql":
+                connection.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+                connection.commit()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
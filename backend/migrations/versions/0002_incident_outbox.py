@@ -0,0 +1,39 @@
+"""incident outbox
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 14:37:02.118350
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('incident_outbox',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('title', sa.Text(), nullable=False),
+    sa.Column('severity_internal', sa.String(length=10), nullable=False),
+    sa.Column('severity_grafana', sa.String(length=20), nullable=False),
+    sa.Column('tags', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('grafana_incident_id', sa.String(length=255), nullable=True),
+    sa.Column('grafana_incident_url', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_incident_outbox_status_next_attempt', 'incident_outbox', ['status', 'next_attempt_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_incident_outbox_status_next_attempt', table_name='incident_outbox')
+    op.drop_table('incident_outbox')
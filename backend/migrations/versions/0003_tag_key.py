@@ -0,0 +1,74 @@
+"""tag key
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 14:45:34.673470
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+tags = sa.table('tags', sa.column('id', sa.Integer), sa.column('value', sa.String), sa.column('key', sa.String))
+link_tables = [
+    sa.table('application_tags', sa.column('application_id', sa.Integer), sa.column('tag_id', sa.Integer)),
+    sa.table('capability_tags', sa.column('capability_id', sa.Integer), sa.column('tag_id', sa.Integer)),
+]
+
+
+def merge_duplicate_tags(conn, duplicates: dict[int, int]) -> None:
+    """Point links at the kept tag (duplicate id -> kept id) and delete the duplicates."""
+    for table in link_tables:
+        owner = next(c for c in table.c if c.name != 'tag_id')
+        existing = set(conn.execute(sa.select(owner, table.c.tag_id)).tuples())
+        moved = {
+            (owner_id, duplicates[tag_id])
+            for owner_id, tag_id in existing
+            if tag_id in duplicates
+        } - existing
+        conn.execute(table.delete().where(table.c.tag_id.in_(list(duplicates))))
+        if moved:
+            conn.execute(table.insert(), [{owner.name: o, 'tag_id': t} for o, t in sorted(moved)])
+    conn.execute(tags.delete().where(tags.c.id.in_(list(duplicates))))
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('tags', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('key', sa.String(length=255), nullable=True))
+
+    # Backfill in Python so keys match the application's normalize_tag()
+    # (SQLite's lower() only folds ASCII). Tags that differ only in case
+    # are merged into the oldest one.
+    conn = op.get_bind()
+    kept: dict[str, int] = {}
+    duplicates: dict[int, int] = {}
+    updates = []
+    for tag_id, value in conn.execute(sa.select(tags.c.id, tags.c.value).order_by(tags.c.id)):
+        key = value.lower()
+        if key in kept:
+            duplicates[tag_id] = kept[key]
+        else:
+            kept[key] = tag_id
+            updates.append({'tag_id': tag_id, 'tag_key': key})
+    if duplicates:
+        merge_duplicate_tags(conn, duplicates)
+    if updates:
+        conn.execute(
+            tags.update().where(tags.c.id == sa.bindparam('tag_id')).values(key=sa.bindparam('tag_key')),
+            updates,
+        )
+
+    with op.batch_alter_table('tags', schema=None) as batch_op:
+        batch_op.alter_column('key', existing_type=sa.String(length=255), nullable=False)
+        batch_op.create_index(batch_op.f('ix_tags_key'), ['key'], unique=True)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('tags', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_tags_key'))
+        batch_op.drop_column('key')
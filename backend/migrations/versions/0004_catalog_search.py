@@ -0,0 +1,101 @@
+"""catalog search
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 14:52:10.406512
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+# Name search indexes that live outside the SQLAlchemy metadata; env.py
+# excludes them from autogenerate. SQLite drops a table's triggers with the
+# table, so a batch migration that recreates applications or capabilities
+# has to recreate the FTS triggers as create_fts() does.
+SEARCHED_TABLES = ['applications', 'capabilities']
+
+
+def sqlite_has_trigram(conn) -> bool:
+    """FTS5 with the trigram tokenizer needs SQLite 3.34 built with FTS5."""
+    try:
+        conn.exec_driver_sql("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x, tokenize='trigram')")
+    except sa.exc.OperationalError:
+        return False
+    conn.exec_driver_sql("DROP TABLE temp.fts5_probe")
+    return True
+
+
+def create_fts(table: str) -> None:
+    fts = f'{table}_fts'
+    op.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"name, content='{table}', content_rowid='id', tokenize='trigram')"
+    )
+    op.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts}(rowid, name) VALUES (new.id, new.name);
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, name) VALUES ('delete', old.id, old.name);
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF name ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, name) VALUES ('delete', old.id, old.name);
+            INSERT INTO {fts}(rowid, name) VALUES (new.id, new.name);
+        END
+    """)
+    op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def drop_fts(table: str) -> None:
+    fts = f'{table}_fts'
+    for trigger in ('insert', 'delete', 'update'):
+        op.execute(f"DROP TRIGGER IF EXISTS {fts}_{trigger}")
+    op.execute(f"DROP TABLE IF EXISTS {fts}")
+
+
+def create_trigram_indexes(conn) -> None:
+    """Create pg_trgm indexes for ILIKE searches, if the extension can be installed."""
+    try:
+        with conn.begin_nested():
+            conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except sa.exc.DBAPIError:
+        return
+    for table in SEARCHED_TABLES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_name_trgm ON {table} USING gin (name gin_trgm_ops)")
+
+
+def upgrade() -> None:
+    op.create_index('ix_application_tags_tag_id', 'application_tags', ['tag_id'], unique=False)
+    op.create_index('ix_capability_tags_tag_id', 'capability_tags', ['tag_id'], unique=False)
+    op.create_index('ix_capabilities_name_id', 'capabilities', ['name', 'id'], unique=False)
+
+    conn = op.get_bind()
+    if conn.dialect.name == 'sqlite' and sqlite_has_trigram(conn):
+        for table in SEARCHED_TABLES:
+            create_fts(table)
+    elif conn.dialect.name == 'postgresql':
+        create_trigram_indexes(conn)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name == 'sqlite':
+        for table in SEARCHED_TABLES:
+            drop_fts(table)
+    elif conn.dialect.name == 'postgresql':
+        for table in SEARCHED_TABLES:
+            op.execute(f"DROP INDEX IF EXISTS ix_{table}_name_trgm")
+
+    op.drop_index('ix_capabilities_name_id', table_name='capabilities')
+    op.drop_index('ix_capability_tags_tag_id', table_name='capability_tags')
+    op.drop_index('ix_application_tags_tag_id', table_name='application_tags')
@@ -0,0 +1,88 @@
+"""incident log history
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 15:04:41.270913
+"""
+import json
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+incident_log = sa.table('incident_log', sa.column('id', sa.Integer), sa.column('tags', sa.Text))
+incident_log_tags = sa.table(
+    'incident_log_tags',
+    sa.column('incident_log_id', sa.Integer),
+    sa.column('position', sa.Integer),
+    sa.column('value', sa.String),
+    sa.column('key', sa.String),
+)
+
+
+def move_tags_to_rows(conn) -> None:
+    """Copy the JSON tag lists into incident_log_tags, values unchanged."""
+    rows = []
+    for incident_id, value in conn.execute(sa.select(incident_log.c.id, incident_log.c.tags)):
+        rows.extend(
+            {'incident_log_id': incident_id, 'position': position, 'value': tag, 'key': tag.lower()}
+            for position, tag in enumerate(json.loads(value) if value else [])
+        )
+    if rows:
+        conn.execute(incident_log_tags.insert(), rows)
+
+
+def move_rows_to_tags(conn) -> None:
+    """Rebuild the JSON tag lists from incident_log_tags."""
+    values: dict[int, list[str]] = {}
+    for incident_id, value in conn.execute(
+        sa.select(incident_log_tags.c.incident_log_id, incident_log_tags.c.value)
+        .order_by(incident_log_tags.c.incident_log_id, incident_log_tags.c.position)
+    ):
+        values.setdefault(incident_id, []).append(value)
+    if values:
+        conn.execute(
+            incident_log.update().where(incident_log.c.id == sa.bindparam('incident_id')).values(tags=sa.bindparam('tag_list')),
+            [{'incident_id': i, 'tag_list': json.dumps(v)} for i, v in values.items()],
+        )
+
+
+def upgrade() -> None:
+    op.create_table('incident_log_tags',
+    sa.Column('incident_log_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('value', sa.String(length=255), nullable=False),
+    sa.Column('key', sa.String(length=255), nullable=False),
+    sa.ForeignKeyConstraint(['incident_log_id'], ['incident_log.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('incident_log_id', 'position')
+    )
+    op.create_index('ix_incident_log_tags_key', 'incident_log_tags', ['key', 'incident_log_id'], unique=False)
+
+    conn = op.get_bind()
+    move_tags_to_rows(conn)
+    if conn.dialect.name == 'sqlite':
+        # Rows written by the CURRENT_TIMESTAMP default have no fractional
+        # seconds and would sort before Python-written rows of the same second
+        op.execute("UPDATE incident_log SET created_at = created_at || '.000000' WHERE length(created_at) = 19")
+
+    with op.batch_alter_table('incident_log', schema=None) as batch_op:
+        batch_op.drop_column('tags')
+        batch_op.create_index('ix_incident_log_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_incident_log_severity_created_at_id', ['severity_internal', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('incident_log', schema=None) as batch_op:
+        batch_op.drop_index('ix_incident_log_severity_created_at_id')
+        batch_op.drop_index('ix_incident_log_created_at_id')
+        batch_op.add_column(sa.Column('tags', sa.Text(), nullable=True))
+
+    move_rows_to_tags(op.get_bind())
+
+    op.drop_index('ix_incident_log_tags_key', table_name='incident_log_tags')
+    op.drop_table('incident_log_tags')
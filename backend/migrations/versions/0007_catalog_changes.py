@@ -0,0 +1,43 @@
+"""catalog changes
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 16:48:37.902215
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Plain ADD/DROP COLUMN, not batch mode, so that SQLite doesn't recreate
+    # the tables and drop their FTS triggers
+    op.add_column('applications', sa.Column('catalog_version', sa.Integer(), server_default='0', nullable=False))
+    op.create_index('ix_applications_catalog_version', 'applications', ['catalog_version'], unique=False)
+    op.add_column('capabilities', sa.Column('catalog_version', sa.Integer(), server_default='0', nullable=False))
+    op.create_index('ix_capabilities_catalog_version', 'capabilities', ['catalog_version'], unique=False)
+
+    op.create_table('catalog_tombstones',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('catalog_version', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_catalog_tombstones_catalog_version', 'catalog_tombstones', ['catalog_version'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_catalog_tombstones_catalog_version', table_name='catalog_tombstones')
+    op.drop_table('catalog_tombstones')
+
+    op.drop_index('ix_capabilities_catalog_version', table_name='capabilities')
+    op.drop_column('capabilities', 'catalog_version')
+    op.drop_index('ix_applications_catalog_version', table_name='applications')
+    op.drop_column('applications', 'catalog_version')
@@ -0,0 +1,22 @@
+"""catalog tombstone pruning
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 18:02:11.640318
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('catalog_version', sa.Column('pruned_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('catalog_version', 'pruned_version')
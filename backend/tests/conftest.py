@@ -0,0 +1,41 @@
+"""
+Shared test fixtures.
+
+The suite runs against a fresh SQLite database in a temporary directory.
+Set DATABASE_URL to a PostgreSQL database to run it there instead, which
+also enables the PostgreSQL-only tests; the database should be empty and
+disposable.
+"""
+import os
+import tempfile
+
+if not os.environ.get("DATABASE_URL", "").startswith(("postgresql", "postgres")):
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='incident-bridge-tests-')}/test.db"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import pytest  # noqa: E402
+from app.database import SessionLocal, async_engine, run_migrations  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Upgrade the test database to the latest migration once per run."""
+    run_migrations()
+
+
+@pytest.fixture
+def db():
+    """A sync session, closed after the test."""
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture(autouse=True)
+def fresh_async_pool():
+    """Drop pooled async connections after each test.
+
+    Tests run on different event loops (pytest-asyncio, TestClient), and
+    asyncpg connections cannot be reused across loops.
+    """
+    yield
+    async_engine.sync_engine.dispose(close=False)
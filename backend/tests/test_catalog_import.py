@@ -0,0 +1,28 @@
+"""Bulk import validates tags with the same rules as the admin API."""
+import pytest
+from pydantic import ValidationError
+from app.schemas.application import ApplicationCreate
+from app.services.catalog_io import CatalogImportError, parse_records
+
+INVALID_TAGS = ["", "   ", "x" * 256]
+
+
+def test_tags_are_stripped():
+    [record] = parse_records(b'{"application": "a", "tags": ["  team:core ", "env:prod"]}\n', "ndjson")
+    assert record.tags == ["team:core", "env:prod"]
+    assert ApplicationCreate(name="a", tags=["  team:core "]).tags == ["team:core"]
+
+
+@pytest.mark.parametrize("tag", INVALID_TAGS)
+def test_invalid_tags_are_rejected_like_the_admin_api(tag):
+    with pytest.raises(ValidationError):
+        ApplicationCreate(name="a", tags=[tag])
+    with pytest.raises(CatalogImportError, match="Line 1: tags.0"):
+        parse_records(f'{{"application": "a", "tags": ["{tag}"]}}'.encode(), "ndjson")
+
+
+def test_csv_tags():
+    body = b"application,capability,description,tags\na,,, team:core ;;env:prod\n"
+    assert parse_records(body, "csv")[0].tags == ["team:core", "env:prod"]
+    with pytest.raises(CatalogImportError, match="Line 2"):
+        parse_records(b"application,capability,description,tags\na,,," + b"x" * 256 + b"\n", "csv")
@@ -0,0 +1,72 @@
+"""Catalog sync: reloading the in-memory copies after changes made by another process."""
+import pytest
+
+from app.database import SessionLocal
+from app.models import Application
+from app.repositories import catalog as catalog_repo
+from app.services.catalog_sync import CatalogSync
+from app.services.search_index import search_index
+from app.services.tag_index import tag_index
+
+
+@pytest.fixture
+def sync(db, monkeypatch):
+    sync = CatalogSync()
+    sync.load(db)
+    sync.loads = 0
+    load = sync.load
+
+    def counting_load(db):
+        sync.loads += 1
+        load(db)
+
+    monkeypatch.setattr(sync, "load", counting_load)
+    return sync
+
+
+def add_application(db, name: str, tags: list[str]) -> Application:
+    app = Application(name=name, tags=list(catalog_repo.resolve_tags(db, tags).values()))
+    db.add(app)
+    return app
+
+
+def commit_elsewhere(name: str, tags: list[str]) -> int:
+    """Make a catalog change the way another process would, without touching this one's copies."""
+    with SessionLocal() as other:
+        app = add_application(other, name, tags)
+        version = catalog_repo.increment_catalog_version(other)
+        catalog_repo.stamp_changes(other, version)
+        other.commit()
+        return app.id
+
+
+def test_change_by_another_process_reloads_the_indexes(sync):
+    assert sync.check() is False
+
+    app_id = commit_elsewhere("sync-remote", ["team:sync"])
+    assert search_index.search("sync-remote") == []
+
+    assert sync.check() is True
+    assert sync.loads == 1
+    [(doc, _)] = search_index.search("sync-remote")
+    assert doc.id == app_id
+    assert tag_index.resolve([app_id], []) == ["team:sync"]
+    assert sync.check() is False
+
+
+def test_own_commit_does_not_reload(sync, db):
+    before = sync.version
+    add_application(db, "sync-local", [])
+    assert sync.commit(db) == before + 1
+    assert sync.version == before + 1
+    assert sync.check() is False
+    assert sync.loads == 0
+
+
+def test_own_commit_after_a_remote_change_still_reloads(sync, db):
+    commit_elsewhere("sync-remote-2", [])
+    add_application(db, "sync-local-2", [])
+    # The version moved by two, so this process missed a change
+    sync.commit(db)
+    assert sync.check() is True
+    assert sync.loads == 1
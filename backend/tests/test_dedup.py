@@ -0,0 +1,91 @@
+"""Incident deduplication: concurrent identical submissions share one successful result."""
+import asyncio
+import pytest
+from app.services.dedup import IncidentDeduplicator, dedup_key
+
+KEY = dedup_key("Checkout  is DOWN", "P1", ["Team:Shop", "env:prod"])
+
+
+class FakeIRM:
+    """Counts calls and returns (or raises) the given outcomes in turn, after a short delay."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    async def create(self):
+        self.calls += 1
+        outcome = self.outcomes[min(self.calls, len(self.outcomes)) - 1]
+        await asyncio.sleep(0.01)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def test_key_ignores_title_case_spacing_and_tag_order():
+    assert dedup_key("checkout is down", "P1", ["ENV:PROD", "team:shop"]) == KEY
+    assert dedup_key("checkout is down", "P2", ["env:prod", "team:shop"]) != KEY
+
+
+async def test_concurrent_submissions_are_coalesced():
+    dedup = IncidentDeduplicator(window=300)
+    irm = FakeIRM({"status": "ok", "incident_id": "1"})
+    results = await asyncio.gather(*(dedup.run(KEY, irm.create) for _ in range(5)))
+    assert irm.calls == 1
+    assert [deduplicated for _, deduplicated in results] == [False, True, True, True, True]
+    assert all(result == {"status": "ok", "incident_id": "1"} for result, _ in results)
+
+    # Remembered for the window
+    assert await dedup.run(KEY, irm.create) == ({"status": "ok", "incident_id": "1"}, True)
+    assert irm.calls == 1
+
+
+async def test_failed_result_is_not_shared_or_remembered():
+    dedup = IncidentDeduplicator(window=300)
+    irm = FakeIRM({"status": "error", "message": "rate limited"}, {"status": "ok", "incident_id": "2"})
+    results = await asyncio.gather(*(dedup.run(KEY, irm.create) for _ in range(3)))
+    # The first failed on its own; the waiters retried, and one of them succeeded for both
+    assert results[0] == ({"status": "error", "message": "rate limited"}, False)
+    assert sorted(deduplicated for _, deduplicated in results[1:]) == [False, True]
+    assert all(result == {"status": "ok", "incident_id": "2"} for result, _ in results[1:])
+    assert irm.calls == 2
+
+
+async def test_failure_is_retried_by_the_next_submission():
+    dedup = IncidentDeduplicator(window=300)
+    irm = FakeIRM({"status": "error", "message": "IRM down"}, {"status": "ok", "incident_id": "3"})
+    assert (await dedup.run(KEY, irm.create))[0]["status"] == "error"
+    assert await dedup.run(KEY, irm.create) == ({"status": "ok", "incident_id": "3"}, False)
+    assert irm.calls == 2
+
+
+async def test_exception_is_raised_only_to_its_own_submission():
+    dedup = IncidentDeduplicator(window=300)
+    irm = FakeIRM(RuntimeError("boom"), {"status": "queued", "incident_id": 7})
+    results = await asyncio.gather(*(dedup.run(KEY, irm.create) for _ in range(3)), return_exceptions=True)
+    assert isinstance(results[0], RuntimeError)
+    assert sorted(deduplicated for _, deduplicated in results[1:]) == [False, True]
+    assert irm.calls == 2
+
+
+async def test_cancelled_leader_hands_over_to_a_waiter():
+    dedup = IncidentDeduplicator(window=300)
+    irm = FakeIRM({"status": "ok", "incident_id": "4"})
+    leader = asyncio.create_task(dedup.run(KEY, irm.create))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(dedup.run(KEY, irm.create))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert await waiter == ({"status": "ok", "incident_id": "4"}, False)
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert irm.calls == 2
+
+
+async def test_window_expiry():
+    dedup = IncidentDeduplicator(window=0.05)
+    irm = FakeIRM({"status": "ok", "incident_id": "5"})
+    await dedup.run(KEY, irm.create)
+    await asyncio.sleep(0.06)
+    assert (await dedup.run(KEY, irm.create))[1] is False
+    assert irm.calls == 2
@@ -0,0 +1,121 @@
+"""Outbox delivery: retries with backoff, giving up, holding without using attempts, and claims."""
+import asyncio
+import json
+import types
+
+import pytest
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal
+from app.models import IncidentLog, IncidentOutbox
+from app.services.delivery import DeliveryWorkerPool
+from app.services.resilience import IRMUnavailableError
+
+
+class FakeIRM:
+    """Returns (or raises) the outcomes given for a title in turn; other titles succeed."""
+
+    def __init__(self, outcomes: dict[str, list]):
+        self.outcomes = outcomes
+        self.calls: dict[str, int] = {}
+        self.breaker = types.SimpleNamespace(retry_after=lambda: 0)
+
+    async def create_incident(self, title: str, severity: str, tags: list[str]) -> dict:
+        self.calls[title] = self.calls.get(title, 0) + 1
+        outcomes = self.outcomes.get(title, [])
+        outcome = outcomes.pop(0) if outcomes else None
+        if isinstance(outcome, Exception):
+            raise outcome
+        return {"status": "ok", "incident_id": f"irm-{title}", "incident_url": f"https://irm.test/{title}"}
+
+
+async def add_outbox_row(title: str) -> int:
+    async with AsyncSessionLocal() as db:
+        row = IncidentOutbox(title=title, severity_internal="P2", severity_grafana="major", tags=json.dumps(["env:test"]))
+        db.add(row)
+        await db.commit()
+        return row.id
+
+
+async def get_row(outbox_id: int) -> IncidentOutbox:
+    async with AsyncSessionLocal() as db:
+        return await db.get(IncidentOutbox, outbox_id)
+
+
+async def deliver(pool: DeliveryWorkerPool, outbox_id: int, until: set[str]) -> IncidentOutbox:
+    """Run the pool until the row reaches one of the given statuses."""
+    await pool.start()
+    try:
+        pool.submit(outbox_id)
+        async with asyncio.timeout(5):
+            while (row := await get_row(outbox_id)).status not in until:
+                await asyncio.sleep(0.01)
+        return row
+    finally:
+        await pool.stop()
+
+
+@pytest.fixture
+def make_pool():
+    def make_pool(irm: FakeIRM, max_attempts: int = 5) -> DeliveryWorkerPool:
+        pool = DeliveryWorkerPool(grafana_client=irm)
+        pool.workers = 2
+        pool.max_attempts = max_attempts
+        pool.backoff_base = 0.01
+        return pool
+    return make_pool
+
+
+async def test_failed_attempts_are_retried_until_delivered(make_pool):
+    irm = FakeIRM({"retry-then-deliver": [RuntimeError("503 Service Unavailable")] * 2})
+    outbox_id = await add_outbox_row("retry-then-deliver")
+
+    row = await deliver(make_pool(irm), outbox_id, {"delivered", "failed"})
+    assert row.status == "delivered"
+    assert row.attempts == 3
+    assert row.grafana_incident_id == "irm-retry-then-deliver"
+    assert row.last_error is None
+    assert irm.calls["retry-then-deliver"] == 3
+
+    async with AsyncSessionLocal() as db:
+        [logged] = (await db.execute(
+            select(IncidentLog).where(IncidentLog.grafana_incident_id == "irm-retry-then-deliver")
+        )).scalars().all()
+        assert logged.title == "retry-then-deliver"
+
+
+async def test_gives_up_after_max_attempts(make_pool):
+    irm = FakeIRM({"always-fails": [RuntimeError("503 Service Unavailable")] * 10})
+    outbox_id = await add_outbox_row("always-fails")
+
+    row = await deliver(make_pool(irm, max_attempts=3), outbox_id, {"delivered", "failed"})
+    assert row.status == "failed"
+    assert row.attempts == 3
+    assert row.last_error == "503 Service Unavailable"
+    assert irm.calls["always-fails"] == 3
+
+
+async def test_held_deliveries_do_not_use_up_attempts(make_pool):
+    irm = FakeIRM({"held": [IRMUnavailableError("rate limited", retry_after=0.01)] * 3})
+    outbox_id = await add_outbox_row("held")
+
+    row = await deliver(make_pool(irm, max_attempts=2), outbox_id, {"delivered", "failed"})
+    assert row.status == "delivered"
+    assert row.attempts == 1
+    assert irm.calls["held"] == 4
+
+
+async def test_a_claimed_row_is_only_taken_over_once_the_claim_expires(make_pool):
+    outbox_id = await add_outbox_row("claimed")
+    first, second = make_pool(FakeIRM({})), make_pool(FakeIRM({}))
+
+    claimed = await first._claim(outbox_id)
+    assert claimed["attempts"] == 1
+    assert await second._claim(outbox_id) is None
+    assert (await get_row(outbox_id)).status == "delivering"
+
+    # A worker that died mid-delivery leaves its claim to expire
+    second.claim_timeout = 0
+    await asyncio.sleep(0.01)
+    taken_over = await second._claim(outbox_id)
+    assert taken_over["attempts"] == 2
@@ -0,0 +1,74 @@
+"""Event broadcaster: fan-out, resync on overflow, shutdown and the client cap."""
+import asyncio
+import json
+
+import httpx
+
+from app.main import app
+from app.services.events import EventBroadcaster, event_broadcaster
+
+
+def parse(frame: bytes) -> tuple[str, dict]:
+    fields = dict(line.split(": ", 1) for line in frame.decode().strip().split("\n"))
+    return fields["event"], json.loads(fields["data"])
+
+
+async def connect(broadcaster: EventBroadcaster):
+    """Open a stream and read its retry line, which registers the client."""
+    stream = broadcaster.stream()
+    assert (await anext(stream)).startswith(b"retry: ")
+    return stream
+
+
+async def drain_loop():
+    # publish() hands events to the loop with call_soon_threadsafe
+    await asyncio.sleep(0)
+
+
+async def test_events_reach_every_client():
+    broadcaster = EventBroadcaster(queue_size=4)
+    broadcaster.start()
+    first, second = await connect(broadcaster), await connect(broadcaster)
+
+    broadcaster.publish("catalog", {"op": "reset", "version": 3})
+    await drain_loop()
+
+    for stream in (first, second):
+        assert parse(await anext(stream)) == ("catalog", {"op": "reset", "version": 3})
+
+
+async def test_client_that_falls_behind_gets_resync():
+    broadcaster = EventBroadcaster(queue_size=2)
+    broadcaster.start()
+    stream = await connect(broadcaster)
+
+    for version in range(3):
+        broadcaster.publish("catalog", {"op": "reset", "version": version})
+    await drain_loop()
+
+    # The backlog is dropped in favour of one resync event
+    assert parse(await anext(stream)) == ("resync", {})
+    broadcaster.publish("catalog", {"op": "reset", "version": 4})
+    await drain_loop()
+    assert parse(await anext(stream)) == ("catalog", {"op": "reset", "version": 4})
+
+
+async def test_stop_ends_open_streams():
+    broadcaster = EventBroadcaster(queue_size=2)
+    broadcaster.start()
+    stream = await connect(broadcaster)
+    broadcaster.publish("catalog", {"op": "reset", "version": 1})
+    await drain_loop()
+
+    broadcaster.stop()
+    assert [frame async for frame in stream] == []
+    assert broadcaster.clients == 0
+
+
+async def test_clients_over_the_cap_get_503(monkeypatch):
+    monkeypatch.setattr(event_broadcaster, "max_clients", 0)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/api/events")
+    assert response.status_code == 503
+    assert response.json()["detail"] == "Too many event stream clients"
@@ -0,0 +1,55 @@
+"""Incident history and queued incident status, which have ids of their own."""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.models import IncidentLog, IncidentOutbox, Tag
+from app.repositories import incidents as incidents_repo
+from app.routers import incidents_router
+
+
+@pytest.fixture(scope="module")
+def client():
+    """One client, and so one event loop, for every request in the module."""
+    app = FastAPI()
+    app.include_router(incidents_router)
+    with TestClient(app) as client:
+        yield client
+
+
+def test_incident_tags_do_not_touch_the_catalog(db):
+    tags_before = db.query(Tag).count()
+    incident = incidents_repo.add_incident_log(
+        db, "history tags", "P2", "major", ["History:Only", "env:prod"], "history-1",
+    )
+    db.commit()
+    assert db.query(Tag).count() == tags_before
+    assert [tag.value for tag in db.get(IncidentLog, incident.id).tags] == ["History:Only", "env:prod"]
+
+
+def test_history_lists_and_filters_submitted_tags(db, client):
+    incident = incidents_repo.add_incident_log(db, "history filter", "P3", "minor", ["Team:History"], "history-2")
+    db.commit()
+
+    response = client.get("/api/incidents", params={"tag": "team:HISTORY"})
+    assert response.status_code == 200
+    [entry] = response.json()
+    assert entry["id"] == incident.id
+    assert entry["tags"] == ["Team:History"]
+
+    exported = client.get("/api/incidents/export", params={"tag": "TEAM:history"}).text
+    assert '"tags":["Team:History"]' in exported.replace(" ", "")
+
+
+def test_queued_status_is_keyed_by_outbox_id(db, client):
+    outbox = IncidentOutbox(title="queued", severity_internal="P1", severity_grafana="critical", tags="[]")
+    db.add(outbox)
+    db.commit()
+
+    response = client.get(f"/api/incidents/outbox/{outbox.id}")
+    assert response.status_code == 200
+    assert response.json()["id"] == outbox.id
+    assert response.json()["status"] == "pending"
+
+    assert client.get("/api/incidents/outbox/999999").status_code == 404
+    # History ids are not looked up in the outbox
+    assert client.get(f"/api/incidents/{outbox.id}").status_code == 404
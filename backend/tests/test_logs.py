@@ -0,0 +1,37 @@
+"""Logging setup: every logger, uvicorn's included, goes through the queue."""
+import logging
+
+import pytest
+
+from app import logs
+from app.config import get_settings
+
+
+@pytest.fixture
+def fresh_logging(monkeypatch):
+    """Run setup_logging from scratch and put the previous handlers back afterwards."""
+    loggers = [logging.getLogger(name) for name in ("", "uvicorn", "uvicorn.access")]
+    saved = [(logger, logger.handlers[:], logger.propagate, logger.level) for logger in loggers]
+    monkeypatch.setattr(logs, "_listener", None)
+    yield
+    logs.stop_logging()
+    for logger, handlers, propagate, level in saved:
+        logger.handlers = handlers
+        logger.propagate = propagate
+        logger.setLevel(level)
+
+
+@pytest.mark.parametrize("log_format, formatter", [("text", logging.Formatter), ("json", logs.JSONFormatter)])
+def test_uvicorn_logs_go_through_the_queue(fresh_logging, monkeypatch, log_format, formatter):
+    monkeypatch.setattr(get_settings(), "log_format", log_format)
+    # pytest's capture handlers would make basicConfig a no-op
+    logging.getLogger().handlers = []
+    logs.setup_logging()
+
+    [handler] = logging.getLogger().handlers
+    assert isinstance(handler, logs.NonBlockingQueueHandler)
+    for name in ("uvicorn", "uvicorn.access"):
+        assert logging.getLogger(name).handlers == [handler]
+        assert not logging.getLogger(name).propagate
+    [stream] = logs._listener.handlers
+    assert type(stream.formatter) is formatter
@@ -0,0 +1,41 @@
+"""Listing cursors: malformed ones get a 400."""
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.repositories.pagination import encode_cursor
+
+client = TestClient(app)
+
+BAD_CURSORS = [
+    "not base64!",
+    encode_cursor("a"),
+    encode_cursor("a", "1"),
+    encode_cursor("a", 1.5),
+    encode_cursor("a", True),
+    encode_cursor("a", False),
+    encode_cursor(None, 1),
+]
+
+
+@pytest.mark.parametrize("path", ["/api/admin/apps", "/api/admin/capabilities"])
+@pytest.mark.parametrize("cursor", BAD_CURSORS)
+def test_bad_catalog_cursor(path, cursor):
+    response = client.get(path, params={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
+
+
+@pytest.mark.parametrize("cursor", BAD_CURSORS + [encode_cursor("2026-01-01T00:00:00", True)])
+def test_bad_history_cursor(cursor):
+    response = client.get("/api/incidents", params={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
+
+
+def test_cursor_round_trip():
+    for name in ("pagination-a", "pagination-b", "pagination-c"):
+        client.post("/api/admin/apps", json={"name": name})
+    first = client.get("/api/admin/apps", params={"prefix": "pagination-", "limit": 2})
+    rest = client.get("/api/admin/apps", params={"prefix": "pagination-", "cursor": first.headers["X-Next-Cursor"]})
+    assert [app["name"] for app in first.json() + rest.json()] == ["pagination-a", "pagination-b", "pagination-c"]
+    assert "X-Next-Cursor" not in rest.headers
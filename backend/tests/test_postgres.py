@@ -0,0 +1,84 @@
+"""
+PostgreSQL-specific paths: the psycopg/asyncpg drivers, ILIKE name search
+with its pg_trgm indexes, and row locking in the incident history.
+
+Skipped unless DATABASE_URL points at PostgreSQL (see conftest).
+"""
+from datetime import timedelta
+import pytest
+from sqlalchemy import inspect, select, text
+from app.database import AsyncSessionLocal, QueryCounter, SessionLocal, async_engine, engine, utcnow
+from app.models import Application, IncidentLog
+from app.repositories import catalog as catalog_repo
+from app.repositories import incidents as incidents_repo
+
+pytestmark = pytest.mark.skipif(
+    engine.dialect.name != "postgresql",
+    reason="set DATABASE_URL to a PostgreSQL database to run",
+)
+
+NAMES = ["PG Payments", "pg payroll", "PG Pay_Out", "PG 100% Uptime", "PG Search"]
+
+
+@pytest.fixture(scope="module")
+def applications():
+    with engine.begin() as conn:
+        conn.execute(Application.__table__.delete().where(Application.name.like("PG %") | Application.name.like("pg %")))
+        conn.execute(Application.__table__.insert(), [{"name": name} for name in NAMES])
+
+
+def test_drivers():
+    assert engine.dialect.driver == "psycopg"
+    assert async_engine.dialect.driver == "asyncpg"
+
+
+def test_trigram_indexes():
+    with engine.connect() as conn:
+        if conn.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).first() is None:
+            pytest.skip("pg_trgm is not installed on this server")
+    for table in ("applications", "capabilities"):
+        assert f"ix_{table}_name_trgm" in {index["name"] for index in inspect(engine).get_indexes(table)}
+
+
+def test_name_search_is_case_insensitive(db, applications):
+    assert not catalog_repo.has_fts(db)
+    with QueryCounter() as counter:
+        apps = catalog_repo.list_applications(db, q="PAY", prefix="pg ")
+    assert [app.name for app in apps] == ["PG Pay_Out", "PG Payments", "pg payroll"]
+    assert "ILIKE" in counter.statements[0]
+
+
+def test_name_search_escapes_wildcards(db, applications):
+    assert [app.name for app in catalog_repo.list_applications(db, q="pay_")] == ["PG Pay_Out"]
+    assert [app.name for app in catalog_repo.list_applications(db, q="100%")] == ["PG 100% Uptime"]
+
+
+def test_keyset_pagination(db, applications):
+    everything = [app.name for app in catalog_repo.list_applications(db, prefix="pg ")]
+    first = catalog_repo.list_applications(db, limit=2, prefix="pg ")
+    rest = catalog_repo.list_applications(db, after=(first[-1].name, first[-1].id), prefix="pg ")
+    assert [app.name for app in first + rest] == everything
+    assert len(everything) == len(NAMES)
+
+
+async def test_incident_history_on_async_engine():
+    async with AsyncSessionLocal() as db:
+        incident = await db.run_sync(
+            incidents_repo.add_incident_log,
+            title="pg async", severity_internal="P2", severity_grafana="major",
+            tags=["Team:PG", "region:eu"], grafana_incident_id="pg-1",
+        )
+        await db.commit()
+        incidents = await db.run_sync(incidents_repo.list_incidents, limit=10, tags=["team:pg"])
+        assert incident.id in [i.id for i in incidents]
+        assert (await db.execute(select(IncidentLog.title).where(IncidentLog.id == incident.id))).scalar_one() == "pg async"
+
+
+def test_expired_incidents_skip_locked_rows(db):
+    cutoff = utcnow() + timedelta(seconds=1)
+    assert incidents_repo.list_expired_incidents(db, cutoff, limit=1000)
+    # This session holds the row locks until it rolls back, so a concurrent
+    # retention run skips those rows instead of waiting for them
+    with SessionLocal() as other:
+        assert incidents_repo.list_expired_incidents(other, cutoff, limit=1000) == []
+    db.rollback()
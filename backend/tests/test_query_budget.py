@@ -0,0 +1,81 @@
+"""
+Query budgets of the catalog reads.
+
+Each read costs a fixed number of SQL statements, however large the catalog.
+A budget that grows means a relationship is being lazy-loaded per row.
+"""
+import pytest
+from app.database import QueryCounter, SessionLocal
+from app.models import Application
+from app.repositories import catalog as catalog_repo
+from app.schemas.catalog import CatalogRecord
+from app.services import catalog_io
+from app.services.catalog import catalog_cache
+
+APPLICATIONS = 300
+CAPABILITIES = 10
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    """A catalog of 300 applications with 10 capabilities each, all tagged."""
+    records = []
+    for a in range(APPLICATIONS):
+        name = f"budget-app-{a:04d}"
+        records.append(CatalogRecord(application=name, tags=[f"team:{a % 20}", f"app:{a}"]))
+        records.extend(
+            CatalogRecord(application=name, capability=f"cap-{c:02d}", tags=[f"cap:{c}", f"region:{a % 7}"])
+            for c in range(CAPABILITIES)
+        )
+    with SessionLocal() as db:
+        catalog_io.import_catalog(db, records)
+        app_ids = [
+            app_id for (app_id,) in
+            db.query(Application.id).filter(Application.name.like("budget-app-%")).order_by(Application.id)
+        ]
+    return app_ids
+
+
+def test_list_applications(db, catalog):
+    catalog_repo.has_fts(db)  # checked once per database, not per listing
+    with QueryCounter() as counter:
+        apps = catalog_repo.list_applications(db, limit=200, prefix="budget-app-")
+        tags = [tag.value for app in apps for tag in app.tags]
+    assert len(apps) == 200
+    assert len(tags) == 400
+    assert counter.count == 2
+
+
+def test_application_detail(db, catalog):
+    with QueryCounter() as counter:
+        app = catalog_repo.get_application(db, catalog[0], with_capabilities=True)
+        tags = [tag.value for cap in app.capabilities for tag in cap.tags] + [tag.value for tag in app.tags]
+    assert len(app.capabilities) == CAPABILITIES
+    assert len(tags) == 2 * CAPABILITIES + 2
+    assert counter.count == 4
+
+
+def test_capability(db, catalog):
+    cap_id = catalog_repo.get_application(db, catalog[0], with_capabilities=True).capabilities[0].id
+    db.expunge_all()
+    with QueryCounter() as counter:
+        cap = catalog_repo.get_capability(db, cap_id)
+        tags = [tag.value for tag in cap.tags]
+    assert len(tags) == 2
+    assert counter.count == 2
+
+
+def test_tree_rebuild(db, catalog):
+    catalog_cache.bump()
+    with QueryCounter() as counter:
+        snapshot = catalog_cache.get_tree(db)
+    assert len(snapshot.catalog.applications) >= APPLICATIONS
+    assert counter.count == 2
+
+
+def test_tag_values(db, catalog):
+    cap_ids = [cap.id for cap in catalog_repo.get_application(db, catalog[1], with_capabilities=True).capabilities]
+    with QueryCounter() as counter:
+        values = catalog_repo.get_tag_values(db, catalog[:100], cap_ids)
+    assert len(values) == 2 * 100 + 2 * CAPABILITIES
+    assert counter.count == 1
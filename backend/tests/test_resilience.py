@@ -0,0 +1,140 @@
+"""Token bucket refill and circuit breaker state transitions, on a fake clock."""
+import pytest
+from app.services import resilience
+from app.services.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    RateLimitedError,
+    TokenBucket,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(resilience.time, "monotonic", clock)
+    return clock
+
+
+def test_bucket_starts_full_and_empties(clock):
+    bucket = TokenBucket(rate=10, burst=3)
+    assert [bucket.try_acquire() for _ in range(3)] == [0, 0, 0]
+    assert bucket.try_acquire() == pytest.approx(0.1)
+
+
+def test_bucket_refills_at_rate_up_to_burst(clock):
+    bucket = TokenBucket(rate=10, burst=5)
+    for _ in range(5):
+        bucket.try_acquire()
+    clock.advance(0.25)
+    assert bucket.tokens == pytest.approx(2.5)
+    clock.advance(10)
+    assert bucket.tokens == 5
+
+
+def test_reading_tokens_changes_nothing(clock):
+    bucket = TokenBucket(rate=10, burst=5)
+    bucket.try_acquire()
+    before = (bucket._tokens, bucket._updated)
+    clock.advance(0.05)
+    assert bucket.tokens == pytest.approx(4.5)
+    assert (bucket._tokens, bucket._updated) == before
+
+
+def test_disabled_bucket(clock):
+    bucket = TokenBucket(rate=0, burst=1)
+    assert not bucket.enabled
+    assert all(bucket.try_acquire() == 0 for _ in range(100))
+
+
+async def test_acquire_gives_up_after_timeout(clock):
+    bucket = TokenBucket(rate=1, burst=1)
+    await bucket.acquire(timeout=0)
+    with pytest.raises(RateLimitedError) as error:
+        await bucket.acquire(timeout=0.5)
+    assert error.value.retry_after == pytest.approx(1)
+
+
+def open_breaker(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.failure_threshold):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()  # resets the count
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+    clock.advance(10)
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.before_call()
+    assert error.value.retry_after == pytest.approx(20)
+    assert breaker.snapshot() == {"state": "open", "consecutive_failures": 3, "retry_after": 20.0}
+
+
+def test_breaker_half_opens_after_recovery_timeout(clock):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30, half_open_max_calls=2)
+    open_breaker(breaker)
+    clock.advance(30)
+
+    # Reading the state does not start the half-open round
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.snapshot()["state"] == "half_open"
+    assert breaker._state == CircuitState.OPEN
+
+    breaker.before_call()
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.release()  # a trial call ended without a verdict
+    breaker.before_call()
+
+
+def test_half_open_success_closes(clock):
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=5)
+    open_breaker(breaker)
+    clock.advance(5)
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.snapshot() == {"state": "closed", "consecutive_failures": 0}
+    breaker.before_call()
+
+
+def test_half_open_failure_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=5)
+    open_breaker(breaker)
+    clock.advance(5)
+    breaker.before_call()
+    breaker.record_failure()  # one failure is enough while half-open
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.retry_after() == 5
+    clock.advance(5)
+    breaker.before_call()  # a new round of trial calls
+
+
+def test_disabled_breaker(clock):
+    breaker = CircuitBreaker(failure_threshold=0, recovery_timeout=5)
+    for _ in range(10):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
@@ -0,0 +1,63 @@
+"""Search index ranking: prefix, word prefix and substring matches, and multi-term queries."""
+import pytest
+
+from app.models import Application, Capability, Tag
+from app.services.search_index import SearchIndex
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex()
+    for id, name, description, tags in [
+        (1, "Payments", "Card processing", ["team:billing"]),
+        (2, "Card Vault", None, []),
+        (3, "Discard Queue", None, []),
+        (4, "Ledger", "Double-entry bookkeeping", ["pay:core"]),
+        (5, "Search", None, ["team:discovery"]),
+    ]:
+        index.set_application(Application(id=id, name=name, description=description, tags=[Tag(value=t) for t in tags]))
+    index.set_capability(Capability(id=10, application_id=1, name="Card Payouts", description=None, tags=[]))
+    return index
+
+
+def names(results) -> list[str]:
+    return [doc.name for doc, _ in results]
+
+
+def test_name_prefix_before_word_prefix_before_substring(index):
+    # "Card Vault" and "Card Payouts" start with the term, "Payments" only
+    # mentions it in its description, "Discard Queue" contains it mid-word
+    assert names(index.search("card")) == ["Card Payouts", "Card Vault", "Discard Queue", "Payments"]
+
+
+def test_word_and_tag_prefixes_rank_after_name_prefixes(index):
+    # Payments starts with "pay", Card Payouts has a word starting with it,
+    # and Ledger only has a tag word starting with it
+    assert names(index.search("pay")) == ["Payments", "Card Payouts", "Ledger"]
+
+
+def test_capabilities_come_with_their_application(index):
+    [(doc, parent)] = index.search("payouts")
+    assert (doc.kind, doc.id) == ("capability", 10)
+    assert (parent.kind, parent.id) == ("application", 1)
+
+
+def test_every_term_must_match(index):
+    # Payments only has "card" in its description, so it ranks lower
+    assert names(index.search("card pay")) == ["Card Payouts", "Payments"]
+    assert names(index.search("card ledger")) == []
+    assert names(index.search("vault ca")) == ["Card Vault"]
+
+
+def test_short_terms_only_match_prefixes(index):
+    # "ar" is inside "Card" and "Discard", but no word starts with it
+    assert index.search("ar") == []
+    assert names(index.search("di")) == ["Discard Queue", "Search"]
+    # From three characters, substrings match too
+    assert names(index.search("ard")) == ["Card Payouts", "Card Vault", "Discard Queue", "Payments"]
+
+
+def test_limit_and_removal(index):
+    assert len(index.search("card", limit=2)) == 2
+    index.remove_application(1)
+    assert names(index.search("pay")) == ["Ledger"]
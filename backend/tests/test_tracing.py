@@ -0,0 +1,158 @@
+"""
+Spans of the incident path, collected with the in-memory exporter.
+
+Needs the "otel" extra. Tracing is set up on an app of its own, as
+instrumentation has to be added before an app serves its first request.
+"""
+import asyncio
+import itertools
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import httpx
+import pytest
+from fastapi import FastAPI
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor  # noqa: E402
+from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor  # noqa: E402
+from opentelemetry.trace import SpanKind  # noqa: E402
+from app import tracing  # noqa: E402
+from app.config import get_settings  # noqa: E402
+from app.database import SessionLocal, async_engine, engine  # noqa: E402
+from app.models import Application, IncidentOutbox  # noqa: E402
+from app.routers.incidents import router as incidents_router  # noqa: E402
+from app.schemas.catalog import CatalogRecord  # noqa: E402
+from app.services import catalog_io, incident as incident_service  # noqa: E402
+from app.services.delivery import delivery_pool  # noqa: E402
+from app.services.grafana import GrafanaIRMClient  # noqa: E402
+from app.services.tag_index import tag_index  # noqa: E402
+
+titles = (f"traced incident {i}" for i in itertools.count())
+
+
+@pytest.fixture(scope="module")
+def traced_app():
+    app = FastAPI()
+    app.include_router(incidents_router)
+    assert tracing.setup_tracing(app, [engine, async_engine.sync_engine], exporter="memory")
+    yield app
+    HTTPXClientInstrumentor().uninstrument()
+    SQLAlchemyInstrumentor().uninstrument()
+
+
+@pytest.fixture
+def spans(traced_app):
+    tracing.memory_exporter.clear()
+    return tracing.memory_exporter
+
+
+class IRMHandler(BaseHTTPRequestHandler):
+    """Answers CreateIncident, recording the headers of each request."""
+
+    requests: list = []
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.requests.append(dict(self.headers))
+        body = json.dumps({"incident": {"incidentID": str(len(self.requests)), "overviewURL": "/i"}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def irm_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), IRMHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+@pytest.fixture
+def irm(traced_app, irm_server, monkeypatch):
+    """A Grafana IRM client calling the local server over a real (instrumented) transport."""
+    client = GrafanaIRMClient()
+    client.base_url = irm_server
+    client.api_token = "test-token"
+    client.requests = IRMHandler.requests
+    monkeypatch.setattr(incident_service, "get_grafana_client", lambda: client)
+    return client
+
+
+@pytest.fixture(scope="module")
+def application_id():
+    """An application with two tags, for the tag aggregation step."""
+    with SessionLocal() as db:
+        catalog_io.import_catalog(db, [CatalogRecord(application="traced-app", tags=["team:trace", "env:test"])])
+        tag_index.load(db)
+        return db.query(Application.id).filter(Application.name == "traced-app").scalar()
+
+
+def by_name(spans) -> dict:
+    return {span.name: span for span in spans.get_finished_spans()}
+
+
+async def post_incident(app: FastAPI, application_id: int) -> dict:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app), base_url="http://test") as client:
+        response = await client.post("/api/incidents", json={
+            "title": next(titles), "severity": "P2", "application_ids": [application_id],
+        })
+    response.raise_for_status()
+    return response.json()
+
+
+async def test_direct_submission_spans(traced_app, spans, irm, application_id):
+    result = await post_incident(traced_app, application_id)
+    assert result["status"] == "ok"
+
+    found = by_name(spans)
+    route = found["POST /api/incidents"]
+    create = found["grafana_irm.create_incident"]
+    assert {"incident.aggregate_tags", "grafana_irm.rate_limit", "incident.log"} <= found.keys()
+    assert create.attributes["severity"] == "major"
+    assert create.attributes["tag_count"] == 2
+    assert route.attributes["http.route"] == "/api/incidents"
+
+    # One trace, with the IRM call (an httpx client span) under create_incident
+    assert {span.context.trace_id for span in spans.get_finished_spans()} == {route.context.trace_id}
+    assert found["grafana_irm.rate_limit"].parent.span_id == create.context.span_id
+    [irm_call] = [s for s in spans.get_finished_spans() if s.kind == SpanKind.CLIENT and s.name == "POST"]
+    assert irm_call.parent.span_id == create.context.span_id
+    assert any(s.attributes.get("db.system") for s in spans.get_finished_spans())
+
+    # The trace context is sent on to IRM
+    traceparent = irm.requests[-1]["traceparent"]
+    assert traceparent.split("-")[1] == format(route.context.trace_id, "032x")
+
+
+async def test_queued_delivery_spans(traced_app, spans, irm, application_id, monkeypatch):
+    monkeypatch.setattr(get_settings(), "incident_queue_enabled", True)
+    monkeypatch.setattr(delivery_pool, "grafana_client", irm)
+    await delivery_pool.start()
+    try:
+        result = await post_incident(traced_app, application_id)
+        assert result["status"] == "queued"
+        outbox_id = result["incident_id"]
+        for _ in range(200):
+            with SessionLocal() as db:
+                if db.get(IncidentOutbox, outbox_id).status == "delivered":
+                    break
+            await asyncio.sleep(0.01)
+    finally:
+        await delivery_pool.stop()
+
+    finished = spans.get_finished_spans()
+    found = by_name(spans)
+    assert found["incident.enqueue"].context.trace_id == found["POST /api/incidents"].context.trace_id
+    # Rows left pending by other tests may be delivered too
+    [deliver] = [s for s in finished if s.name == "incident.deliver" and s.attributes["outbox_id"] == outbox_id]
+    [create] = [s for s in finished if s.name == "grafana_irm.create_incident" and s.parent.span_id == deliver.context.span_id]
+    assert create.attributes["tag_count"] == 2
@@ -0,0 +1,108 @@
+"""GET /api/tree: ETag revalidation, deltas after a catalog version, and tombstone pruning."""
+from datetime import timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.database import utcnow
+from app.models import CatalogTombstone
+from app.repositories import catalog as catalog_repo
+from app.routers import admin_router, tree_router
+from app.services.catalog_sync import catalog_sync
+from app.services.retention import CatalogTombstoneRetention
+
+
+@pytest.fixture(scope="module")
+def client():
+    app = FastAPI()
+    app.include_router(admin_router)
+    app.include_router(tree_router)
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(autouse=True)
+def loaded_catalog(db):
+    catalog_sync.load(db)
+
+
+def create_app(client, name: str) -> dict:
+    response = client.post("/api/admin/apps", json={"name": name, "description": "delta", "tags": []})
+    assert response.status_code == 201
+    return response.json()
+
+
+def create_capability(client, app_id: int, name: str) -> dict:
+    response = client.post("/api/admin/capabilities", json={"application_id": app_id, "name": name, "tags": []})
+    assert response.status_code == 201
+    return response.json()
+
+
+def current_version(client) -> int:
+    return int(client.get("/api/tree").headers["X-Catalog-Version"])
+
+
+def test_etag_revalidation(client):
+    create_app(client, "delta-etag")
+    first = client.get("/api/tree")
+    assert first.status_code == 200
+
+    unchanged = client.get("/api/tree", headers={"If-None-Match": first.headers["ETag"]})
+    assert unchanged.status_code == 304
+    assert unchanged.headers["X-Catalog-Version"] == first.headers["X-Catalog-Version"]
+
+    create_app(client, "delta-etag-2")
+    changed = client.get("/api/tree", headers={"If-None-Match": first.headers["ETag"]})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != first.headers["ETag"]
+
+
+def test_update_appears_in_delta(client):
+    app = create_app(client, "delta-update")
+    since = current_version(client)
+    unchanged = client.get("/api/tree", params={"since": since}).json()
+    assert unchanged["version"] == since
+    assert unchanged["applications"] == unchanged["deleted_applications"] == []
+
+    client.put(f"/api/admin/apps/{app['id']}", json={"description": "changed"})
+    delta = client.get("/api/tree", params={"since": since}).json()
+    assert delta["version"] == since + 1
+    assert delta["applications"] == [{"id": app["id"], "name": "delta-update", "description": "changed"}]
+    assert delta["capabilities"] == []
+
+
+def test_deleting_an_application_tombstones_it_and_its_capabilities(client):
+    app = create_app(client, "delta-delete")
+    caps = [create_capability(client, app["id"], f"delta-delete-{i}") for i in range(2)]
+    since = current_version(client)
+
+    assert client.delete(f"/api/admin/apps/{app['id']}").status_code == 204
+    delta = client.get("/api/tree", params={"since": since}).json()
+    assert delta["deleted_applications"] == [app["id"]]
+    assert sorted(delta["deleted_capabilities"]) == sorted(cap["id"] for cap in caps)
+    assert delta["applications"] == delta["capabilities"] == []
+
+
+def test_since_after_the_current_version_is_gone(client):
+    response = client.get("/api/tree", params={"since": current_version(client) + 1})
+    assert response.status_code == 410
+
+
+def test_pruned_tombstones_raise_the_delta_floor(client, db):
+    app = create_app(client, "delta-prune")
+    before_delete = current_version(client)
+    client.delete(f"/api/admin/apps/{app['id']}")
+    deleted_at = current_version(client)
+
+    retention = CatalogTombstoneRetention()
+    retention.retention_days = 1
+    assert retention.purge(now=utcnow()) == 0
+    assert retention.purge(now=utcnow() + timedelta(days=2)) >= 1
+
+    db.expire_all()
+    assert db.query(CatalogTombstone).count() == 0
+    assert catalog_repo.get_delta_range(db) == (deleted_at, deleted_at)
+    # A delta from before the pruned deletion would miss it
+    assert client.get("/api/tree", params={"since": before_delete}).status_code == 410
+    assert client.get("/api/tree", params={"since": deleted_at}).status_code == 200
@@ -1,5 +1,6 @@
 import type { Application, SelectionState } from '../types';
 import { ApplicationNode } from './ApplicationNode';
+import { CatalogSearch } from './CatalogSearch';
 
 interface Props {
   applications: Application[];
@@ -20,6 +21,11 @@ export function ApplicationTree({ applications, selection, onToggleApp, onToggle
   return (
     <div className="card">
       <h2>Select Applications / Capabilities</h2>
+      <CatalogSearch
+        selection={selection}
+        onToggleApp={onToggleApp}
+        onToggleCapability={onToggleCapability}
+      />
       <ul className="tree">
         {applications.map(app => (
           <ApplicationNode
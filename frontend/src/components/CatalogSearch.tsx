@@ -0,0 +1,98 @@
+import { useState, useEffect } from 'react';
+import type { SearchResult, SelectionState } from '../types';
+import { searchCatalog } from '../services/api';
+
+const RESULT_LIMIT = 20;
+
+interface Props {
+  selection: SelectionState;
+  onToggleApp: (appId: number) => void;
+  onToggleCapability: (capId: number) => void;
+}
+
+// Typeahead over the server-side search index; checking a result selects it in the tree
+export function CatalogSearch({ selection, onToggleApp, onToggleCapability }: Props) {
+  const [query, setQuery] = useState('');
+  const [results, setResults] = useState<SearchResult[]>([]);
+  const [searched, setSearched] = useState('');
+  const [error, setError] = useState<string | null>(null);
+
+  // Wait for a pause in typing before searching, and ignore answers to older queries
+  useEffect(() => {
+    const q = query.trim();
+    if (!q) {
+      setResults([]);
+      setSearched('');
+      return;
+    }
+    let current = true;
+    const timer = setTimeout(() => {
+      searchCatalog(q.slice(0, 100), RESULT_LIMIT)
+        .then(found => {
+          if (!current) return;
+          setResults(found);
+          setSearched(q);
+          setError(null);
+        })
+        .catch(err => {
+          if (current) setError(err.message);
+        });
+    }, 150);
+    return () => {
+      current = false;
+      clearTimeout(timer);
+    };
+  }, [query]);
+
+  const isSelected = (result: SearchResult) =>
+    result.type === 'application'
+      ? selection.applications.has(result.id)
+      : selection.capabilities.has(result.id);
+
+  const toggle = (result: SearchResult) =>
+    result.type === 'application' ? onToggleApp(result.id) : onToggleCapability(result.id);
+
+  return (
+    <div className="catalog-search">
+      <div className="form-group">
+        <input
+          type="search"
+          placeholder="Search applications, capabilities and tags..."
+          value={query}
+          onChange={e => setQuery(e.target.value)}
+        />
+      </div>
+
+      {error && <div className="alert alert-error">{error}</div>}
+
+      {searched && results.length === 0 && !error && (
+        <p className="search-empty">No matches.</p>
+      )}
+
+      {results.length > 0 && (
+        <ul className="search-results">
+          {results.map(result => (
+            <li
+              key={`${result.type}-${result.id}`}
+              className="search-result"
+              onClick={() => toggle(result)}
+            >
+              <input
+                type="checkbox"
+                checked={isSelected(result)}
+                onChange={() => toggle(result)}
+                onClick={e => e.stopPropagation()}
+              />
+              <span className={result.type === 'application' ? 'tree-app-name' : 'tree-capability-name'}>
+                {result.name}
+              </span>
+              {result.application_name && (
+                <span className="tree-app-desc">{result.application_name}</span>
+              )}
+            </li>
+          ))}
+        </ul>
+      )}
+    </div>
+  );
+}
@@ -25,7 +25,7 @@ export function IncidentForm({ hasSelection, onSubmit }: Props) {
       const response = await onSubmit(title.trim(), severity);
       setResult(response);
 
-      if (response.status === 'ok') {
+      if (response.status !== 'error') {
         setTitle('');
         setSeverity('P3');
       }
@@ -44,10 +44,14 @@ export function IncidentForm({ hasSelection, onSubmit }: Props) {
       <h2>Raise Incident</h2>
 
       {result && (
-        <div className={`alert alert-${result.status === 'ok' ? 'success' : 'error'}`}>
-          {result.status === 'ok' ? (
+        <div className={`alert alert-${result.status === 'error' ? 'error' : 'success'}`}>
+          {result.status === 'queued' ? (
+            <>{result.message}</>
+          ) : result.status === 'ok' ? (
             <>
-              Incident created successfully!
+              {result.deduplicated
+                ? 'This incident was already raised.'
+                : 'Incident created successfully!'}
               {result.grafana_incident_url && (
                 <>
                   {' '}
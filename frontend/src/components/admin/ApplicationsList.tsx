@@ -2,6 +2,8 @@ import { useState, useEffect } from 'react';
 import type { ApplicationResponse } from '../../types';
 import { fetchApplications, deleteApplication } from '../../services/api';
 
+const PAGE_SIZE = 50;
+
 interface Props {
   onEdit: (app: ApplicationResponse) => void;
   onManageCapabilities: (app: ApplicationResponse) => void;
@@ -9,14 +11,18 @@ interface Props {
 
 export function ApplicationsList({ onEdit, onManageCapabilities }: Props) {
   const [applications, setApplications] = useState<ApplicationResponse[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [search, setSearch] = useState('');
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
   const loadApplications = async () => {
     try {
       setLoading(true);
-      const apps = await fetchApplications();
-      setApplications(apps);
+      const page = await fetchApplications({ limit: PAGE_SIZE, q: search || undefined });
+      setApplications(page.items);
+      setNextCursor(page.nextCursor);
       setError(null);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to load applications');
@@ -25,9 +31,25 @@ export function ApplicationsList({ onEdit, onManageCapabilities }: Props) {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const page = await fetchApplications({ limit: PAGE_SIZE, cursor: nextCursor, q: search || undefined });
+      setApplications(apps => [...apps, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Failed to load applications');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // Wait for a pause in typing before searching
   useEffect(() => {
-    loadApplications();
-  }, []);
+    const timer = setTimeout(loadApplications, search ? 250 : 0);
+    return () => clearTimeout(timer);
+  }, [search]);
 
   const handleDelete = async (id: number, name: string) => {
     if (!confirm(`Delete application "${name}" and all its capabilities?`)) {
@@ -42,71 +64,86 @@ export function ApplicationsList({ onEdit, onManageCapabilities }: Props) {
     }
   };
 
-  if (loading) {
-    return <div className="loading">Loading...</div>;
-  }
-
-  if (error) {
-    return <div className="alert alert-error">{error}</div>;
-  }
-
   return (
     <div>
-      <table className="table">
-        <thead>
-          <tr>
-            <th>Name</th>
-            <th>Description</th>
-            <th>Tags</th>
-            <th>Actions</th>
-          </tr>
-        </thead>
-        <tbody>
-          {applications.length === 0 ? (
+      <div className="form-group">
+        <input
+          type="search"
+          placeholder="Search applications..."
+          value={search}
+          onChange={e => setSearch(e.target.value)}
+        />
+      </div>
+
+      {error && <div className="alert alert-error">{error}</div>}
+
+      {loading ? (
+        <div className="loading">Loading...</div>
+      ) : (
+        <table className="table">
+          <thead>
             <tr>
-              <td colSpan={4} style={{ textAlign: 'center', color: '#666' }}>
-                No applications yet. Create one to get started.
-              </td>
+              <th>Name</th>
+              <th>Description</th>
+              <th>Tags</th>
+              <th>Actions</th>
             </tr>
-          ) : (
-            applications.map(app => (
-              <tr key={app.id}>
-                <td>{app.name}</td>
-                <td>{app.description || '-'}</td>
-                <td>
-                  <div className="tags">
-                    {app.tags.map((tag, i) => (
-                      <span key={i} className="tag">{tag}</span>
-                    ))}
-                  </div>
-                </td>
-                <td>
-                  <div className="table-actions">
-                    <button
-                      className="btn btn-secondary btn-sm"
-                      onClick={() => onManageCapabilities(app)}
-                    >
-                      Capabilities
-                    </button>
-                    <button
-                      className="btn btn-secondary btn-sm"
-                      onClick={() => onEdit(app)}
-                    >
-                      Edit
-                    </button>
-                    <button
-                      className="btn btn-danger btn-sm"
-                      onClick={() => handleDelete(app.id, app.name)}
-                    >
-                      Delete
-                    </button>
-                  </div>
+          </thead>
+          <tbody>
+            {applications.length === 0 ? (
+              <tr>
+                <td colSpan={4} style={{ textAlign: 'center', color: '#666' }}>
+                  {search ? 'No applications match your search.' : 'No applications yet. Create one to get started.'}
                 </td>
               </tr>
-            ))
-          )}
-        </tbody>
-      </table>
+            ) : (
+              applications.map(app => (
+                <tr key={app.id}>
+                  <td>{app.name}</td>
+                  <td>{app.description || '-'}</td>
+                  <td>
+                    <div className="tags">
+                      {app.tags.map((tag, i) => (
+                        <span key={i} className="tag">{tag}</span>
+                      ))}
+                    </div>
+                  </td>
+                  <td>
+                    <div className="table-actions">
+                      <button
+                        className="btn btn-secondary btn-sm"
+                        onClick={() => onManageCapabilities(app)}
+                      >
+                        Capabilities
+                      </button>
+                      <button
+                        className="btn btn-secondary btn-sm"
+                        onClick={() => onEdit(app)}
+                      >
+                        Edit
+                      </button>
+                      <button
+                        className="btn btn-danger btn-sm"
+                        onClick={() => handleDelete(app.id, app.name)}
+                      >
+                        Delete
+                      </button>
+                    </div>
+                  </td>
+                </tr>
+              ))
+            )}
+          </tbody>
+        </table>
+      )}
+
+      {nextCursor && !loading && (
+        <div style={{ textAlign: 'center', marginTop: '1rem' }}>
+          <button className="btn btn-secondary btn-sm" onClick={loadMore} disabled={loadingMore}>
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
     </div>
   );
 }
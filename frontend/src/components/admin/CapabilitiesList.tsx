@@ -1,6 +1,8 @@
 import { useState, useEffect } from 'react';
 import type { ApplicationResponse, CapabilityResponse } from '../../types';
-import { fetchApplication, deleteCapability } from '../../services/api';
+import { fetchCapabilities, deleteCapability } from '../../services/api';
+
+const PAGE_SIZE = 100;
 
 interface Props {
   application: ApplicationResponse;
@@ -11,14 +13,17 @@ interface Props {
 
 export function CapabilitiesList({ application, onEdit, onCreate, onBack }: Props) {
   const [capabilities, setCapabilities] = useState<CapabilityResponse[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
 
   const loadCapabilities = async () => {
     try {
       setLoading(true);
-      const app = await fetchApplication(application.id);
-      setCapabilities(app.capabilities);
+      const page = await fetchCapabilities(application.id, { limit: PAGE_SIZE });
+      setCapabilities(page.items);
+      setNextCursor(page.nextCursor);
       setError(null);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Failed to load capabilities');
@@ -27,6 +32,20 @@ export function CapabilitiesList({ application, onEdit, onCreate, onBack }: Prop
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const page = await fetchCapabilities(application.id, { limit: PAGE_SIZE, cursor: nextCursor });
+      setCapabilities(caps => [...caps, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Failed to load capabilities');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     loadCapabilities();
   }, [application.id]);
@@ -115,6 +134,14 @@ export function CapabilitiesList({ application, onEdit, onCreate, onBack }: Prop
           )}
         </tbody>
       </table>
+
+      {nextCursor && (
+        <div style={{ textAlign: 'center', marginTop: '1rem' }}>
+          <button className="btn btn-secondary btn-sm" onClick={loadMore} disabled={loadingMore}>
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
     </div>
   );
 }
@@ -1,6 +1,6 @@
 import { useState, useEffect, useCallback } from 'react';
 import type { Application, SelectionState, Severity } from '../types';
-import { fetchTree, createIncident } from '../services/api';
+import { fetchTree, createIncident, waitForIncident } from '../services/api';
 import { ApplicationTree } from '../components/ApplicationTree';
 import { IncidentForm } from '../components/IncidentForm';
 
@@ -89,12 +89,17 @@ export function IncidentPage() {
 
   // Handle incident creation
   const handleCreateIncident = async (title: string, severity: Severity) => {
-    return createIncident({
+    const response = await createIncident({
       title,
       severity,
       application_ids: Array.from(selection.applications),
       capability_ids: Array.from(selection.capabilities),
     });
+    if (response.status === 'queued' && response.incident_id !== undefined) {
+      const delivered = await waitForIncident(response.incident_id);
+      return { ...delivered, deduplicated: response.deduplicated };
+    }
+    return response;
   };
 
   const hasSelection = selection.applications.size > 0 || selection.capabilities.size > 0;
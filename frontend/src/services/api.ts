@@ -2,6 +2,7 @@ import type {
   Application,
   IncidentCreate,
   IncidentResponse,
+  IncidentStatus,
   ApplicationCreate,
   ApplicationUpdate,
   ApplicationResponse,
@@ -9,6 +10,9 @@ import type {
   CapabilityCreate,
   CapabilityUpdate,
   CapabilityResponse,
+  ListParams,
+  Page,
+  SearchResult,
 } from '../types';
 
 const API_BASE = '/api';
@@ -21,12 +25,33 @@ async function handleResponse<T>(response: Response): Promise<T> {
   return response.json();
 }
 
+function listQuery(params: ListParams, extra: Record<string, string> = {}): string {
+  const query = new URLSearchParams(extra);
+  if (params.limit) query.set('limit', String(params.limit));
+  if (params.cursor) query.set('cursor', params.cursor);
+  if (params.q) query.set('q', params.q);
+  params.tags?.forEach(tag => query.append('tag', tag));
+  return query.toString();
+}
+
+async function handlePage<T>(response: Response): Promise<Page<T>> {
+  const items = await handleResponse<T[]>(response);
+  return { items, nextCursor: response.headers.get('X-Next-Cursor') };
+}
+
 // Tree API
 export async function fetchTree(): Promise<Application[]> {
   const response = await fetch(`${API_BASE}/tree`);
   return handleResponse<Application[]>(response);
 }
 
+// Search API
+export async function searchCatalog(q: string, limit = 20): Promise<SearchResult[]> {
+  const query = new URLSearchParams({ q, limit: String(limit) });
+  const response = await fetch(`${API_BASE}/search?${query}`);
+  return handleResponse<SearchResult[]>(response);
+}
+
 // Incidents API
 export async function createIncident(incident: IncidentCreate): Promise<IncidentResponse> {
   const response = await fetch(`${API_BASE}/incidents`, {
@@ -37,10 +62,44 @@ export async function createIncident(incident: IncidentCreate): Promise<Incident
   return handleResponse<IncidentResponse>(response);
 }
 
+export async function fetchIncidentStatus(id: number): Promise<IncidentStatus> {
+  const response = await fetch(`${API_BASE}/incidents/outbox/${id}`);
+  return handleResponse<IncidentStatus>(response);
+}
+
+// Wait for a queued incident to be delivered to Grafana IRM
+export async function waitForIncident(
+  id: number,
+  intervalMs = 1000,
+  timeoutMs = 60000,
+): Promise<IncidentResponse> {
+  const deadline = Date.now() + timeoutMs;
+  while (Date.now() < deadline) {
+    const status = await fetchIncidentStatus(id);
+    if (status.status === 'delivered') {
+      return {
+        status: 'ok',
+        incident_id: id,
+        grafana_incident_id: status.grafana_incident_id,
+        grafana_incident_url: status.grafana_incident_url,
+      };
+    }
+    if (status.status === 'failed') {
+      return { status: 'error', incident_id: id, message: status.last_error };
+    }
+    await new Promise(resolve => setTimeout(resolve, intervalMs));
+  }
+  return {
+    status: 'queued',
+    incident_id: id,
+    message: 'Incident is queued and will be delivered to Grafana IRM shortly',
+  };
+}
+
 // Admin - Applications API
-export async function fetchApplications(): Promise<ApplicationResponse[]> {
-  const response = await fetch(`${API_BASE}/admin/apps`);
-  return handleResponse<ApplicationResponse[]>(response);
+export async function fetchApplications(params: ListParams = {}): Promise<Page<ApplicationResponse>> {
+  const response = await fetch(`${API_BASE}/admin/apps?${listQuery(params)}`);
+  return handlePage<ApplicationResponse>(response);
 }
 
 export async function fetchApplication(id: number): Promise<ApplicationWithCapabilities> {
@@ -76,6 +135,15 @@ export async function deleteApplication(id: number): Promise<void> {
 }
 
 // Admin - Capabilities API
+export async function fetchCapabilities(
+  applicationId: number,
+  params: ListParams = {},
+): Promise<Page<CapabilityResponse>> {
+  const query = listQuery(params, { application_id: String(applicationId) });
+  const response = await fetch(`${API_BASE}/admin/capabilities?${query}`);
+  return handlePage<CapabilityResponse>(response);
+}
+
 export async function fetchCapability(id: number): Promise<CapabilityResponse> {
   const response = await fetch(`${API_BASE}/admin/capabilities/${id}`);
   return handleResponse<CapabilityResponse>(response);
@@ -32,10 +32,24 @@ export interface IncidentCreate {
 
 // Incident creation response
 export interface IncidentResponse {
-  status: 'ok' | 'error';
+  status: 'ok' | 'queued' | 'error';
+  incident_id?: number;
   grafana_incident_id?: string;
   grafana_incident_url?: string;
   message?: string;
+  deduplicated?: boolean;
+}
+
+// Delivery status of a queued incident
+export interface IncidentStatus {
+  id: number;
+  status: 'pending' | 'delivering' | 'delivered' | 'failed';
+  attempts: number;
+  grafana_incident_id?: string;
+  grafana_incident_url?: string;
+  last_error?: string;
+  created_at: string;
+  updated_at: string;
 }
 
 // Admin types
@@ -86,3 +100,27 @@ export interface CapabilityResponse {
   updated_at: string;
   tags: string[];
 }
+
+// Paginated admin listings
+export interface ListParams {
+  limit?: number;
+  cursor?: string;
+  q?: string;
+  tags?: string[];
+}
+
+export interface Page<T> {
+  items: T[];
+  nextCursor: string | null;
+}
+
+// Typeahead search
+export interface SearchResult {
+  type: 'application' | 'capability';
+  id: number;
+  name: string;
+  description?: string;
+  tags: string[];
+  application_id: number;
+  application_name?: string;
+}